@@ -0,0 +1,221 @@
+"""Модуль с кэшем ответов идемпотентных API-запросов"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from hashlib import sha1
+from re import search
+from threading import Lock
+from time import monotonic
+from typing import Iterator
+
+from requests import PreparedRequest, Response
+
+from other.logging import logger
+
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+class CacheEntry:
+    """Запись кэша с ответом и валидаторами для условных запросов"""
+
+    __slots__ = ['response', 'etag', 'last_modified', 'expires', 'size']
+
+    def __init__(self, response: Response, ttl: float):
+        """
+
+        Args:
+            response: ответ;
+            ttl: время жизни записи в секундах, если ответ не задает max-age.
+        """
+        self.response = response
+        self.size = len(response.content)
+        self.etag = self.last_modified = None
+        self.expires = 0.0
+        self.refresh(headers=response.headers, ttl=ttl)
+
+    def refresh(self, headers: dict[str, str], ttl: float):
+        """Обновить валидаторы и срок свежести записи по заголовкам ответа или объединенным заголовкам ответа 304
+
+        Args:
+            headers: заголовки ответа;
+            ttl: время жизни записи по умолчанию.
+        """
+        self.etag = headers.get('ETag')
+        self.last_modified = headers.get('Last-Modified')
+        cache_control = headers.get('Cache-Control', '').lower()
+
+        if 'no-cache' in cache_control:
+            ttl = 0
+
+        elif max_age := search(r'max-age=(\d+)', cache_control):
+            ttl = int(max_age.group(1))
+
+        self.expires = monotonic() + ttl
+
+    @property
+    def is_fresh(self) -> bool:
+        """Можно ли отдать запись без обращения к серверу"""
+        return monotonic() < self.expires
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Заголовки условного запроса для повторной валидации записи"""
+        headers = {}
+
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class ResponseCache:
+    """Потокобезопасный LRU-кэш ответов с ограничением по количеству, объему и времени жизни"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300):
+        """
+
+        Args:
+            max_entries: максимальное количество записей;
+            max_bytes: максимальный суммарный объем тел ответов;
+            ttl: время жизни записи в секундах.
+        """
+        self.max_entries, self.max_bytes, self.ttl = max_entries, max_bytes, ttl
+        self.hits = self.misses = self.revalidated = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+        self._inflight: dict[str, tuple[Lock, int]] = {}
+        self._vary: dict[str, tuple[str, ...]] = {}
+
+    @staticmethod
+    def get_vary(response: Response) -> tuple[str, ...] | None:
+        """Получить имена заголовков запроса из Vary ответа, None - ответ нельзя кэшировать (Vary: *)
+
+        Args:
+            response: ответ
+        """
+        names = {name.strip().lower() for name in response.headers.get('Vary', '').split(',') if name.strip()}
+
+        return None if '*' in names else tuple(sorted(names))
+
+    @staticmethod
+    def get_base_key(request: PreparedRequest) -> str:
+        """Получить ключ кэша запроса без учета Vary: метод, url с параметрами и отпечаток авторизации
+
+        Args:
+            request: подготовленный запрос
+        """
+        auth = request.headers.get('Authorization', '') + request.headers.get('Cookie', '')
+
+        return f'{request.method} {request.url} {sha1(auth.encode()).hexdigest() if auth else ""}'
+
+    def get_key(self, request: PreparedRequest, vary: tuple[str, ...] | None = None) -> str:
+        """Получить ключ кэша запроса: ключ без учета Vary и значения заголовков запроса, перечисленных в Vary
+
+        Args:
+            request: подготовленный запрос;
+            vary: заголовки из Vary ответа, None - из последнего сохраненного ответа на этот запрос.
+        """
+        base = self.get_base_key(request=request)
+
+        if vary is None:
+            with self._lock:
+                vary = self._vary.get(base, ())
+
+        if not vary:
+            return base
+
+        values = '\n'.join(f'{name}: {request.headers.get(name, "")}' for name in vary)
+
+        return f'{base} {sha1(values.encode()).hexdigest()}'
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Объединить одинаковые одновременные запросы: пока первый запрос выполняется, остальные ждут
+
+        Args:
+            key: ключ кэша
+        """
+        with self._lock:
+            lock, waiters = self._inflight.get(key, (Lock(), 0))
+            self._inflight[key] = lock, waiters + 1
+
+        try:
+            with lock:
+                yield
+
+        finally:
+            with self._lock:
+                lock, waiters = self._inflight[key]
+
+                if waiters == 1:
+                    del self._inflight[key]
+                else:
+                    self._inflight[key] = lock, waiters - 1
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Получить запись кэша. Устаревшая запись без валидаторов удаляется
+
+        Args:
+            key: ключ кэша
+        """
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+
+            if not entry.is_fresh and not entry.validators:
+                del self._entries[key]
+                self._size -= entry.size
+
+                return None
+
+            self._entries.move_to_end(key)
+
+            return entry
+
+    def put(self, request: PreparedRequest, response: Response) -> CacheEntry | None:
+        """Сохранить успешный ответ, если заголовки ответа это позволяют. Ключ записи учитывает заголовки запроса
+        из Vary ответа
+
+        Args:
+            request: подготовленный запрос;
+            response: ответ.
+        """
+        if response.status_code != 200 or 'no-store' in response.headers.get('Cache-Control', '').lower():
+            return None
+
+        if (vary := self.get_vary(response=response)) is None:
+            return None
+
+        entry = CacheEntry(response=response, ttl=self.ttl)
+
+        if entry.size > self.max_bytes:
+            return None
+
+        key = self.get_key(request=request, vary=vary)
+
+        with self._lock:
+            self._vary[self.get_base_key(request=request)] = vary
+
+            if (old := self._entries.pop(key, None)) is not None:
+                self._size -= old.size
+
+            self._entries[key] = entry
+            self._size += entry.size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+
+        return entry
+
+    def clear(self):
+        """Очистить кэш"""
+        with self._lock:
+            self._entries.clear()
+            self._vary.clear()
+            self._size = 0
+
+        logger.info('Кэш ответов очищен')
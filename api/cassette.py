@@ -0,0 +1,226 @@
+"""Модуль для записи и воспроизведения API-запросов из кассет на диске"""
+from base64 import b64decode, b64encode
+from datetime import timedelta
+from enum import StrEnum
+from json import dumps, loads
+from pathlib import Path
+from re import sub
+from threading import Lock
+
+from requests import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+from api.multipart import MultipartEncoder
+from other.logging import logger
+
+REDACTED = '***'
+
+
+class CassetteMode(StrEnum):
+    """Перечисление режимов работы кассет"""
+    NONE = 'none'
+    RECORD = 'record'
+    REPLAY = 'replay'
+
+
+class CassetteMissError(Exception):
+    """Исключение при отсутствии в кассете записи для запроса"""
+
+    def __init__(self, path: Path, key: tuple):
+        self.path, self.key = path, key
+
+    def __str__(self):
+        if not self.path.exists():
+            return f'Кассета "{self.path}" не найдена, нет записи для запроса: {self.key}'
+
+        return f'В кассете "{self.path}" нет записи для запроса: {self.key}'
+
+
+def encode_body(body: str | bytes | None) -> dict[str, str | None]:
+    """Сериализовать тело: текст как есть, бинарные данные в base64
+
+    Args:
+        body: тело запроса или ответа
+    """
+    if isinstance(body, bytes):
+        try:
+            return {'body': body.decode()}
+
+        except UnicodeDecodeError:
+            return {'body_base64': b64encode(body).decode()}
+
+    return {'body': body}
+
+
+def get_request_body(body) -> str | bytes | None:
+    """Получить тело запроса для записи в кассету и поиска: потоковое multipart тело заменяется его описанием
+
+    Args:
+        body: тело подготовленного запроса
+    """
+    if isinstance(body, MultipartEncoder):
+        return body.summary()
+
+    return body if isinstance(body, (str, bytes)) else None
+
+
+def decode_body(data: dict) -> bytes:
+    """Восстановить тело из сериализованного вида
+
+    Args:
+        data: запись с body или body_base64
+    """
+    if (body := data.get('body_base64')) is not None:
+        return b64decode(body)
+
+    return (data.get('body') or '').encode()
+
+
+def get_cassette_path(cassette_dir: Path, nodeid: str) -> Path:
+    """Получить путь до кассеты теста
+
+    Args:
+        cassette_dir: каталог с кассетами;
+        nodeid: идентификатор теста pytest.
+    """
+    module, _, name = nodeid.partition('::')
+    name = sub(r'[^\w.-]+', '_', name)
+
+    return cassette_dir / Path(module).with_suffix('') / f'{name}.json'
+
+
+class Cassette:
+    """Кассета с парами запрос/ответ одного теста"""
+
+    def __init__(
+            self,
+            path: Path,
+            mode: CassetteMode,
+            match_on: tuple[str, ...] = ('method', 'url', 'body'),
+            redact_headers: tuple[str, ...] = ('Authorization', 'Cookie', 'Set-Cookie')
+    ):
+        """
+
+        Args:
+            path: файл кассеты;
+            mode: режим работы;
+            match_on: поля запроса для поиска записи: method, url, body;
+            redact_headers: заголовки, значения которых не сохраняются в кассету.
+        """
+        self.path, self.mode, self.match_on = path, mode, match_on
+        self.redact_headers = {header.lower() for header in redact_headers}
+        self.interactions: list[dict] = []
+        self._played: dict[tuple, int] = {}
+        self._lock = Lock()
+        self._is_loaded = mode != CassetteMode.REPLAY
+
+    def _load(self):
+        """Загрузить записи кассеты при первом воспроизведении, чтобы тесты без API-запросов не требовали кассету.
+        Вызывается под блокировкой
+        """
+        if self._is_loaded:
+            return
+
+        self._is_loaded = True
+
+        if self.path.exists():
+            self.interactions = loads(self.path.read_text(encoding='utf-8'))
+            logger.info(f'Загружена кассета {self.path}. Записей: {len(self.interactions)}')
+
+    def _redact(self, headers: dict[str, str]) -> dict[str, str]:
+        """Скрыть значения чувствительных заголовков
+
+        Args:
+            headers: заголовки
+        """
+        return {key: REDACTED if key.lower() in self.redact_headers else value for key, value in headers.items()}
+
+    def get_key(self, method: str, url: str, body: str | bytes | None) -> tuple:
+        """Получить ключ поиска записи по полям match_on
+
+        Args:
+            method: HTTP-метод;
+            url: адрес с параметрами;
+            body: тело запроса.
+        """
+        body = get_request_body(body=body)
+        body = body.decode(errors='replace') if isinstance(body, bytes) else body
+        fields = {'method': method, 'url': url, 'body': body}
+
+        return tuple(fields[name] or '' for name in self.match_on)
+
+    def record(self, request: PreparedRequest, response: Response):
+        """Записать пару запрос/ответ
+
+        Args:
+            request: подготовленный запрос;
+            response: ответ.
+        """
+        interaction = {
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'headers': self._redact(dict(request.headers)),
+                **encode_body(get_request_body(body=request.body))
+            },
+            'response': {
+                'status_code': response.status_code,
+                'reason': response.reason,
+                'url': response.url,
+                'headers': self._redact(dict(response.headers)),
+                'elapsed': response.elapsed.total_seconds(),
+                **encode_body(response.content)
+            }
+        }
+
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def play(self, request: PreparedRequest) -> Response:
+        """Получить ответ на запрос из кассеты. Одинаковые запросы воспроизводятся в порядке записи
+
+        Args:
+            request: подготовленный запрос
+        """
+        key = self.get_key(method=request.method, url=request.url, body=request.body)
+
+        with self._lock:
+            self._load()
+            candidates = [
+                interaction for interaction in self.interactions
+                if self.get_key(
+                    method=interaction['request']['method'],
+                    url=interaction['request']['url'],
+                    body=decode_body(interaction['request'])
+                ) == key
+            ]
+
+            if not candidates:
+                raise CassetteMissError(path=self.path, key=key)
+
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+
+        data = candidates[min(index, len(candidates) - 1)]['response']
+
+        response = Response()
+        response.status_code, response.reason, response.url = data['status_code'], data['reason'], data['url']
+        response.headers = CaseInsensitiveDict(data['headers'])
+        response.elapsed = timedelta(seconds=data['elapsed'])
+        response.encoding = None if 'body_base64' in data else 'utf-8'
+        response._content = decode_body(data)
+        response.request = request
+
+        logger.debug(f'Ответ воспроизведен из кассеты {self.path}: [{response.status_code}] {request.url}')
+
+        return response
+
+    def save(self):
+        """Сохранить записанные пары запрос/ответ в файл кассеты"""
+        if self.mode != CassetteMode.RECORD or not self.interactions:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(dumps(self.interactions, indent=2, ensure_ascii=False), encoding='utf-8')
+
+        logger.info(f'Кассета сохранена {self.path}. Записей: {len(self.interactions)}')
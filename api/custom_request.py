@@ -1,12 +1,36 @@
 from enum import StrEnum
+from threading import local
+from time import perf_counter
+from pathlib import Path
 from typing import Type, Any
 
+from allure import attach, attachment_type
 from pydantic import BaseModel
-from requests import request, Request as src_Request
+from requests import ConnectionError, PreparedRequest, Request as src_Request, Response, Session, Timeout
+from requests.structures import CaseInsensitiveDict
 
+from api.cache import CACHEABLE_METHODS, ResponseCache
+from api.cassette import Cassette, CassetteMode
 from api.custom_response import CustomResponse
-from other.logging import log_request, log_response
-from other.model import convert_model
+from api.download import DownloadResult, stream_to_file
+from api.metrics import EndpointMetrics
+from api.multipart import FileField, MultipartEncoder
+from api.pagination import PaginationStyle, Paginator
+from api.rate_limiter import RETRY_STATUSES, RateLimiter, parse_retry_after
+from other.config import Config
+from other.logging import log_cached_response, log_request, log_response, logger
+from other.model import serialize_model
+
+
+sessions = local()
+
+
+def get_session() -> Session:
+    """Получить сессию requests текущего потока. Сессия переиспользует соединения между запросами"""
+    if (session := getattr(sessions, 'session', None)) is None:
+        session = sessions.session = Session()
+
+    return session
 
 
 class MethodEnum(StrEnum):
@@ -21,6 +45,10 @@ class MethodEnum(StrEnum):
 class Request:
     """Класс для отправки API-запросов"""
     headers, params, data, files, json, token_cache = {}, {}, {}, {}, {}, {}
+    metrics = EndpointMetrics()
+    cache_enabled, response_cache = False, ResponseCache()
+    cassette: Cassette | None = None
+    rate_limiter: RateLimiter | None = None
 
     def request(
             self,
@@ -31,8 +59,11 @@ class Request:
             params: dict[str, Any] | None = None,
             timeout: int | float | None = None,
             json: dict | list | BaseModel | None = None,
+            files: dict[str, FileField] | None = None,
             response_model: Type[BaseModel] | None = None,
             response_error_model: Type[BaseModel] | None = None,
+            use_cache: bool | None = None,
+            download: Path | str | None = None,
             **kwargs,
     ) -> CustomResponse:
         """Отправить запрос и залогировать запрос и ответ
@@ -43,43 +74,251 @@ class Request:
             headers: заголовки, если есть
             data: тело запроса, если есть
             json: тело запроса в формате dict
+            files: файлы для потоковой загрузки multipart/form-data: путь, mmap, открытый файл
+                или кортеж (имя файла, источник[, content-type]). Поля формы берутся из data-словаря
             params: параметры запроса, если есть
             timeout: таймаут, который надо выждать прежде чем отправить запрос
             response_model: Схема ответа
             response_error_model: схема ответа для негативных сценариев
+            use_cache: использовать кэш ответов для GET/HEAD, по умолчанию Request.cache_enabled
+            download: файл, в который тело ответа сохраняется потоком вместо загрузки в память
             **kwargs: кварги для метода преобразования объекта модели
         """
+        headers = headers if headers else self.headers
+
         if isinstance(data := data if data else self.data, BaseModel):
-            data = convert_model(model=data, is_json=True, **kwargs)
+            data = serialize_model(model=data, **kwargs)
 
         if isinstance(json := json if json else self.json, BaseModel):
-            json = convert_model(model=json, **kwargs)
-
-        log_request(
-            request=src_Request(
-                url=url,
-                method=f'{method}',
-                headers=headers if headers else self.headers,
-                params=params if params else self.params,
-                data=data if data else self.data,
-                json=json if json else self.json
-            ).prepare()
-        )
+            if data:
+                raise ValueError('Тело запроса передано одновременно в data и json, передайте только одно из них')
+
+            data, json = serialize_model(model=json, **kwargs), None
+            headers = {'Content-Type': 'application/json', **headers}
+
+        if files := files if files else self.files:
+            data = MultipartEncoder(fields=data if isinstance(data, dict) else None, files=files)
+            headers = {**headers, 'Content-Type': data.content_type}
 
-        response = request(
+        prepared = get_session().prepare_request(src_Request(
             url=url,
             method=f'{method}',
-            headers=headers if headers else self.headers,
+            headers=headers,
             params=params if params else self.params,
             data=data if data else self.data,
-            json=json if json else self.json,
-            verify=False,
-            timeout=timeout
-        )
-        log_response(response=response)
+            json=json if json else self.json
+        ))
+        log_request(request=prepared)
+
+        if download:  # потоковые тела читаются один раз, кэш и кассеты не применяются
+            response, result = self.__download(prepared=prepared, timeout=timeout, path=Path(download))
+
+            return CustomResponse(
+                response=response,
+                response_model=response_model,
+                response_error_model=response_error_model,
+                download=result
+            )
+
+        # потоковое multipart тело не кэшируется, в кассете оно записывается и ищется по описанию тела
+        is_multipart = isinstance(prepared.body, MultipartEncoder)
+
+        if (cassette := self.cassette) and cassette.mode == CassetteMode.REPLAY:
+            log_response(response=(response := cassette.play(request=prepared)))
+
+        elif (
+                not is_multipart
+                and (self.cache_enabled if use_cache is None else use_cache)
+                and prepared.method in CACHEABLE_METHODS
+        ):
+            response = self.__send_cached(prepared=prepared, timeout=timeout)
+
+        else:
+            response = self.__send(prepared=prepared, timeout=timeout)
+
+        if cassette and cassette.mode == CassetteMode.RECORD:
+            cassette.record(request=prepared, response=response)
 
         return CustomResponse(
             response=response,
             response_model=response_model,
             response_error_model=response_error_model
         )
+
+    def paginate(
+            self,
+            url: str,
+            style: PaginationStyle = PaginationStyle.LINK,
+            response_model: Type[BaseModel] | None = None,
+            max_items: int | None = None,
+            max_pages: int | None = None,
+            **kwargs
+    ) -> Paginator:
+        """Получить ленивый итератор по элементам постраничной коллекции
+
+        Args:
+            url: адрес первой страницы
+            style: способ перехода на следующую страницу: заголовок Link, курсор или смещение
+            response_model: модель элемента коллекции
+            max_items: максимальное количество элементов
+            max_pages: максимальное количество страниц
+            **kwargs: параметры Paginator и Request.request
+        """
+        return Paginator(
+            request=self,
+            url=url,
+            style=style,
+            response_model=response_model,
+            max_items=max_items,
+            max_pages=max_pages,
+            **kwargs
+        )
+
+    @classmethod
+    def __transport(cls, prepared: PreparedRequest, timeout: int | float | None, stream: bool = False) -> Response:
+        """Отправить подготовленный запрос через сессию текущего потока. Если хост ограничил частоту запросов
+        ответом 429/503 с Retry-After, запрос повторяется после паузы, общей для всех воркеров.
+        Ошибки подключения учитываются размыкателем цепи стенда
+
+        Args:
+            prepared: подготовленный запрос;
+            timeout: таймаут запроса;
+            stream: не читать тело ответа при получении.
+        """
+        session = get_session()
+        settings = session.merge_environment_settings(url=prepared.url, proxies={}, stream=stream, verify=False, cert=None)
+        limiter, retries, breaker = cls.rate_limiter, 0, Config.circuit_breaker
+
+        while True:
+            if breaker:
+                breaker.check(url=prepared.url)
+
+            try:
+                response = session.send(prepared, timeout=timeout, **settings)
+
+            except (ConnectionError, Timeout) as e:
+                if breaker:
+                    breaker.record_failure(url=prepared.url, error=e)
+
+                raise
+
+            finally:
+                session.cookies.clear()
+
+            if breaker:
+                breaker.record_success(url=prepared.url)
+
+            if (
+                    not limiter
+                    or retries >= limiter.max_retries
+                    or response.status_code not in RETRY_STATUSES
+                    or isinstance(prepared.body, MultipartEncoder)  # потоковое тело уже прочитано
+                    or (retry_after := parse_retry_after(response.headers.get('Retry-After'))) is None
+            ):
+                return response
+
+            response.close()
+            limiter.block(url=prepared.url, seconds=retry_after)
+            limiter.acquire(url=prepared.url)
+            retries += 1
+            logger.info(f'Повтор {retries} запроса после ответа {response.status_code}: {prepared.url}')
+
+    def __send(self, prepared: PreparedRequest, timeout: int | float | None) -> Response:
+        """Отправить подготовленный запрос, учесть задержку в статистике эндпоинта и залогировать ответ
+
+        Args:
+            prepared: подготовленный запрос, тело которого уже сериализовано;
+            timeout: таймаут запроса.
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url=prepared.url)
+
+        start = perf_counter()
+        response = self.__transport(prepared=prepared, timeout=timeout)
+        self.metrics.record(
+            method=prepared.method,
+            url=prepared.url,
+            total=(perf_counter() - start) * 1000,
+            ttfb=response.elapsed.total_seconds() * 1000,
+            request_size=len(prepared.body or b''),
+            response_size=len(response.content)
+        )
+
+        if isinstance(body := prepared.body, MultipartEncoder):
+            msg = f'Загружено {body.bytes_read} байт со скоростью {body.throughput:.2f} МБ/с'
+            logger.info(msg)
+            attach(body=f'{body.summary()}\n{msg}', name='UPLOAD', attachment_type=attachment_type.TEXT)
+
+        log_response(response=response)
+
+        return response
+
+    def __download(
+            self,
+            prepared: PreparedRequest,
+            timeout: int | float | None,
+            path: Path
+    ) -> tuple[Response, DownloadResult]:
+        """Отправить запрос и сохранить тело ответа в файл потоком, учесть задержку и залогировать ответ без тела
+
+        Args:
+            prepared: подготовленный запрос;
+            timeout: таймаут запроса;
+            path: путь до файла.
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url=prepared.url)
+
+        start = perf_counter()
+        response = self.__transport(prepared=prepared, timeout=timeout, stream=True)
+        download = stream_to_file(response=response, path=path)
+        self.metrics.record(
+            method=prepared.method,
+            url=prepared.url,
+            total=(perf_counter() - start) * 1000,
+            ttfb=response.elapsed.total_seconds() * 1000,
+            request_size=len(prepared.body or b''),
+            response_size=download.size
+        )
+        logger.info(f'Скачано {download.size} байт со скоростью {download.throughput:.2f} МБ/с')
+        log_response(response=response, summary=download.summary())
+
+        return response, download
+
+    def __send_cached(self, prepared: PreparedRequest, timeout: int | float | None) -> Response:
+        """Получить ответ из кэша или отправить запрос, при необходимости условный, и сохранить ответ в кэш
+
+        Args:
+            prepared: подготовленный запрос для вычисления ключа кэша;
+            timeout: таймаут запроса.
+        """
+        cache = self.response_cache
+        key = cache.get_key(request=prepared)
+
+        with cache.lock(key=key):
+            if (entry := cache.get(key=key)) is not None and entry.is_fresh:
+                cache.hits += 1
+                log_cached_response(response=entry.response, url=prepared.url)
+
+                return entry.response
+
+            if entry is not None:
+                (conditional := prepared.copy()).headers.update(entry.validators)
+            else:
+                conditional = prepared
+
+            response = self.__send(prepared=conditional, timeout=timeout)
+
+            if entry is not None and response.status_code == 304:
+                cache.revalidated += 1
+                (headers := CaseInsensitiveDict(entry.response.headers)).update(response.headers)
+                entry.response.headers = headers
+                entry.refresh(headers=headers, ttl=cache.ttl)
+                logger.info(f'Ответ в кэше не изменился (304), взят из кэша: {prepared.url}')
+
+                return entry.response
+
+            cache.misses += 1
+            cache.put(request=prepared, response=response)
+
+            return response
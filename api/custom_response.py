@@ -7,32 +7,38 @@ from requests.cookies import RequestsCookieJar
 from requests.structures import CaseInsensitiveDict
 from requests.utils import dict_from_cookiejar
 
+from api.download import DownloadResult
 from other.logging import logger
 from other import model
 
 ERROR_SUCCESS_MSG = 'Поле "success" отлично от {result}'
 ERROR_STATUS_CUSTOM_MSG = 'Код статуса ответа {code} не совпадает с ожидаемым: {exp}'
+ERROR_DOWNLOAD_MSG = '{field} скачанного файла {result} не совпадает с ожидаемым: {exp}'
 
 
 class CustomResponse:
     """ Класс, расширяющий стандартный Response, поддержкой работы с моделями """
 
-    __slots__ = ['response', 'response_model', 'response_error_model', '_response_body']
+    __slots__ = ['response', 'download', 'response_model', 'response_error_model', '_response_body']
 
     def __init__(
             self,
             response: Response,
             response_model: type[BaseModel] | None = None,
-            response_error_model: type[BaseModel] | None = None
+            response_error_model: type[BaseModel] | None = None,
+            *,
+            download: DownloadResult | None = None
     ):
         """
 
         Args:
             response: объект ответа, получаем из запроса через self.request;
             response_model: основная модель ответа, передается в методе запроса;
-            response_error_model: модель ответа для негативных сценариев, передается в методе запроса.
+            response_error_model: модель ответа для негативных сценариев, передается в методе запроса;
+            download: результат скачивания, если тело ответа сохранено в файл.
         """
         self.response = response
+        self.download = download
         self._response_body: dict[str, Any] | None = None
         self.response_model = response_model
         self.response_error_model = response_error_model
@@ -234,3 +240,56 @@ class CustomResponse:
         model.is_valid(model=model_, response=body_)
 
         logger.success('Тело ответа успешно проверено по схеме!')
+
+    def __get_download(self) -> DownloadResult:
+        """Получить результат скачивания или вызвать исключение, если тело ответа не сохранялось в файл"""
+        if self.download is None:
+            raise AttributeError('Тело ответа не скачивалось в файл. Передайте download в методе запроса')
+
+        return self.download
+
+    @step('Проверить контрольную сумму скачанного файла')
+    def assert_checksum(self, expected: str, algorithm: str = 'sha256') -> Self:
+        """Проверить контрольную сумму скачанного файла, посчитанную во время скачивания
+
+        Args:
+            expected: ожидаемая контрольная сумма;
+            algorithm: алгоритм: sha256 или md5.
+        """
+        result = getattr(self.__get_download(), algorithm)
+
+        assert result == expected.lower(), ERROR_DOWNLOAD_MSG.format(field=algorithm, result=result, exp=expected)
+
+        logger.success(f'Контрольная сумма {algorithm} скачанного файла успешно проверена!')
+
+        return self
+
+    @step('Проверить размер скачанного файла')
+    def assert_size(self, expected: int) -> Self:
+        """Проверить размер скачанного файла в байтах
+
+        Args:
+            expected: ожидаемый размер.
+        """
+        result = self.__get_download().size
+
+        assert result == expected, ERROR_DOWNLOAD_MSG.format(field='Размер', result=result, exp=expected)
+
+        logger.success('Размер скачанного файла успешно проверен!')
+
+        return self
+
+    @step('Проверить тип содержимого скачанного файла')
+    def assert_content_type(self, expected: str) -> Self:
+        """Проверить тип содержимого скачанного файла по заголовку Content-Type без учета параметров
+
+        Args:
+            expected: ожидаемый тип, например application/zip.
+        """
+        result = self.__get_download().content_type.split(';')[0].strip()
+
+        assert result == expected, ERROR_DOWNLOAD_MSG.format(field='Тип содержимого', result=result, exp=expected)
+
+        logger.success('Тип содержимого скачанного файла успешно проверен!')
+
+        return self
@@ -0,0 +1,65 @@
+"""Потоковое сохранение ответа в файл с подсчетом контрольных сумм на лету"""
+from dataclasses import dataclass
+from hashlib import md5, sha256
+from pathlib import Path
+from time import perf_counter
+
+from requests import Response
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(slots=True)
+class DownloadResult:
+    """Результат скачивания: файл, размер, контрольные суммы и скорость"""
+    path: Path
+    size: int
+    sha256: str
+    md5: str
+    content_type: str
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        """Скорость скачивания в мегабайтах в секунду"""
+        return self.size / 1024 / 1024 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Получить описание скачанного файла для лога вместо тела ответа"""
+        return (
+            f'сохранено в {self.path}: {self.size} байт, {self.content_type or "тип не указан"}, '
+            f'sha256: {self.sha256}, md5: {self.md5}, скорость: {self.throughput:.2f} МБ/с'
+        )
+
+
+def stream_to_file(response: Response, path: Path | str, chunk_size: int = CHUNK_SIZE) -> DownloadResult:
+    """Сохранить тело ответа в файл по частям, считая размер, sha256 и md5 без повторного чтения файла
+
+    Args:
+        response: ответ, полученный с stream=True;
+        path: путь до файла;
+        chunk_size: размер части в байтах.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sha256_hash, md5_hash, size, start = sha256(), md5(), 0, perf_counter()
+
+    try:
+        with path.open('wb') as file:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                file.write(chunk)
+                sha256_hash.update(chunk)
+                md5_hash.update(chunk)
+                size += len(chunk)
+
+    finally:
+        response.close()
+
+    return DownloadResult(
+        path=path,
+        size=size,
+        sha256=sha256_hash.hexdigest(),
+        md5=md5_hash.hexdigest(),
+        content_type=response.headers.get('Content-Type', ''),
+        elapsed=perf_counter() - start
+    )
@@ -0,0 +1,281 @@
+"""Нагрузочный прогон API-сценариев на базе Request и моделей ответа
+
+Пример запуска против сервера-заглушки:
+    python -m api.load_runner scenarios.orders:create_order --stub_routes stub.json --users 10 --duration 30
+"""
+from argparse import ArgumentParser, Namespace
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from importlib import import_module
+from json import dumps, loads
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import perf_counter, sleep
+from typing import Callable
+
+from allure import attach, attachment_type
+from pydantic import ValidationError
+
+from api.custom_request import Request
+from api.custom_response import CustomResponse
+from api.metrics import LatencyHistogram
+from api.stub_server import StubServer
+from other.logging import create_logger, logger
+
+Scenario = Callable[[Request, str], CustomResponse]
+
+
+@dataclass
+class LoadReport:
+    """Результат нагрузочного прогона"""
+    users: int
+    rate: float | None
+    duration: float
+    requests: int = 0
+    errors: int = 0
+    throughput: float = 0.0
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    status_codes: dict[str, int] = field(default_factory=dict)
+    error_breakdown: dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return (
+            f'Нагрузочный прогон: {self.users} пользователей, '
+            f'{"открытая модель " + str(self.rate) + " rps" if self.rate else "закрытая модель"}\n'
+            f'\tЗапросов:\t{self.requests}\n'
+            f'\tОшибок:\t\t{self.errors}\n'
+            f'\tRPS:\t\t{self.throughput:.2f}\n'
+            f'\tЗадержка:\t{self.latency_ms}\n'
+            f'\tСтатусы:\t{self.status_codes}\n'
+            f'\tОшибки:\t\t{self.error_breakdown}'
+        )
+
+    def attach(self):
+        """Прикрепить результат в allure"""
+        attach(body=dumps(asdict(self), indent=2), name='LOAD REPORT', attachment_type=attachment_type.JSON)
+
+
+class LoadRunner:
+    """Класс для запуска виртуальных пользователей, выполняющих API-сценарий"""
+
+    def __init__(
+            self,
+            scenario: Scenario,
+            base_url: str,
+            users: int = 1,
+            duration: float = 10,
+            warmup: float = 0,
+            rate: float | None = None,
+            think_time: float = 0
+    ):
+        """
+
+        Args:
+            scenario: функция сценария, принимающая Request и базовый url и возвращающая CustomResponse;
+            base_url: базовый url сервиса;
+            users: количество виртуальных пользователей (размер пула для открытой модели);
+            duration: длительность измерения в секундах, без учета прогрева;
+            warmup: длительность прогрева в секундах, результаты прогрева не учитываются;
+            rate: интенсивность итераций в секунду для открытой модели, None - закрытая модель;
+            think_time: пауза между итерациями пользователя в закрытой модели.
+        """
+        self.scenario, self.base_url = scenario, base_url
+        self.users, self.duration, self.warmup, self.rate, self.think_time = users, duration, warmup, rate, think_time
+
+        self._lock = Lock()
+        self._stop = Event()
+        self._latencies = LatencyHistogram()
+        self._statuses: Counter[str] = Counter()
+        self._errors: Counter[str] = Counter()
+        self._measure_from = 0.0
+
+    def _iteration(self, request: Request, scheduled: float):
+        """Выполнить итерацию сценария и учесть результат
+
+        Args:
+            request: экземпляр Request виртуального пользователя;
+            scheduled: запланированное время старта итерации, от него считается задержка.
+        """
+        status, error = None, None
+
+        try:
+            response = self.scenario(request, self.base_url)
+            status = str(response.status_code)
+
+            if response.status_code >= 400:
+                error = status
+
+            elif response.response_model:
+                response.response_model.model_validate(response.json())
+
+        except ValidationError:
+            error = 'schema'
+
+        except Exception as e:
+            error = type(e).__name__
+
+        finished = perf_counter()
+
+        if scheduled < self._measure_from:
+            return
+
+        with self._lock:
+            self._latencies.add((finished - scheduled) * 1000)
+            self._statuses[status or 'no response'] += 1
+
+            if error:
+                self._errors[error] += 1
+
+    def _run_closed(self, deadline: float):
+        """Запустить закрытую модель: каждый пользователь выполняет итерации друг за другом
+
+        Args:
+            deadline: время окончания прогона.
+        """
+        def user():
+            request = Request()
+
+            while (scheduled := perf_counter()) < deadline and not self._stop.is_set():
+                self._iteration(request=request, scheduled=scheduled)
+
+                if self.think_time:
+                    sleep(self.think_time)
+
+        threads = [Thread(target=user, name=f'vu-{i}', daemon=True) for i in range(self.users)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    def _run_open(self, start: float, deadline: float):
+        """Запустить открытую модель: итерации стартуют с заданной интенсивностью независимо от ответов
+
+        Args:
+            start: время начала прогона;
+            deadline: время окончания прогона.
+        """
+        with ThreadPoolExecutor(max_workers=self.users, thread_name_prefix='vu') as pool:
+            index = 0
+
+            while (scheduled := start + index / self.rate) < deadline and not self._stop.is_set():
+                if (delay := scheduled - perf_counter()) > 0:
+                    sleep(delay)
+
+                pool.submit(self._iteration, Request(), scheduled)
+                index += 1
+
+    def run(self) -> LoadReport:
+        """Запустить прогон и получить результат"""
+        logger.info(
+            f'Запуск нагрузки: {self.users} пользователей, прогрев {self.warmup} с, длительность {self.duration} с, '
+            f'{"интенсивность " + str(self.rate) + " итераций/с" if self.rate else "закрытая модель"}'
+        )
+
+        start = perf_counter()
+        self._measure_from = start + self.warmup
+        deadline = self._measure_from + self.duration
+
+        try:
+            if self.rate:
+                self._run_open(start=start, deadline=deadline)
+            else:
+                self._run_closed(deadline=deadline)
+
+        except KeyboardInterrupt:
+            self._stop.set()
+
+        elapsed = max(perf_counter() - self._measure_from, 1e-9)
+        latency = self._latencies.summary()
+
+        report = LoadReport(
+            users=self.users,
+            rate=self.rate,
+            duration=round(elapsed, 3),
+            requests=self._latencies.count,
+            errors=sum(self._errors.values()),
+            throughput=self._latencies.count / elapsed,
+            latency_ms={name: latency[name] for name in ('p50', 'p95', 'p99', 'max')},
+            status_codes=dict(self._statuses),
+            error_breakdown=dict(self._errors)
+        )
+        logger.success(str(report))
+
+        return report
+
+
+def load_scenario(path: str) -> Scenario:
+    """Импортировать сценарий по пути вида package.module:function
+
+    Args:
+        path: путь до функции сценария
+    """
+    module, _, name = path.partition(':')
+
+    return getattr(import_module(module), name)
+
+
+def load_stub(path: Path) -> StubServer:
+    """Создать сервер-заглушку по описанию маршрутов из JSON-файла
+
+    Args:
+        path: файл со списком маршрутов вида {"method", "path", "status", "body", "headers", "delay"}
+    """
+    server = StubServer()
+
+    for route in loads(path.read_text(encoding='utf-8')):
+        server.add_route(**route)
+
+    return server
+
+
+def main(args: Namespace):
+    """Запустить нагрузочный прогон из командной строки
+
+    Args:
+        args: аргументы командной строки
+    """
+    create_logger(log_level=args.log_level, params=args)
+    stub = load_stub(args.stub_routes).start() if args.stub_routes else None
+
+    try:
+        report = LoadRunner(
+            scenario=load_scenario(args.scenario),
+            base_url=stub.url if stub else args.base_url,
+            users=args.users,
+            duration=args.duration,
+            warmup=args.warmup,
+            rate=args.rate,
+            think_time=args.think_time
+        ).run()
+
+    finally:
+        if stub:
+            stub.stop()
+
+    print(report)
+
+    if args.output:
+        args.output.write_text(dumps(asdict(report), indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Нагрузочный прогон API-сценария')
+    parser.add_argument('scenario', help='Сценарий вида package.module:function(request, base_url)')
+    parser.add_argument('--base_url', default='', help='Базовый url сервиса')
+    parser.add_argument('--stub_routes', type=Path, help='JSON-файл с маршрутами сервера-заглушки')
+    parser.add_argument('--users', type=int, default=1, help='Количество виртуальных пользователей')
+    parser.add_argument('--duration', type=float, default=10, help='Длительность измерения в секундах')
+    parser.add_argument('--warmup', type=float, default=0, help='Длительность прогрева в секундах')
+    parser.add_argument('--rate', type=float, help='Интенсивность итераций в секунду (открытая модель)')
+    parser.add_argument('--think_time', type=float, default=0, help='Пауза между итерациями в закрытой модели')
+    parser.add_argument('--output', type=Path, help='Файл для сохранения результата в JSON')
+    parser.add_argument(
+        '--log_level',
+        default='WARNING',
+        choices=['DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL'],
+        help='Уровень логгирования'
+    )
+    main(args=parser.parse_args())
@@ -0,0 +1,247 @@
+"""Модуль со сбором задержек API-запросов по эндпоинтам"""
+from json import dumps, loads
+from math import floor, log
+from pathlib import Path
+from re import compile
+from threading import Lock
+from typing import Self
+from urllib.parse import urlsplit
+
+ID_SEGMENT = compile(r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$')
+PERCENTILES = (50, 90, 95, 99)
+ZERO_BUCKET = -2 ** 31  # корзина для нулевых значений, меньше любой логарифмической корзины
+
+
+def template_url(url: str) -> str:
+    """Привести url к шаблону: убрать query-параметры и заменить идентификаторы в пути на {id}
+
+    Args:
+        url: адрес запроса
+    """
+    parts = urlsplit(url)
+    path = '/'.join('{id}' if ID_SEGMENT.match(segment) else segment for segment in parts.path.split('/'))
+
+    return f'{parts.scheme}://{parts.netloc}{path}' if parts.netloc else path
+
+
+class LatencyHistogram:
+    """Компактная гистограмма значений с логарифмическими корзинами и заданной относительной точностью"""
+
+    __slots__ = ['precision', 'counts', 'count', 'total', 'min', 'max', '_base']
+
+    def __init__(self, precision: float = 0.02):
+        """
+
+        Args:
+            precision: относительная погрешность значения корзины
+        """
+        self.precision = precision
+        self.counts: dict[int, int] = {}
+        self.count, self.total, self.min, self.max = 0, 0.0, 0.0, 0.0
+        self._base = log(1 + precision)
+
+    def add(self, value: float):
+        """Добавить значение
+
+        Args:
+            value: значение, например задержка в миллисекундах
+        """
+        bucket = floor(log(value) / self._base) if value > 0 else ZERO_BUCKET
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.min = min(self.min, value) if self.count else value
+        self.max = max(self.max, value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> float:
+        """Получить перцентиль
+
+        Args:
+            q: перцентиль от 0 до 100
+        """
+        if not self.count:
+            return 0.0
+
+        rank, seen = q / 100 * self.count, 0
+
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+
+            if seen >= rank:
+                value = 0.0 if bucket == ZERO_BUCKET else (1 + self.precision) ** (bucket + 0.5)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Получить сводку: количество, среднее, перцентили и максимум"""
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0.0,
+            **{f'p{q}': round(self.percentile(q), 3) for q in PERCENTILES},
+            'max': round(self.max, 3)
+        }
+
+    def merge(self, other: 'LatencyHistogram') -> Self:
+        """Добавить значения другой гистограммы с той же точностью
+
+        Args:
+            other: гистограмма
+        """
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+
+        if other.count:
+            self.min = min(self.min, other.min) if self.count else other.min
+            self.max = max(self.max, other.max)
+
+        self.count += other.count
+        self.total += other.total
+
+        return self
+
+    def as_dict(self) -> dict:
+        """Сериализовать гистограмму"""
+        return {
+            'precision': self.precision,
+            'counts': {str(k): v for k, v in self.counts.items()},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Self:
+        """Восстановить гистограмму из словаря
+
+        Args:
+            data: результат as_dict
+        """
+        histogram = cls(precision=data['precision'])
+        histogram.counts = {int(k): v for k, v in data['counts'].items()}
+        histogram.count, histogram.total, histogram.min, histogram.max = (
+            data['count'], data['total'], data['min'], data['max']
+        )
+
+        return histogram
+
+
+class EndpointStats:
+    """Статистика запросов одного эндпоинта"""
+
+    __slots__ = ['total', 'ttfb', 'request_bytes', 'response_bytes']
+
+    def __init__(self):
+        self.total, self.ttfb = LatencyHistogram(), LatencyHistogram()
+        self.request_bytes, self.response_bytes = LatencyHistogram(), LatencyHistogram()
+
+    def as_dict(self) -> dict:
+        """Сериализовать статистику"""
+        return {name: getattr(self, name).as_dict() for name in self.__slots__}
+
+    def merge(self, data: dict):
+        """Добавить сериализованную статистику
+
+        Args:
+            data: результат as_dict
+        """
+        for name in self.__slots__:
+            getattr(self, name).merge(LatencyHistogram.from_dict(data[name]))
+
+
+class EndpointMetrics:
+    """Потокобезопасный реестр статистики запросов по (метод, шаблон url)"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def record(self, method: str, url: str, total: float, ttfb: float, request_size: int, response_size: int):
+        """Учесть выполненный запрос
+
+        Args:
+            method: HTTP-метод;
+            url: адрес запроса;
+            total: полное время запроса в миллисекундах;
+            ttfb: время до первого байта ответа в миллисекундах;
+            request_size: размер тела запроса в байтах;
+            response_size: размер тела ответа в байтах.
+        """
+        key = f'{method} {template_url(url)}'
+
+        with self._lock:
+            if (stats := self.endpoints.get(key)) is None:
+                stats = self.endpoints[key] = EndpointStats()
+
+            stats.total.add(total)
+            stats.ttfb.add(ttfb)
+            stats.request_bytes.add(request_size)
+            stats.response_bytes.add(response_size)
+
+    def as_dict(self) -> dict[str, dict]:
+        """Сериализовать реестр для объединения между воркерами"""
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self.endpoints.items()}
+
+    def merge(self, data: dict[str, dict]) -> Self:
+        """Добавить сериализованный реестр другого воркера
+
+        Args:
+            data: результат as_dict
+        """
+        with self._lock:
+            for key, stats in data.items():
+                self.endpoints.setdefault(key, EndpointStats()).merge(stats)
+
+        return self
+
+    def report(self) -> dict[str, dict]:
+        """Получить отчет: перцентили времени запроса, TTFB и размеров по эндпоинтам"""
+        with self._lock:
+            return {
+                key: {
+                    'total_ms': stats.total.summary(),
+                    'ttfb_ms': stats.ttfb.summary(),
+                    'request_bytes': stats.request_bytes.summary(),
+                    'response_bytes': stats.response_bytes.summary()
+                }
+                for key, stats in sorted(self.endpoints.items(), key=lambda x: -x[1].total.total)
+            }
+
+
+def get_partial_paths(path: Path) -> list[Path]:
+    """Получить файлы статистики воркеров xdist для отчета
+
+    Args:
+        path: путь до итогового отчета
+    """
+    return sorted(path.parent.glob(f'{path.stem}.*.partial.json'))
+
+
+def save_partial(metrics: EndpointMetrics, path: Path, worker: str):
+    """Сохранить статистику воркера xdist для объединения в итоговый отчет
+
+    Args:
+        metrics: статистика воркера;
+        path: путь до итогового отчета;
+        worker: идентификатор воркера.
+    """
+    path.with_name(f'{path.stem}.{worker}.partial.json').write_text(dumps(metrics.as_dict()), encoding='utf-8')
+
+
+def save_report(metrics: EndpointMetrics, path: Path) -> dict[str, dict]:
+    """Объединить статистику воркеров и сохранить итоговый отчет
+
+    Args:
+        metrics: статистика текущего процесса;
+        path: путь до итогового отчета.
+    """
+    for partial in get_partial_paths(path=path):
+        metrics.merge(loads(partial.read_text(encoding='utf-8')))
+        partial.unlink()
+
+    if report := metrics.report():
+        path.write_text(dumps(report, indent=2), encoding='utf-8')
+
+    return report
@@ -0,0 +1,175 @@
+"""Потоковое тело multipart/form-data для загрузки больших файлов без чтения в память"""
+from mmap import mmap
+from os import fstat
+from pathlib import Path
+from time import perf_counter
+from typing import BinaryIO, Iterator
+from uuid import uuid4
+
+CHUNK_SIZE = 1024 * 1024
+FileSource = Path | str | mmap | BinaryIO
+FileField = FileSource | tuple[str, FileSource] | tuple[str, FileSource, str]
+
+
+class FilePart:
+    """Часть multipart тела с содержимым файла, которое читается с диска или из mmap по мере отправки"""
+
+    def __init__(self, source: FileSource):
+        """
+
+        Args:
+            source: путь до файла, отображенный в память файл или открытый бинарный файл
+        """
+        self.source = source
+        self._file: BinaryIO | None = None
+        self._position = 0
+
+        if isinstance(source, (Path, str)):
+            self.size = Path(source).stat().st_size
+        elif isinstance(source, mmap):
+            self.size = len(source)
+        else:
+            self.size = fstat(source.fileno()).st_size - source.tell()
+
+    def read(self, size: int) -> bytes:
+        """Прочитать следующий фрагмент содержимого
+
+        Args:
+            size: максимальный размер фрагмента
+        """
+        if self._position >= self.size:
+            return b''
+
+        if isinstance(self.source, mmap):
+            chunk = self.source[self._position:self._position + size]
+        else:
+            if self._file is None:
+                self._file = open(self.source, 'rb') if isinstance(self.source, (Path, str)) else self.source
+
+            chunk = self._file.read(size)
+
+        self._position += len(chunk)
+
+        if self._position >= self.size and self._file is not None and self._file is not self.source:
+            self._file.close()
+
+        return chunk
+
+
+class MultipartEncoder:
+    """Тело multipart/form-data, которое requests отправляет потоком. Размер известен заранее через __len__,
+    поэтому запрос уходит с Content-Length, а не chunked
+    """
+
+    def __init__(self, fields: dict[str, str | bytes] | None = None, files: dict[str, FileField] | None = None):
+        """
+
+        Args:
+            fields: текстовые поля формы;
+            files: файлы формы: источник или кортеж (имя файла, источник[, content-type]).
+        """
+        self.boundary = uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self.files: dict[str, tuple[str, int]] = {}
+        self._parts: list[bytes | FilePart] = []
+
+        for name, value in (fields or {}).items():
+            self._parts.append(
+                self._get_header(name=name) + (value if isinstance(value, bytes) else f'{value}'.encode()) + b'\r\n'
+            )
+
+        for name, value in (files or {}).items():
+            filename, source, content_type = self._unpack(value=value)
+            part = FilePart(source=source)
+            self.files[filename] = (content_type, part.size)
+            self._parts.extend((self._get_header(name, filename, content_type), part, b'\r\n'))
+
+        self._parts.append(f'--{self.boundary}--\r\n'.encode())
+        self._size = sum(part.size if isinstance(part, FilePart) else len(part) for part in self._parts)
+        self._index = self.bytes_read = 0
+        self.started: float | None = None
+        self.finished: float | None = None
+
+    @staticmethod
+    def _unpack(value: FileField) -> tuple[str, FileSource, str]:
+        """Получить имя файла, источник и content-type поля файла
+
+        Args:
+            value: поле файла
+        """
+        if not isinstance(value, tuple):
+            value = (Path(value if isinstance(value, (Path, str)) else getattr(value, 'name', 'file')).name, value)
+
+        return value[0], value[1], value[2] if len(value) > 2 else 'application/octet-stream'
+
+    def _get_header(self, name: str, filename: str | None = None, content_type: str | None = None) -> bytes:
+        """Получить заголовок части формы
+
+        Args:
+            name: имя поля;
+            filename: имя файла;
+            content_type: тип содержимого файла.
+        """
+        disposition = f'form-data; name="{name}"'
+
+        if filename is not None:
+            disposition += f'; filename="{filename.replace(chr(34), "%22")}"'
+
+        header = f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n'
+
+        if content_type:
+            header += f'Content-Type: {content_type}\r\n'
+
+        return f'{header}\r\n'.encode()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.read(CHUNK_SIZE):
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        """Прочитать следующий фрагмент тела. Вызывается http клиентом во время отправки
+
+        Args:
+            size: максимальный размер фрагмента, -1 - до CHUNK_SIZE
+        """
+        size = CHUNK_SIZE if size is None or size < 0 else size
+        self.started = self.started or perf_counter()
+        result = bytearray()
+
+        while len(result) < size and self._index < len(self._parts):
+            part = self._parts[self._index]
+
+            if isinstance(part, FilePart):
+                chunk = part.read(size - len(result))
+
+                if not chunk:
+                    self._index += 1
+
+                result += chunk
+
+            else:
+                result += part
+                self._index += 1
+
+        self.bytes_read += len(result)
+
+        if self._index >= len(self._parts) and self.finished is None:
+            self.finished = perf_counter()
+
+        return bytes(result)
+
+    @property
+    def throughput(self) -> float:
+        """Скорость отправки тела в мегабайтах в секунду"""
+        elapsed = (self.finished or perf_counter()) - (self.started or perf_counter())
+
+        return self.bytes_read / 1024 / 1024 / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Получить описание тела для лога вместо содержимого"""
+        files = ', '.join(f'{name} ({content_type}, {size} байт)' for name, (content_type, size) in self.files.items())
+
+        return f'multipart/form-data: {len(self)} байт, файлы: {files or "нет"}'
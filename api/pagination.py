@@ -0,0 +1,209 @@
+"""Ленивый обход постраничных коллекций API с фоновой загрузкой следующей страницы"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Iterator
+
+from pydantic import BaseModel, TypeAdapter
+
+from other.logging import defer_report, logger
+
+if TYPE_CHECKING:
+    from api.custom_request import Request
+    from api.custom_response import CustomResponse
+
+
+class PaginationStyle(StrEnum):
+    """Способ перехода на следующую страницу"""
+    LINK = 'link'
+    CURSOR = 'cursor'
+    OFFSET = 'offset'
+
+
+def get_by_path(body: Any, path: str | None) -> Any:
+    """Получить значение из тела ответа по пути через точку, например meta.next_cursor
+
+    Args:
+        body: тело ответа;
+        path: путь до значения, None - тело целиком.
+    """
+    for key in path.split('.') if path else ():
+        body = body.get(key) if isinstance(body, dict) else None
+
+    return body
+
+
+class Paginator:
+    """Итератор по элементам постраничной коллекции. Следующая страница запрашивается в фоне,
+    пока обрабатываются элементы текущей
+    """
+
+    def __init__(
+            self,
+            request: 'Request',
+            url: str,
+            style: PaginationStyle = PaginationStyle.LINK,
+            method: str = 'GET',
+            params: dict[str, Any] | None = None,
+            items_path: str | None = None,
+            cursor_path: str = 'next_cursor',
+            cursor_param: str = 'cursor',
+            offset_param: str = 'offset',
+            limit_param: str = 'limit',
+            page_size: int = 100,
+            response_model: type[BaseModel] | None = None,
+            max_items: int | None = None,
+            max_pages: int | None = None,
+            prefetch: bool = True,
+            **kwargs
+    ):
+        """
+
+        Args:
+            request: объект для отправки запросов;
+            url: адрес первой страницы;
+            style: способ перехода на следующую страницу: заголовок Link, курсор или смещение;
+            method: HTTP-метод;
+            params: параметры запроса первой страницы;
+            items_path: путь до списка элементов в теле, None - тело является списком;
+            cursor_path: путь до курсора следующей страницы в теле;
+            cursor_param: параметр запроса с курсором;
+            offset_param: параметр запроса со смещением;
+            limit_param: параметр запроса с размером страницы;
+            page_size: размер страницы для смещения;
+            response_model: модель элемента, элементы валидируются постранично;
+            max_items: максимальное количество элементов;
+            max_pages: максимальное количество страниц;
+            prefetch: запрашивать следующую страницу в фоне;
+            **kwargs: параметры Request.request для каждой страницы.
+        """
+        self.request, self.url, self.style, self.method = request, url, PaginationStyle(style), method
+        self.params = dict(params or {})
+        self.items_path, self.cursor_path, self.cursor_param = items_path, cursor_path, cursor_param
+        self.offset_param, self.limit_param, self.page_size = offset_param, limit_param, page_size
+        self.adapter = TypeAdapter(list[response_model]) if response_model else None
+        self.max_items, self.max_pages, self.prefetch, self.kwargs = max_items, max_pages, prefetch, kwargs
+        self.pages = self.items = 0
+
+        if self.style == PaginationStyle.OFFSET:
+            self.params = {self.offset_param: 0, self.limit_param: page_size, **self.params}
+
+    def _fetch(self, url: str, params: dict[str, Any]) -> tuple['CustomResponse', list]:
+        """Запросить страницу и получить ее элементы
+
+        Args:
+            url: адрес страницы;
+            params: параметры запроса.
+        """
+        response = self.request.request(url=url, method=self.method, params=params, **self.kwargs)
+        items = get_by_path(body := response.json(), self.items_path) or []
+
+        if not isinstance(items, list):
+            raise TypeError(f'По пути "{self.items_path}" в теле ответа {url} нет списка элементов: {type(body)}')
+
+        return response, self.adapter.validate_python(items) if self.adapter else items
+
+    def _prefetch(
+            self,
+            url: str,
+            params: dict[str, Any]
+    ) -> tuple[tuple['CustomResponse', list] | None, list, Exception | None]:
+        """Запросить страницу в фоновом потоке. Запросы и ответы логируются позже в потоке теста,
+        иначе их шаги и вложения не попадут в отчет теста. Возвращает страницу, отложенные записи и ошибку запроса
+
+        Args:
+            url: адрес страницы;
+            params: параметры запроса.
+        """
+        with defer_report() as calls:
+            try:
+                return self._fetch(url=url, params=params), calls, None
+
+            except Exception as e:
+                return None, calls, e
+
+    def _get_page(self, future: Future | None, page: tuple[str, dict[str, Any]]) -> tuple['CustomResponse', list]:
+        """Получить страницу: результат фоновой загрузки с записью отложенных логов или запрос в текущем потоке
+
+        Args:
+            future: фоновая загрузка страницы, None - страница запрашивается сейчас;
+            page: адрес и параметры страницы.
+        """
+        if not future:
+            return self._fetch(*page)
+
+        result, calls, error = future.result()
+
+        for call in calls:
+            call()
+
+        if error:
+            raise error
+
+        return result
+
+    def _get_next(
+            self,
+            response: 'CustomResponse',
+            items: list,
+            params: dict[str, Any]
+    ) -> tuple[str, dict[str, Any]] | None:
+        """Получить адрес и параметры следующей страницы, None - страница последняя
+
+        Args:
+            response: ответ текущей страницы;
+            items: элементы текущей страницы;
+            params: параметры запроса текущей страницы.
+        """
+        if self.style == PaginationStyle.LINK:
+            url = response.links.get('next', {}).get('url')
+            return (url, {}) if url else None
+
+        if self.style == PaginationStyle.CURSOR:
+            cursor = get_by_path(response.json(), self.cursor_path)
+            return (self.url, {**params, self.cursor_param: cursor}) if cursor else None
+
+        if len(items) < int(params[self.limit_param]):
+            return None
+
+        return self.url, {**params, self.offset_param: int(params[self.offset_param]) + len(items)}
+
+    def _is_limit_reached(self, items: int = 0) -> bool:
+        """Проверить, что достигнуто ограничение на количество страниц или элементов
+
+        Args:
+            items: элементы текущей страницы, которые еще будут выданы
+        """
+        return (self.max_pages is not None and self.pages >= self.max_pages) or (
+                self.max_items is not None and self.items + items >= self.max_items
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='paginator') if self.prefetch else None
+        future: Future | None = None
+        page: tuple[str, dict[str, Any]] | None = (self.url, self.params)
+        self.pages = self.items = 0
+
+        try:
+            while page and not self._is_limit_reached():
+                response, items = self._get_page(future=future, page=page)
+                self.pages += 1
+                page, future = self._get_next(response=response, items=items, params=page[1]), None
+
+                if page and executor and not self._is_limit_reached(items=len(items)):
+                    future = executor.submit(self._prefetch, *page)
+
+                for item in items:
+                    if self.max_items is not None and self.items >= self.max_items:
+                        return
+
+                    self.items += 1
+                    yield item
+
+        finally:
+            if future:
+                future.cancel()
+
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+            logger.info(f'Обход коллекции {self.url}: страниц {self.pages}, элементов {self.items}')
@@ -0,0 +1,181 @@
+"""Ограничение частоты API-запросов по хостам, общее для всех воркеров xdist
+
+Лимит задается как token bucket: rate запросов в секунду с пачкой до burst запросов подряд. Состояние хранится
+по алгоритму GCRA: для хоста достаточно одного числа - теоретического времени следующего запроса. Состояние
+лежит в локальном файле, доступ к которому сериализуется блокировкой fcntl, поэтому воркеры xdist делят один
+бюджет без отдельного сервиса. Вместо всплеска запросов и ответов 429 запросы равномерно выдерживают паузу.
+"""
+from email.utils import parsedate_to_datetime
+from json import JSONDecodeError, dumps, loads
+from os import O_CREAT, O_RDWR, SEEK_SET, close, ftruncate, lseek, open as os_open, read, write
+from pathlib import Path
+from threading import Lock
+from time import sleep, time
+from urllib.parse import urlsplit
+
+from other.logging import logger
+
+try:
+    from fcntl import LOCK_EX, LOCK_UN, flock
+except ImportError:  # Windows: бюджет общий только для потоков одного процесса
+    flock = None
+
+DEFAULT_HOST = '*'
+RETRY_STATUSES = (429, 503)
+
+
+def parse_limit(value: str) -> tuple[str, float, int]:
+    """Разобрать лимит из параметра запуска вида host=rate[/burst], например api.stand.ru=20/5 или *=10
+
+    Args:
+        value: лимит хоста
+    """
+    host, _, limit = value.rpartition('=')
+    rate, _, burst = limit.partition('/')
+
+    if not host or float(rate) <= 0:
+        raise ValueError(f'Лимит должен иметь вид host=rate[/burst] с rate > 0: {value}')
+
+    return host, float(rate), int(burst) if burst else 1
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Получить паузу в секундах из заголовка Retry-After: число секунд или HTTP-дата
+
+    Args:
+        value: значение заголовка
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time(), 0.0)
+
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimiter:
+    """Ограничитель частоты запросов по хостам с общим для процессов состоянием в файле"""
+
+    def __init__(self, limits: dict[str, tuple[float, int]], path: Path | str, max_retries: int = 3):
+        """
+
+        Args:
+            limits: лимиты хостов: запросов в секунду и размер пачки, хост * - для остальных хостов;
+            path: файл с общим состоянием лимитов;
+            max_retries: количество повторов запроса после ответа 429/503 с Retry-After.
+        """
+        self.limits, self.path, self.max_retries = limits, Path(path), max_retries
+        self.waited = 0.0
+        self.waited_by_host: dict[str, float] = {}
+        self._lock = Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def get_limit(self, host: str) -> tuple[float, int] | None:
+        """Получить лимит хоста
+
+        Args:
+            host: хост с портом
+        """
+        return self.limits.get(host) or self.limits.get(host.rpartition(':')[0]) or self.limits.get(DEFAULT_HOST)
+
+    def _update(self, host: str, interval: float, tolerance: float, block: float = 0.0) -> float:
+        """Зарезервировать время запроса в общем состоянии. Возвращает паузу до запроса в секундах
+
+        Args:
+            host: хост с портом;
+            interval: минимальный интервал между запросами;
+            tolerance: допустимое опережение для пачки запросов;
+            block: пауза по Retry-After, запрос при этом не резервируется.
+        """
+        with self._lock:
+            descriptor = os_open(self.path, O_RDWR | O_CREAT)
+
+            try:
+                if flock:
+                    flock(descriptor, LOCK_EX)
+
+                try:
+                    state = loads(read(descriptor, 1024 * 1024) or b'{}')
+                except JSONDecodeError:
+                    state = {}
+
+                now = time()
+                arrival = max(state.get(host, 0.0), now)
+
+                if block:
+                    state[host], wait = max(arrival, now + block + tolerance), 0.0
+                else:
+                    state[host], wait = arrival + interval, max(arrival - tolerance - now, 0.0)
+
+                lseek(descriptor, 0, SEEK_SET)
+                ftruncate(descriptor, 0)
+                write(descriptor, dumps(state).encode())
+
+                return wait
+
+            finally:
+                if flock:
+                    flock(descriptor, LOCK_UN)
+
+                close(descriptor)
+
+    def acquire(self, url: str) -> float:
+        """Дождаться очереди запроса к хосту. Возвращает время ожидания в секундах
+
+        Args:
+            url: адрес запроса
+        """
+        if (limit := self.get_limit(host := urlsplit(url).netloc)) is None:
+            return 0.0
+
+        rate, burst = limit
+        wait = self._update(host=host, interval=1 / rate, tolerance=(burst - 1) / rate)
+
+        if wait > 0:
+            logger.debug(f'Ожидание лимита запросов {host}: {wait:.3f} с')
+            sleep(wait)
+            self._add_waited(host=host, wait=wait)
+
+        return wait
+
+    def block(self, url: str, seconds: float):
+        """Приостановить запросы к хосту во всех воркерах, например по заголовку Retry-After
+
+        Args:
+            url: адрес запроса;
+            seconds: пауза в секундах.
+        """
+        host = urlsplit(url).netloc
+        logger.warning(f'Хост {host} ограничил частоту запросов, пауза {seconds:.3f} с')
+
+        if (limit := self.get_limit(host=host)) is None:  # хост без лимита: пауза только в текущем потоке
+            sleep(seconds)
+            self._add_waited(host=host, wait=seconds)
+            return
+
+        rate, burst = limit
+        self._update(host=host, interval=1 / rate, tolerance=(burst - 1) / rate, block=seconds)
+
+    def _add_waited(self, host: str, wait: float):
+        """Учесть время ожидания
+
+        Args:
+            host: хост с портом;
+            wait: время ожидания в секундах.
+        """
+        with self._lock:
+            self.waited += wait
+            self.waited_by_host[host] = self.waited_by_host.get(host, 0.0) + wait
+
+    def take_waited(self) -> float:
+        """Получить время ожидания лимитов с прошлого вызова и обнулить его"""
+        with self._lock:
+            waited, self.waited = self.waited, 0.0
+
+        return waited
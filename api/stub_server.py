@@ -0,0 +1,146 @@
+"""Локальный HTTP-сервер-заглушка для прогонов без стенда"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+from time import sleep
+from typing import Any, Callable, Self
+from urllib.parse import urlsplit
+
+from other.logging import logger
+
+
+class StubRoute:
+    """Маршрут заглушки с фиксированным или вычисляемым ответом"""
+
+    def __init__(
+            self,
+            status: int = 200,
+            body: dict | list | str | bytes | None = None,
+            headers: dict[str, str] | None = None,
+            delay: float = 0,
+            handler: Callable[[BaseHTTPRequestHandler, bytes], tuple[int, Any, dict[str, str]]] | None = None
+    ):
+        """
+
+        Args:
+            status: статус код ответа;
+            body: тело ответа, dict/list отдаются как JSON;
+            headers: заголовки ответа;
+            delay: задержка ответа в секундах;
+            handler: функция, вычисляющая (статус, тело, заголовки) по запросу и его телу.
+        """
+        self.status, self.body, self.headers, self.delay, self.handler = status, body, headers or {}, delay, handler
+
+    def render(self, request: BaseHTTPRequestHandler, payload: bytes) -> tuple[int, bytes, dict[str, str]]:
+        """Сформировать ответ маршрута
+
+        Args:
+            request: обработчик входящего запроса;
+            payload: тело входящего запроса.
+        """
+        status, body, headers = self.handler(request, payload) if self.handler else (self.status, self.body, self.headers)
+        headers = dict(headers)
+
+        if isinstance(body, (dict, list)):
+            body = dumps(body).encode()
+            headers.setdefault('Content-Type', 'application/json')
+
+        elif isinstance(body, str):
+            body = body.encode()
+            headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+
+        return status, body or b'', headers
+
+
+class StubServer:
+    """HTTP-сервер-заглушка, запускаемый в отдельном потоке текущего процесса"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        """
+
+        Args:
+            host: адрес сервера;
+            port: порт сервера, 0 - любой свободный.
+        """
+        self.routes: dict[tuple[str, str], StubRoute] = {}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Получить базовый url сервера"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def add_route(self, method: str, path: str, route: StubRoute | None = None, **kwargs) -> Self:
+        """Добавить маршрут
+
+        Args:
+            method: HTTP-метод;
+            path: путь без query-параметров;
+            route: маршрут, если не передан - создается из kwargs;
+            **kwargs: параметры StubRoute.
+        """
+        self.routes[(method.upper(), path)] = route or StubRoute(**kwargs)
+
+        return self
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        """Создать класс обработчика запросов с доступом к маршрутам сервера"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Обработчик запросов заглушки"""
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # заголовки и тело пишутся отдельно, на keep-alive соединении Nagle дает +40 мс
+
+            def handle_one(self):
+                """Найти маршрут и отправить ответ"""
+                payload = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+                if (route := server.routes.get((self.command, urlsplit(self.path).path))) is None:
+                    status, body, headers = 404, b'', {}
+                else:
+                    if route.delay:
+                        sleep(route.delay)
+
+                    status, body, headers = route.render(request=self, payload=payload)
+
+                self.send_response(status)
+
+                for key, value in headers.items():
+                    self.send_header(key, value)
+
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = handle_one
+
+            def log_message(self, format: str, *args):  # noqa
+                """Не выводить лог сервера в stderr"""
+
+        return Handler
+
+    def start(self) -> Self:
+        """Запустить сервер в фоновом потоке"""
+        self._thread = Thread(target=self._server.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        logger.info(f'Сервер-заглушка запущен: {self.url}')
+
+        return self
+
+    def stop(self):
+        """Остановить сервер"""
+        self._server.shutdown()
+        self._server.server_close()
+        logger.info(f'Сервер-заглушка остановлен: {self.url}')
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,93 @@
+"""Бенчмарк накладных расходов Request.request + CustomResponse + логирования + allure поверх requests
+
+Базовые запросы отправляются через сессию requests с переиспользованием соединений, как и Request.request,
+и замеряются с тем же уровнем логирования, поэтому накладные расходы не включают установку соединений.
+
+Запуск:
+    python -m benchmarks.api_overhead --output bench/api_overhead.json
+    python -m benchmarks.api_overhead --compare bench/baseline.json bench/api_overhead.json
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+
+from requests import Session
+
+from api.custom_request import MethodEnum, Request
+from api.stub_server import StubServer
+from benchmarks.utils import allure_enabled, compare_results, log_level, measure, save_results
+
+BODIES = {
+    'small': {'id': 1, 'name': 'name', 'active': True},
+    'large': {'id': 1, 'payload': [{'key': f'key_{i}', 'value': 'x' * 200} for i in range(5000)]},
+    'list': [{'id': i, 'name': f'name_{i}', 'active': bool(i % 2)} for i in range(10000)]
+}
+LOG_LEVELS = ('DEBUG', 'WARNING')
+
+
+def run_benchmark(iterations: int, warmup: int) -> dict[str, dict]:
+    """Запустить все кейсы бенчмарка против сервера-заглушки
+
+    Args:
+        iterations: количество замеров на кейс;
+        warmup: количество прогревочных вызовов на кейс.
+    """
+    results = {}
+
+    with StubServer() as server, Session() as session:
+        for shape, body in BODIES.items():
+            server.add_route('GET', f'/{shape}', body=body)
+            server.add_route('POST', f'/{shape}', body={'success': True})
+
+        for shape, body in BODIES.items():
+            url = f'{server.url}/{shape}'
+
+            for level in LOG_LEVELS:
+                with log_level(level=level):
+                    results[f'{shape}/GET/{level}/raw'] = measure(
+                        lambda: session.request(method='GET', url=url, verify=False).json(),
+                        iterations=iterations,
+                        warmup=warmup
+                    )
+                    results[f'{shape}/POST/{level}/raw'] = measure(
+                        lambda: session.request(method='POST', url=url, json=body, verify=False).json(),
+                        iterations=iterations,
+                        warmup=warmup
+                    )
+
+                for is_allure in (False, True):
+                    case = f'{shape}/{{method}}/{level}/{"allure" if is_allure else "no-allure"}'
+
+                    with log_level(level=level), allure_enabled(is_enabled=is_allure):
+                        results[case.format(method='GET')] = measure(
+                            lambda: Request().request(url=url, method=MethodEnum.GET).json(),
+                            iterations=iterations,
+                            warmup=warmup
+                        )
+                        results[case.format(method='POST')] = measure(
+                            lambda: Request().request(url=url, method=MethodEnum.POST, json=body).json(),
+                            iterations=iterations,
+                            warmup=warmup
+                        )
+
+    for case, stats in results.items():
+        shape, method, level, variant = case.split('/')
+
+        if variant != 'raw':
+            raw = results[f'{shape}/{method}/{level}/raw']
+            stats['overhead_p50'] = round(stats['p50'] - raw['p50'], 3)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Бенчмарк накладных расходов API-фреймворка')
+    parser.add_argument('--iterations', type=int, default=100, help='Количество замеров на кейс')
+    parser.add_argument('--warmup', type=int, default=10, help='Количество прогревочных вызовов на кейс')
+    parser.add_argument('--output', type=Path, help='Файл для сохранения результатов в JSON')
+    parser.add_argument('--compare', type=Path, nargs=2, metavar=('BASELINE', 'CURRENT'), help='Сравнить два прогона')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+    else:
+        save_results(name='api_overhead', results=run_benchmark(args.iterations, args.warmup), output=args.output)
@@ -0,0 +1,119 @@
+"""Бенчмарк отправки больших тел из pydantic моделей
+
+Сравнивает прежний путь (модель -> dict -> подготовка запроса для лога -> повторная подготовка и сериализация
+при отправке) с текущим Request.request, где модель сериализуется в байты один раз, а один и тот же
+подготовленный запрос используется для лога, curl и отправки. Оба пути отправляют запросы через сессию
+с переиспользованием соединений и одинаково логируют запрос и ответ, поэтому разница - только сериализация.
+
+Запуск:
+    python -m benchmarks.api_payload --output bench/api_payload.json
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+
+from pydantic import BaseModel
+from requests import Request as src_Request, Session
+
+from api.custom_request import MethodEnum, Request, get_session
+from api.stub_server import StubServer
+from benchmarks.utils import compare_results, log_level, measure, save_results
+from other.logging import log_request, log_response
+from other.model import convert_model, serialize_model
+
+SIZES = (1000, 10000, 50000)
+
+
+class Item(BaseModel):
+    """Элемент тела запроса массовой загрузки"""
+    id: int
+    name: str
+    price: float
+    tags: list[str]
+    active: bool
+
+
+class Import(BaseModel):
+    """Тело запроса массовой загрузки"""
+    source: str
+    items: list[Item]
+
+
+def get_model(size: int) -> Import:
+    """Получить модель тела запроса заданного размера
+
+    Args:
+        size: количество элементов
+    """
+    return Import(
+        source='benchmark',
+        items=[Item(id=i, name=f'name_{i}', price=i / 100, tags=['a', 'b', 'c'], active=bool(i % 2)) for i in range(size)]
+    )
+
+
+def send_legacy(session: Session, url: str, model: BaseModel):
+    """Отправить модель прежним способом: dict, подготовка для лога и повторная сериализация при отправке
+
+    Args:
+        session: сессия requests, как у Request.request;
+        url: адрес;
+        model: модель тела.
+    """
+    json = convert_model(model=model)
+    log_request(request=src_Request(method='POST', url=url, json=json).prepare())
+    log_response(response=session.request(method='POST', url=url, json=json, verify=False))
+
+
+def run_benchmark(iterations: int, warmup: int, level: str) -> dict[str, dict]:
+    """Запустить все кейсы бенчмарка против сервера-заглушки
+
+    Args:
+        iterations: количество замеров на кейс;
+        warmup: количество прогревочных вызовов на кейс;
+        level: уровень логирования.
+    """
+    results = {}
+
+    with StubServer() as server, log_level(level=level):
+        server.add_route('POST', '/import', body={'success': True})
+        url = f'{server.url}/import'
+
+        for size in SIZES:
+            model = get_model(size=size)
+
+            results[f'{size}/serialize/dict+json'] = measure(
+                lambda: src_Request(method='POST', url=url, json=convert_model(model=model)).prepare(),
+                iterations=iterations,
+                warmup=warmup
+            )
+            results[f'{size}/serialize/bytes'] = measure(
+                lambda: serialize_model(model=model), iterations=iterations, warmup=warmup
+            )
+            results[f'{size}/request/legacy'] = measure(
+                lambda: send_legacy(session=get_session(), url=url, model=model), iterations=iterations, warmup=warmup
+            )
+            results[f'{size}/request/single'] = measure(
+                lambda: Request().request(url=url, method=MethodEnum.POST, json=model),
+                iterations=iterations,
+                warmup=warmup
+            )
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Бенчмарк отправки больших тел из pydantic моделей')
+    parser.add_argument('--iterations', type=int, default=20, help='Количество замеров на кейс')
+    parser.add_argument('--warmup', type=int, default=3, help='Количество прогревочных вызовов на кейс')
+    parser.add_argument('--log_level', default='WARNING', help='Уровень логирования во время замеров')
+    parser.add_argument('--output', type=Path, help='Файл для сохранения результатов в JSON')
+    parser.add_argument('--compare', type=Path, nargs=2, metavar=('BASELINE', 'CURRENT'), help='Сравнить два прогона')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+    else:
+        save_results(
+            name='api_payload',
+            results=run_benchmark(args.iterations, args.warmup, level=args.log_level),
+            output=args.output
+        )
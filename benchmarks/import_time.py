@@ -0,0 +1,89 @@
+"""Отчет о времени импорта модулей при старте pytest
+
+Запускает сбор тестов в отдельном процессе с `python -X importtime`, агрегирует время импорта по пакетам
+и проверяет, что запрещенные тяжелые пакеты не импортируются (например, Playwright и mimesis для api прогона).
+
+Запуск:
+    python -m benchmarks.import_time -m api --forbid playwright,mimesis --output bench/import_time.json
+"""
+import sys
+from argparse import ArgumentParser
+from json import dumps
+from pathlib import Path
+from re import match
+from subprocess import run
+
+
+def get_import_times(pytest_args: list[str]) -> dict[str, dict[str, int]]:
+    """Получить время импорта модулей при сборе тестов в микросекундах
+
+    Args:
+        pytest_args: аргументы pytest
+    """
+    process = run(
+        [sys.executable, '-X', 'importtime', '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider', *pytest_args],
+        capture_output=True,
+        text=True
+    )
+    modules = {}
+
+    for line in process.stderr.splitlines():
+        if found := match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line):
+            self_us, cumulative_us, indent, name = found.groups()
+            modules[name] = {'self_us': int(self_us), 'cumulative_us': int(cumulative_us), 'depth': len(indent) // 2}
+
+    return modules
+
+
+def get_packages(modules: dict[str, dict[str, int]]) -> dict[str, int]:
+    """Сгруппировать собственное время импорта модулей по пакетам верхнего уровня
+
+    Args:
+        modules: время импорта модулей
+    """
+    packages: dict[str, int] = {}
+
+    for name, times in modules.items():
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + times['self_us']
+
+    return dict(sorted(packages.items(), key=lambda x: -x[1]))
+
+
+def main() -> int:
+    """Сформировать отчет и вернуть код завершения: 1, если импортирован запрещенный пакет или превышен бюджет"""
+    parser = ArgumentParser(description='Отчет о времени импорта модулей при старте pytest')
+    parser.add_argument('--forbid', default='', help='Пакеты через запятую, которые не должны импортироваться')
+    parser.add_argument('--max_total_ms', type=float, help='Бюджет суммарного времени импорта в миллисекундах')
+    parser.add_argument('--top', type=int, default=20, help='Количество самых тяжелых пакетов в выводе')
+    parser.add_argument('--output', type=Path, help='Файл для сохранения отчета в JSON')
+    args, pytest_args = parser.parse_known_args()
+
+    modules = get_import_times(pytest_args=pytest_args)
+    packages = get_packages(modules=modules)
+    total_ms = sum(packages.values()) / 1000
+    forbidden = sorted({package for package in args.forbid.split(',') if package} & set(packages))
+
+    print(f'Суммарное время импорта: {total_ms:.1f} ms, модулей: {len(modules)}')
+
+    for package, self_us in list(packages.items())[:args.top]:
+        print(f'{package:<40} {self_us / 1000:>10.1f} ms')
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            dumps({'total_ms': total_ms, 'packages': packages, 'modules': modules, 'forbidden': forbidden}, indent=2),
+            encoding='utf-8'
+        )
+
+    if forbidden:
+        print(f'Импортированы запрещенные пакеты: {", ".join(forbidden)}')
+
+    if args.max_total_ms is not None and total_ms > args.max_total_ms:
+        print(f'Время импорта {total_ms:.1f} ms превышает бюджет {args.max_total_ms} ms')
+
+    return int(bool(forbidden) or (args.max_total_ms is not None and total_ms > args.max_total_ms))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
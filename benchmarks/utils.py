@@ -0,0 +1,150 @@
+"""Общие функции бенчмарков: замер, запись allure-отчета вне pytest, сохранение и сравнение результатов"""
+import platform
+import sys
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from json import dumps, loads
+from os import devnull
+from pathlib import Path
+from subprocess import run
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import TestResult, TestStepResult
+from allure_commons.reporter import AllureReporter
+from allure_commons.utils import now, uuid4
+
+from api.metrics import LatencyHistogram
+from other.logging import create_logger, logger
+
+
+class AllureBenchListener:
+    """Минимальный слушатель allure: пишет шаги и вложения в отчет так же, как это делает allure-pytest"""
+
+    def __init__(self):
+        self.reporter = AllureReporter()
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.reporter.start_step(None, uuid, TestStepResult(name=title, start=now()))
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        self.reporter.stop_step(uuid, stop=now())
+
+    @allure_commons.hookimpl
+    def attach_data(self, body, name, attachment_type, extension):
+        self.reporter.attach_data(uuid4(), body, name=name, attachment_type=attachment_type, extension=extension)
+
+
+@contextmanager
+def allure_enabled(is_enabled: bool = True) -> Iterator[None]:
+    """Включить запись allure-отчета во временный каталог на время замера
+
+    Args:
+        is_enabled: False - шаги и вложения allure не обрабатываются
+    """
+    if not is_enabled:
+        yield
+        return
+
+    with TemporaryDirectory() as report_dir:
+        listener, file_logger = AllureBenchListener(), AllureFileLogger(report_dir)
+        allure_commons.plugin_manager.register(listener)
+        allure_commons.plugin_manager.register(file_logger)
+        listener.reporter.schedule_test(uuid := uuid4(), TestResult(uuid=uuid, name='benchmark', start=now()))
+
+        try:
+            yield
+
+        finally:
+            listener.reporter.close_test(uuid)
+            allure_commons.plugin_manager.unregister(listener)
+            allure_commons.plugin_manager.unregister(file_logger)
+
+
+@contextmanager
+def log_level(level: str) -> Iterator[None]:
+    """Настроить логгер фреймворка с выводом в /dev/null вместо терминала. После замера обработчик /dev/null
+    удаляется и восстанавливается обработчик loguru по умолчанию, с которым запускаются бенчмарки
+
+    Args:
+        level: уровень логирования
+    """
+    with open(devnull, 'w') as null, redirect_stdout(null):
+        create_logger(log_level=level, params=None)
+
+        try:
+            yield
+
+        finally:
+            logger.remove()
+            logger.add(sys.stderr)
+
+
+def measure(func: Callable[[], Any], iterations: int = 200, warmup: int = 20) -> dict[str, float]:
+    """Замерить время вызова функции в микросекундах
+
+    Args:
+        func: замеряемая функция;
+        iterations: количество замеров;
+        warmup: количество прогревочных вызовов без замера.
+    """
+    for _ in range(warmup):
+        func()
+
+    histogram = LatencyHistogram(precision=0.01)
+
+    for _ in range(iterations):
+        start = perf_counter()
+        func()
+        histogram.add((perf_counter() - start) * 1_000_000)
+
+    return histogram.summary()
+
+
+def get_meta() -> dict[str, str]:
+    """Получить параметры окружения прогона для сравнения результатов"""
+    commit = run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': platform.platform()
+    }
+
+
+def save_results(name: str, results: dict[str, dict], output: Path | None):
+    """Сохранить результаты бенчмарка в JSON и вывести сводку
+
+    Args:
+        name: имя бенчмарка;
+        results: результаты по кейсам;
+        output: файл для сохранения, None - только вывод.
+    """
+    for case, stats in results.items():
+        print(f'{case:<50} p50={stats["p50"]:>12.1f} us  p95={stats["p95"]:>12.1f} us  mean={stats["mean"]:>12.1f} us')
+
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(dumps({'benchmark': name, 'meta': get_meta(), 'results': results}, indent=2), encoding='utf-8')
+
+
+def compare_results(baseline: Path, current: Path, metric: str = 'p50'):
+    """Сравнить два прогона бенчмарка и вывести изменение метрики по кейсам
+
+    Args:
+        baseline: файл базового прогона;
+        current: файл текущего прогона;
+        metric: сравниваемая метрика.
+    """
+    old, new = (loads(path.read_text(encoding='utf-8'))['results'] for path in (baseline, current))
+
+    for case in new:
+        if case in old and old[case][metric]:
+            change = (new[case][metric] - old[case][metric]) / old[case][metric] * 100
+            print(f'{case:<50} {old[case][metric]:>12.1f} -> {new[case][metric]:>12.1f} us  {change:+.1f}%')
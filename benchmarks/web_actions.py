@@ -0,0 +1,156 @@
+"""Бенчмарк действий BasePage на локальной странице в headless Chromium
+
+Для каждого действия замеряется распределение времени через BasePage и через Playwright напрямую,
+а также доля времени действия в обертке format_locator, логгере loguru и шагах allure (по cProfile).
+
+Запуск:
+    python -m benchmarks.web_actions --output bench/web_actions.json
+"""
+from argparse import ArgumentParser
+from cProfile import Profile
+from pathlib import Path
+from pstats import Stats
+from typing import Any, Callable
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.utils import allure_enabled, compare_results, log_level, measure, save_results
+from other.config import Config
+from web.browser_config import ChromeConfig
+from web.locator import Locator
+from web.pages.base_page import BasePage
+
+HTML = '''
+<html>
+  <body>
+    <input id="input" type="text"/>
+    <button id="button" onclick="this.dataset.clicks = (+this.dataset.clicks || 0) + 1">Кнопка</button>
+    <ul>{items}</ul>
+  </body>
+</html>
+'''.format(items=''.join(f'<li class="item">Пункт {i}</li>' for i in range(1, 101)))
+
+INPUT = Locator(name='Поле ввода', locator='#input')
+BUTTON = Locator(name='Кнопка', locator='#button')
+ITEMS = Locator(name='Пункты списка', locator='li.item')
+ITEM = Locator(name='Пункт {index}', locator='li.item:nth-child({index})')
+
+BREAKDOWN = {
+    'format_locator': (('locator.py', 'wrapper', False), ('locator.py', '__call__', True)),
+    'loguru': (('_logger.py', '_log', True),),
+    'allure': (('_allure.py', '__enter__', True), ('_allure.py', '__exit__', True), ('_allure.py', 'impl', False))
+}
+
+
+def get_actions(page: BasePage) -> dict[str, tuple[Callable[[], Any], Callable[[], Any]]]:
+    """Получить действия BasePage и их эквиваленты на Playwright без фреймворка
+
+    Args:
+        page: страница
+    """
+    pw = page.page
+
+    def open_close_tab():
+        tab = page.open_new_tab(page=BasePage)
+        tab.page.goto('data:text/html,<p>tab</p>')
+        page.closed_tab_by_url(url='data:text/html')
+
+    def raw_open_close_tab():
+        tab = page.context.new_page()
+        tab.goto('data:text/html,<p>tab</p>')
+        tab.close()
+
+    return {
+        'find_element_by_locator': (
+            lambda: page.find_element_by_locator(locator=ITEM, index=50),
+            lambda: pw.locator('li.item:nth-child(50)').first.wait_for(state='attached')
+        ),
+        'click_by_locator': (
+            lambda: page.click_by_locator(locator=BUTTON),
+            lambda: pw.locator('#button').first.click()
+        ),
+        'send_keys_by_locator': (
+            lambda: page.send_keys_by_locator(locator=INPUT, keys='значение'),
+            lambda: pw.locator('#input').first.fill('значение')
+        ),
+        'find_elements_by_locator': (
+            lambda: page.find_elements_by_locator(locator=ITEMS),
+            lambda: pw.locator('li.item').all()
+        ),
+        'open_close_tab': (open_close_tab, raw_open_close_tab)
+    }
+
+
+def get_breakdown(func: Callable[[], Any], iterations: int) -> dict[str, float]:
+    """Получить долю времени действия в format_locator, loguru и allure по данным cProfile
+
+    Args:
+        func: действие;
+        iterations: количество вызовов под профилировщиком.
+    """
+    profile = Profile()
+    profile.runcall(lambda: [func() for _ in range(iterations)])
+    stats = Stats(profile).stats  # noqa
+
+    total = sum(tottime for _, _, tottime, _, _ in stats.values())
+    shares = {}
+
+    for name, functions in BREAKDOWN.items():
+        spent = 0.0
+
+        for (filename, _, function), (_, _, tottime, cumtime, _) in stats.items():
+            for suffix, target, is_cumulative in functions:
+                if filename.endswith(suffix) and function == target:
+                    spent += cumtime if is_cumulative else tottime
+
+        shares[name] = round(spent / total * 100, 2) if total else 0.0
+
+    return shares
+
+
+def run_benchmark(iterations: int, warmup: int, level: str, is_allure: bool) -> dict[str, dict]:
+    """Запустить все кейсы бенчмарка
+
+    Args:
+        iterations: количество замеров на кейс;
+        warmup: количество прогревочных вызовов на кейс;
+        level: уровень логирования;
+        is_allure: записывать шаги allure.
+    """
+    results = {}
+    Config.web_url = 'about:blank'
+
+    with sync_playwright() as playwright, log_level(level=level), allure_enabled(is_enabled=is_allure):
+        browser = playwright.chromium.launch(headless=True, args=ChromeConfig.default_options)
+        page = BasePage(browser=browser)
+        page.page.set_content(HTML)
+
+        for action, (framework, raw) in get_actions(page=page).items():
+            results[f'{action}/raw'] = measure(raw, iterations=iterations, warmup=warmup)
+            results[f'{action}/base_page'] = stats = measure(framework, iterations=iterations, warmup=warmup)
+            stats['overhead_p50'] = round(stats['p50'] - results[f'{action}/raw']['p50'], 3)
+            stats['share_percent'] = get_breakdown(framework, iterations=max(iterations // 10, 1))
+
+        browser.close()
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Бенчмарк действий BasePage')
+    parser.add_argument('--iterations', type=int, default=100, help='Количество замеров на кейс')
+    parser.add_argument('--warmup', type=int, default=10, help='Количество прогревочных вызовов на кейс')
+    parser.add_argument('--log_level', default='INFO', help='Уровень логирования во время замеров')
+    parser.add_argument('--no_allure', action='store_true', help='Не записывать шаги allure во время замеров')
+    parser.add_argument('--output', type=Path, help='Файл для сохранения результатов в JSON')
+    parser.add_argument('--compare', type=Path, nargs=2, metavar=('BASELINE', 'CURRENT'), help='Сравнить два прогона')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+    else:
+        save_results(
+            name='web_actions',
+            results=run_benchmark(args.iterations, args.warmup, level=args.log_level, is_allure=not args.no_allure),
+            output=args.output
+        )
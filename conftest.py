@@ -1,17 +1,28 @@
+from json import dumps
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 from _pytest.fixtures import SubRequest
 from _pytest.python import Function
 from _pytest.reports import TestReport
 from _pytest.runner import CallInfo
-from allure import attach, attachment_type, step, title
-from playwright.sync_api import sync_playwright, Browser
-from playwright.sync_api._generated import Playwright as SyncPlaywright
+from allure import attach, attachment_type, dynamic, step, title
 
+from api.cache import ResponseCache
+from api.cassette import Cassette, CassetteMode, get_cassette_path
+from api.custom_request import Request
+from api.metrics import get_partial_paths, save_partial, save_report
+from other.circuit_breaker import BreakerAction, CircuitBreaker
 from other.config import Config
-from other.logging import create_logger, logger
-from web.browser_factory import BrowserFactory
+from other.logging import create_logger, get_worker_log_paths, logger, merge_worker_logs
+from other.random_values import generator
+from web.browser_config import THROTTLING_PROFILES, scale_timeout
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser
+    from other.setup_orchestrator import SetupOrchestrator
+    from playwright.sync_api._generated import Playwright as SyncPlaywright
 
 
 def pytest_addoption(parser: pytest.Parser):
@@ -48,26 +59,428 @@ def pytest_addoption(parser: pytest.Parser):
         choices=['DEBUG', 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL']
     )
 
+    parser.addoption(
+        "--log_enqueue",
+        action="store_true",
+        help="Укажите параметр, если хотите писать лог через очередь в фоновом потоке, не блокируя тесты"
+    )
+
+    parser.addoption(
+        "--log_json",
+        action="store",
+        help="Файл JSON-lines лога. Каждый воркер xdist пишет свой файл, в конце сессии файлы объединяются по времени"
+    )
+
+    parser.addoption(
+        "--log_json_rotation",
+        action="store",
+        help="Условие ротации JSON-lines лога воркера, например: 100 MB"
+    )
+
+    parser.addoption(
+        "--log_json_compression",
+        action="store",
+        help="Формат сжатия ротированных JSON-lines логов, например: gz",
+        choices=['gz', 'bz2', 'xz', 'zip']
+    )
+
+    parser.addoption(
+        "--log_body_limit",
+        action="store",
+        type=int,
+        default=Config.log_body_limit,
+        help="Размер тела в байтах, выше которого в лог и allure выводится начало тела, а тело сохраняется в файл. "
+             "0 - выводить тела целиком"
+    )
+
+    parser.addoption(
+        "--log_body_dir",
+        action="store",
+        default="bodies",
+        help="Каталог для тел запросов и ответов больше --log_body_limit"
+    )
+
     parser.addoption(
         "--web_url",
         action='store',
         help='Базовый URL WEB-страниц'
     )
 
+    parser.addoption(
+        "--random_seed",
+        action="store",
+        help="Seed генератора случайных данных. Для каждого теста seed вычисляется из значения и имени теста"
+    )
+
+    parser.addoption(
+        "--prelaunch_browser",
+        action="store_true",
+        help="Укажите параметр, если хотите запускать Chromium в фоне во время сбора тестов"
+    )
+
+    parser.addoption(
+        "--network_record",
+        action="store_true",
+        help="Укажите параметр, если хотите записывать сетевые запросы страниц в отчет"
+    )
+
+    parser.addoption(
+        "--cdp_profile",
+        action="store_true",
+        help="Укажите параметр, если хотите собирать метрики JS-heap и DOM страниц Chromium для всех web тестов"
+    )
+
+    parser.addoption(
+        "--heap_growth_limit",
+        action="store",
+        type=float,
+        default=50,
+        help="Допустимый рост JS-heap страницы за сессию в мегабайтах"
+    )
+
+    parser.addoption(
+        "--throttling",
+        action="store",
+        help="Профиль эмуляции медленной сети и CPU для всех страниц",
+        choices=list(THROTTLING_PROFILES)
+    )
+
+    parser.addoption(
+        "--resource_monitor",
+        action="store_true",
+        help="Укажите параметр, если хотите собирать CPU и RSS процессов драйвера Playwright и браузеров (Linux)"
+    )
+
+    parser.addoption(
+        "--resource_interval",
+        action="store",
+        type=float,
+        default=1.0,
+        help="Период замеров ресурсов процессов браузера в секундах"
+    )
+
+    parser.addoption(
+        "--rss_growth_limit",
+        action="store",
+        type=float,
+        default=50,
+        help="Допустимый рост RSS процессов браузера за тест в мегабайтах"
+    )
+
+    parser.addoption(
+        "--resource_timeline",
+        action="store",
+        help="Файл для сохранения таймлайна ресурсов процессов браузера в JSON"
+    )
+
+    parser.addoption(
+        "--recycle_tests",
+        action="store",
+        type=int,
+        help="Перезапускать браузер после указанного количества тестов"
+    )
+
+    parser.addoption(
+        "--recycle_contexts",
+        action="store",
+        type=int,
+        help="Перезапускать браузер после указанного количества созданных контекстов"
+    )
+
+    parser.addoption(
+        "--recycle_rss",
+        action="store",
+        type=float,
+        help="Перезапускать браузер, когда RSS процессов драйвера и браузера превышает порог в мегабайтах (Linux)"
+    )
+
+    parser.addoption(
+        "--latency_report",
+        action="store",
+        default="latency_report.json",
+        help="Файл отчета с перцентилями задержек API-запросов по эндпоинтам. Пустое значение отключает отчет"
+    )
+
+    parser.addoption(
+        "--api_cache",
+        action="store_true",
+        help="Укажите параметр, если хотите кэшировать ответы GET/HEAD запросов в рамках воркера"
+    )
+
+    parser.addoption(
+        "--api_cache_size",
+        action="store",
+        type=int,
+        default=1024,
+        help="Максимальное количество ответов в кэше"
+    )
+
+    parser.addoption(
+        "--api_cache_ttl",
+        action="store",
+        type=float,
+        default=300,
+        help="Время жизни ответа в кэше в секундах, если ответ не задает Cache-Control: max-age"
+    )
+
+    parser.addoption(
+        "--health_check",
+        action="store_true",
+        help="Укажите параметр, если хотите проверить доступность стенда (--web_url и --health_url) перед тестами"
+    )
+
+    parser.addoption(
+        "--health_url",
+        action="append",
+        default=[],
+        help="Дополнительный адрес для проверки доступности стенда, например базовый url API"
+    )
+
+    parser.addoption(
+        "--breaker_threshold",
+        action="store",
+        type=int,
+        default=0,
+        help="Количество ошибок подключения к хосту подряд, после которого тесты падают или пропускаются сразу. "
+             "По умолчанию 0 - размыкатель цепи отключен"
+    )
+
+    parser.addoption(
+        "--breaker_window",
+        action="store",
+        type=float,
+        default=60,
+        help="Окно в секундах, в котором учитываются ошибки подключения"
+    )
+
+    parser.addoption(
+        "--breaker_probe_interval",
+        action="store",
+        type=float,
+        default=30,
+        help="Период проверки недоступного хоста в секундах, после успешной проверки тесты выполняются снова"
+    )
+
+    parser.addoption(
+        "--breaker_action",
+        action="store",
+        default=BreakerAction.FAIL,
+        help="Действие с тестом при недоступном стенде",
+        choices=list(BreakerAction)
+    )
+
+    parser.addoption(
+        "--rate_limit",
+        action="append",
+        default=[],
+        help="Лимит частоты API-запросов к хосту вида host=rate[/burst], например api.stand.ru=20/5. "
+             "Хост * задает лимит для остальных хостов. Лимит общий для всех воркеров xdist"
+    )
+
+    parser.addoption(
+        "--rate_limit_state",
+        action="store",
+        default=".rate_limit.json",
+        help="Файл с общим для воркеров состоянием лимитов частоты API-запросов"
+    )
+
+    parser.addoption(
+        "--rate_limit_retries",
+        action="store",
+        type=int,
+        default=3,
+        help="Количество повторов запроса после ответа 429/503 с заголовком Retry-After"
+    )
+
+    parser.addoption(
+        "--cassette_mode",
+        action="store",
+        default=CassetteMode.NONE,
+        help="Режим кассет API-запросов: record - записать, replay - воспроизвести без сети",
+        choices=list(CassetteMode)
+    )
+
+    parser.addoption(
+        "--cassette_dir",
+        action="store",
+        default="cassettes",
+        help="Каталог с кассетами API-запросов"
+    )
+
+    parser.addoption(
+        "--cassette_match",
+        action="store",
+        default="method,url,body",
+        help="Поля запроса через запятую для поиска записи в кассете: method, url, body"
+    )
+
+    parser.addoption(
+        "--cassette_redact",
+        action="store",
+        default="Authorization,Cookie,Set-Cookie",
+        help="Заголовки через запятую, значения которых не сохраняются в кассету"
+    )
+
 
 def pytest_configure(config: pytest.Config):
     """Положить параметры запуска в окружение
 
     Args: config: Config для доступа к значениям конфигурации, менеджеру плагинов и хукам плагинов
     """
+    worker = getattr(config, 'workerinput', {}).get('workerid')
+
+    if not worker and (log_json := config.getoption('--log_json')):
+        for worker_log in get_worker_log_paths(path=Path(log_json)):
+            worker_log.unlink()
+
     Config.log_level = config.getoption('--log_level')
-    create_logger(log_level=Config.log_level, params=config.option)
+    Config.log_body_limit = config.getoption('--log_body_limit')
+    Config.log_body_dir = Path(config.getoption('--log_body_dir')).absolute()
+    create_logger(log_level=Config.log_level, params=config.option, worker=worker)
 
     Config.is_headless = config.getoption('--headless')
     Config.is_remote = config.getoption('--remote')
     Config.browser_name = config.getoption('--browser')
     Config.web_url = config.getoption('--web_url')
 
+    # мастер xdist тесты не выполняет, а выборка только по другим маркерам браузер не использует
+    markexpr = config.option.markexpr
+    is_controller = not worker and getattr(config.option, 'numprocesses', None)
+    is_browserless = markexpr and 'web' not in markexpr and 'not' not in markexpr
+
+    if (
+            config.getoption('--prelaunch_browser')
+            and Config.browser_name == 'chrome'
+            and not Config.is_remote
+            and not is_controller
+            and not is_browserless
+    ):
+        from web.browser_prelaunch import BrowserPrelauncher
+
+        Config.browser_prelauncher = BrowserPrelauncher(is_headless=Config.is_headless)
+        Config.browser_prelauncher.start()
+
+    if config.getoption('--resource_monitor'):
+        from web.resource_monitor import ResourceMonitor, is_supported
+
+        if is_supported():
+            Config.resource_monitor = ResourceMonitor(
+                interval=config.getoption('--resource_interval'),
+                growth_limit=config.getoption('--rss_growth_limit')
+            )
+            Config.resource_monitor.start()
+        else:
+            logger.warning('Мониторинг ресурсов процессов браузера доступен только в Linux')
+
+    recycle = {
+        'max_tests': config.getoption('--recycle_tests'),
+        'max_contexts': config.getoption('--recycle_contexts'),
+        'rss_limit': config.getoption('--recycle_rss')
+    }
+
+    if any(recycle.values()):
+        from web.browser_recycler import BrowserRecycler
+
+        Config.browser_recycler = BrowserRecycler(**recycle)
+
+    if config.getoption('--network_record'):
+        from web.network_recorder import NetworkRecorder
+
+        Config.network_recorder = NetworkRecorder()
+
+    if not hasattr(config, 'workerinput') and (latency_report := config.getoption('--latency_report')):
+        for partial in get_partial_paths(path=Path(latency_report)):
+            partial.unlink()
+
+    if (threshold := config.getoption('--breaker_threshold')) or config.getoption('--health_check'):
+        Config.circuit_breaker = CircuitBreaker(
+            threshold=threshold,
+            window=config.getoption('--breaker_window'),
+            probe_interval=config.getoption('--breaker_probe_interval'),
+            action=config.getoption('--breaker_action')
+        )
+
+    if config.getoption('--health_check'):
+        Config.circuit_breaker.check_health(
+            urls=[url for url in (Config.web_url, *config.getoption('--health_url')) if url]
+        )
+
+    if limits := config.getoption('--rate_limit'):
+        from api.rate_limiter import RateLimiter, parse_limit
+
+        if not hasattr(config, 'workerinput'):
+            Path(config.getoption('--rate_limit_state')).unlink(missing_ok=True)
+
+        Request.rate_limiter = RateLimiter(
+            limits={host: (rate, burst) for host, rate, burst in map(parse_limit, limits)},
+            path=config.getoption('--rate_limit_state'),
+            max_retries=config.getoption('--rate_limit_retries')
+        )
+
+    Request.cache_enabled = config.getoption('--api_cache')
+    Request.response_cache = ResponseCache(
+        max_entries=config.getoption('--api_cache_size'),
+        ttl=config.getoption('--api_cache_ttl')
+    )
+
+    if throttling := config.getoption('--throttling'):
+        Config.throttling = THROTTLING_PROFILES[throttling]
+
+    Config.is_cdp_profile = config.getoption('--cdp_profile')
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(items: list[Function]):
+    """Остановить запущенный в фоне браузер, если среди выбранных тестов нет тестов с браузером
+
+    Args:
+        items: выбранные тесты
+    """
+    if Config.browser_prelauncher and not any({'browser', 'open_page'} & set(item.fixturenames) for item in items):
+        logger.info('Среди выбранных тестов нет тестов с браузером, запущенный в фоне браузер остановлен')
+        Config.browser_prelauncher.stop()
+        Config.browser_prelauncher = None
+
+
+def pytest_unconfigure(config: pytest.Config):  # noqa
+    """Остановить запущенный в фоне браузер и мониторинг ресурсов
+
+    Args:
+        config: Config для доступа к значениям конфигурации, менеджеру плагинов и хукам плагинов
+    """
+    if Config.browser_prelauncher:
+        Config.browser_prelauncher.stop()
+
+    if Config.resource_monitor:
+        Config.resource_monitor.stop()
+
+    logger.complete()
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    """Сохранить отчет с задержками API-запросов и JSON-lines лог. Воркеры xdist сохраняют свою часть, мастер объединяет
+
+    Args:
+        session: сессия pytest
+    """
+    worker = getattr(session.config, 'workerinput', {}).get('workerid')
+
+    if log_json := session.config.getoption('--log_json'):
+        if worker:
+            logger.complete()
+        else:
+            count = merge_worker_logs(path=Path(log_json))
+            logger.info(f'JSON-lines лог сохранен: {log_json}. Записей: {count}')
+
+    if not (latency_report := session.config.getoption('--latency_report')):
+        return
+
+    if worker:
+        save_partial(metrics=Request.metrics, path=Path(latency_report), worker=worker)
+
+    elif report := save_report(metrics=Request.metrics, path=Path(latency_report)):
+        logger.info(f'Отчет с задержками API-запросов сохранен: {latency_report}. Эндпоинтов: {len(report)}')
+
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item: Function, call: CallInfo):  # noqa
@@ -100,33 +513,316 @@ def pytest_runtest_makereport(item: Function, call: CallInfo):  # noqa
             logger.warning('Не удалось сохранить скриншот')
 
 
-@pytest.fixture(scope='session', params=[()])
-@title('Инициализировать браузер с параметрами')
-def browser(request: SubRequest) -> Browser:
-    """Инициализировать экземпляр браузера
+def close_browser():
+    """Закрыть браузер и остановить запущенный в фоне браузер, к которому было подключение"""
+    try:
+        for context in Config.browser.contexts if not Config.browser_prelauncher else ():
+            context.close()
+
+        Config.browser.close()
+
+    except TimeoutError:
+        logger.warning('Сессия закрылась по таймауту!')
+
+    if Config.browser_prelauncher:
+        Config.browser_prelauncher.stop()
+        Config.browser_prelauncher = None
+
+    Config.browser = None
+
+
+@pytest.fixture(scope='session')
+@title('Запустить Playwright')
+def browser_session() -> 'SyncPlaywright':
+    """Запустить Playwright на сессию и закрыть браузер в конце сессии"""
+    from playwright.sync_api import sync_playwright
+
+    playwright: 'SyncPlaywright' = sync_playwright().start()
+
+    yield playwright
+
+    if Config.browser:
+        close_browser()
+
+    playwright.stop()
+    logger.info('Сессия браузера закрыта!')
+
+
+@pytest.fixture(params=[()])
+def browser(request: SubRequest, browser_session: 'SyncPlaywright') -> 'Browser':
+    """Получить экземпляр браузера. Браузер живет всю сессию и запускается заново при смене опций
+    и по политике перезапуска
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры;
+        browser_session: объект playwright сессии.
+    """
+    from web.browser_factory import BrowserFactory
+
+    add_opts = [option for option in request.param]
+
+    if Config.browser and (recycler := Config.browser_recycler) and (reason := recycler.get_reason()):
+        with step(msg := f'Перезапустить браузер: {reason}'):
+            logger.info(msg)
+            close_browser()
+
+        recycler.on_restart()
+
+    elif Config.browser and Config.browser_options != add_opts:
+        close_browser()
+
+    if not Config.browser:
+        if (prelauncher := Config.browser_prelauncher) and add_opts:
+            logger.info('Браузер запущен заново: запущенный в фоне браузер не поддерживает дополнительные опции')
+            prelauncher.stop()
+            Config.browser_prelauncher = prelauncher = None
+
+        with step(f'Создать экземпляр браузера {Config.browser_name}, Remote={Config.is_remote}'):
+            if prelauncher:
+                try:
+                    Config.browser = prelauncher.connect(playwright=browser_session)
+
+                except Exception as e:
+                    logger.warning(f'Не удалось подключиться к запущенному в фоне браузеру, обычный запуск: {e}')
+                    prelauncher.stop()
+                    Config.browser_prelauncher = None
+
+            if not Config.browser:
+                Config.browser = BrowserFactory.get_browser(
+                    playwright=browser_session,
+                    browser_name=Config.browser_name,
+                    add_opts=add_opts,
+                    is_headless=Config.is_headless
+                )
+
+        Config.browser_options = add_opts
+
+    if Config.browser_recycler:
+        Config.browser_recycler.on_test()
+
+    return Config.browser
+
+
+@pytest.fixture(scope='session', autouse=True)
+def api_latency():
+    """Прикрепить в allure перцентили задержек API-запросов процесса по эндпоинтам в конце сессии"""
+    yield Request.metrics
+
+    if report := Request.metrics.report():
+        attach(body=dumps(report, indent=2), name='API LATENCY', attachment_type=attachment_type.JSON)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def resource_timeline(request: SubRequest):
+    """Прикрепить в allure и сохранить в файл таймлайн ресурсов процессов браузера в конце сессии
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    yield Config.resource_monitor
+
+    if not (monitor := Config.resource_monitor):
+        return
+
+    report = monitor.report()
+    attach(body=dumps(report, indent=2), name='BROWSER RESOURCES TIMELINE', attachment_type=attachment_type.JSON)
+    logger.info(f'Тестов с ростом памяти процессов браузера: {len(report["leaks"])}')
+
+    if path := request.config.getoption('--resource_timeline'):
+        worker = getattr(request.config, 'workerinput', {}).get('workerid')
+        path = Path(path) if not worker else Path(path).with_name(f'{Path(path).stem}.{worker}{Path(path).suffix}')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(dumps(report, indent=2), encoding='utf-8')
+        logger.info(f'Таймлайн ресурсов процессов браузера сохранен: {path}')
+
+
+@pytest.fixture(autouse=True)
+def browser_resources(request: SubRequest):
+    """Учесть CPU и RSS процессов браузера в рамках теста и предупредить о росте памяти
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    if not (monitor := Config.resource_monitor) or not {'browser', 'open_page'} & set(request.fixturenames):
+        yield
+        return
+
+    monitor.start_test(name=request.node.nodeid)
+
+    yield monitor
+
+    monitor.finish_test()
+
+
+@pytest.fixture
+def setup_steps() -> 'SetupOrchestrator':
+    """Получить планировщик параллельных шагов подготовки теста. Шаги выполняются вызовом run()"""
+    from other.setup_orchestrator import SetupOrchestrator
+
+    return SetupOrchestrator()
+
+
+@pytest.fixture(autouse=True)
+def random_seed(request: SubRequest):
+    """Задать воспроизводимый seed генератора случайных данных для теста
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    if (seed := request.config.getoption('--random_seed')) is not None:
+        generator.seed(value=f'{seed}:{request.node.nodeid}')
+        dynamic.parameter('random_seed', seed)
+
+    yield generator
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_wait(request: SubRequest):
+    """Учесть время ожидания лимитов частоты API-запросов в рамках теста
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    if not (limiter := Request.rate_limiter):
+        yield
+        return
+
+    limiter.take_waited()
+
+    yield limiter
+
+    if waited := limiter.take_waited():
+        request.node.user_properties.append(('rate_limit_wait', round(waited, 3)))
+        attach(body=f'{waited:.3f} с', name='RATE LIMIT WAIT', attachment_type=attachment_type.TEXT)
+        logger.info(f'Ожидание лимитов частоты API-запросов в тесте: {waited:.3f} с')
+
+
+@pytest.fixture(autouse=True)
+def cassette(request: SubRequest):
+    """Записать или воспроизвести API-запросы теста из кассеты в зависимости от --cassette_mode
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    if (mode := request.config.getoption('--cassette_mode')) == CassetteMode.NONE:
+        yield
+        return
+
+    Request.cassette = Cassette(
+        path=get_cassette_path(cassette_dir=Path(request.config.getoption('--cassette_dir')), nodeid=request.node.nodeid),
+        mode=CassetteMode(mode),
+        match_on=tuple(request.config.getoption('--cassette_match').split(',')),
+        redact_headers=tuple(request.config.getoption('--cassette_redact').split(','))
+    )
+
+    yield Request.cassette
+
+    Request.cassette.save()
+    Request.cassette = None
+
+
+@pytest.fixture(autouse=True)
+def network_waterfall(request: SubRequest):
+    """Записать сетевые запросы страниц в рамках теста и проверить сетевой бюджет из маркера network_budget
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    if not (recorder := Config.network_recorder):
+        yield
+        return
+
+    recorder.start_test(name=request.node.nodeid)
+
+    yield recorder
+
+    recorder.finish_test()
+
+    if marker := request.node.get_closest_marker('network_budget'):
+        recorder.assert_budget(**marker.kwargs)
+
+
+@pytest.fixture(autouse=True)
+def cdp_profile(request: SubRequest):
+    """Собрать метрики производительности страницы Chromium в рамках теста
 
     Args:
         request: Подзапрос для получения данных из тестовой функции/фикстуры
     """
-    playwright: SyncPlaywright = sync_playwright().start()
-
-    with step(f'Создать экземпляр браузера {Config.browser_name}, Remote={Config.is_remote}'):
-        Config.browser = BrowserFactory.get_browser(
-            playwright=playwright,
-            browser_name=Config.browser_name,
-            add_opts=[option for option in request.param],
-            is_headless=Config.is_headless
+    marker = request.node.get_closest_marker('cdp_profile')
+
+    if not (marker or Config.is_cdp_profile) or 'open_page' not in request.fixturenames:
+        yield
+        return
+
+    from web.cdp import is_chromium
+    from web.profiler import CdpProfiler
+
+    request.getfixturevalue('open_page')
+
+    if not is_chromium(page := Config.page):
+        logger.warning('Профилирование через CDP доступно только для Chromium')
+        yield
+        return
+
+    if Config.cdp_profiler is None:
+        Config.cdp_profiler = CdpProfiler(heap_growth_limit=request.config.getoption('--heap_growth_limit'))
+
+    Config.cdp_profiler.start_test(
+        page=page,
+        name=request.node.nodeid,
+        is_cpu=marker.kwargs.get('cpu', False) if marker else False
+    )
+
+    yield Config.cdp_profiler
+
+    Config.cdp_profiler.finish_test()
+
+
+@pytest.fixture(autouse=True)
+def throttling(request: SubRequest):
+    """Применить профиль эмуляции из маркера throttling к странице open_page или к страницам, которые тест
+    с фикстурой browser создает через BasePage
+
+    Args:
+        request: Подзапрос для получения данных из тестовой функции/фикстуры
+    """
+    uses_browser = bool({'browser', 'open_page'} & set(request.fixturenames))
+
+    if not (marker := request.node.get_closest_marker('throttling')):
+        if Config.throttling and uses_browser:
+            dynamic.parameter('throttling', Config.throttling.name)
+
+        yield
+        return
+
+    if not uses_browser:
+        pytest.fail('Маркер throttling применяется только к тестам с фикстурой browser или open_page', pytrace=False)
+
+    if (name := marker.args[0] if marker.args else marker.kwargs.get('profile')) not in THROTTLING_PROFILES:
+        pytest.fail(
+            f'Неизвестный профиль маркера throttling: {name}. Доступные профили: {", ".join(THROTTLING_PROFILES)}',
+            pytrace=False
         )
 
-    yield Config.browser
+    from web.throttling import apply_throttling
 
-    try:
-        for context in Config.browser.contexts:
-            context.close()
+    profile, default = THROTTLING_PROFILES[name], Config.throttling
+    dynamic.parameter('throttling', profile.name)
 
-        Config.browser.close()
-        playwright.stop()
-        logger.info('Сессия браузера закрыта!')
+    if 'open_page' not in request.fixturenames:
+        # страницы BasePage, созданные тестом, применяют профиль из Config.throttling
+        Config.throttling = profile
 
-    except TimeoutError:
-        logger.warning('Сессия закрылась по таймауту!')
+        yield
+
+        Config.throttling = default
+        scale_timeout(factor=default.timeout_factor if default else 1)
+        return
+
+    request.getfixturevalue('open_page')
+    apply_throttling(page=(page := Config.page), profile=profile)
+
+    yield
+
+    apply_throttling(page=page, profile=default)
@@ -0,0 +1,169 @@
+"""Производственный календарь с предрассчитанным индексом рабочих дней"""
+from array import array
+from datetime import date, datetime
+from json import loads
+from pathlib import Path
+from typing import Iterable, TypeVar
+
+from other.logging import logger
+
+DateType = TypeVar('DateType', date, datetime)
+WEEKEND = (5, 6)
+
+
+class BusinessCalendar:
+    """Календарь рабочих дней. Для диапазона лет хранится битовая карта рабочих дней, количество рабочих дней до
+    каждой даты и порядковые номера рабочих дней, поэтому сдвиг и разница в рабочих днях считаются за O(1)
+    """
+
+    def __init__(self, holidays: Iterable[date] = (), workdays: Iterable[date] = (), weekend: tuple[int, ...] = WEEKEND):
+        """
+
+        Args:
+            holidays: праздничные нерабочие дни;
+            workdays: рабочие выходные дни (переносы);
+            weekend: номера выходных дней недели, где 0 - понедельник.
+        """
+        self.holidays, self.workdays, self.weekend = set(holidays), set(workdays), weekend
+        self._first = self._last = 0
+        self._bitmap = bytearray()
+        self._counts = array('l')
+        self._ordinals = array('l')
+
+    @classmethod
+    def from_file(cls, path: Path | str, weekend: tuple[int, ...] = WEEKEND) -> 'BusinessCalendar':
+        """Создать календарь из JSON файла вида {"holidays": ["2024-01-01", ...], "workdays": ["2024-04-27", ...]}
+
+        Args:
+            path: путь к файлу;
+            weekend: номера выходных дней недели, где 0 - понедельник.
+        """
+        data = loads(Path(path).read_text(encoding='utf-8'))
+        calendar = cls(weekend=weekend)
+        calendar.load(holidays=map(date.fromisoformat, data.get('holidays', ())),
+                      workdays=map(date.fromisoformat, data.get('workdays', ())))
+
+        return calendar
+
+    def load(self, holidays: Iterable[date] = (), workdays: Iterable[date] = ()):
+        """Добавить праздничные и рабочие выходные дни. Предрассчитанный индекс сбрасывается
+
+        Args:
+            holidays: праздничные нерабочие дни;
+            workdays: рабочие выходные дни (переносы).
+        """
+        self.holidays.update(holidays)
+        self.workdays.update(workdays)
+        self._first = self._last = 0
+        logger.debug(f'В календарь загружено праздников: {len(self.holidays)}, рабочих выходных: {len(self.workdays)}')
+
+    def _build(self, first_year: int, last_year: int):
+        """Предрассчитать индекс рабочих дней для диапазона лет
+
+        Args:
+            first_year: первый год диапазона;
+            last_year: последний год диапазона.
+        """
+        first, last = date(first_year, 1, 1).toordinal(), date(last_year, 12, 31).toordinal() + 1
+        bitmap, counts, ordinals = bytearray(last - first), array('l', [0]) * (last - first + 1), array('l')
+        holidays = {day.toordinal() for day in self.holidays}
+        workdays = {day.toordinal() for day in self.workdays}
+        weekday = date.fromordinal(first).weekday()
+
+        for offset, ordinal in enumerate(range(first, last)):
+            counts[offset] = len(ordinals)
+
+            if ordinal in workdays or ((weekday + offset) % 7 not in self.weekend and ordinal not in holidays):
+                bitmap[offset] = 1
+                ordinals.append(ordinal)
+
+        counts[last - first] = len(ordinals)
+        self._first, self._last, self._bitmap, self._counts, self._ordinals = first, last, bitmap, counts, ordinals
+        logger.debug(f'Предрассчитан календарь рабочих дней на {first_year}-{last_year} годы')
+
+    def _ensure(self, *ordinals: int):
+        """Расширить предрассчитанный диапазон, чтобы он включал даты с запасом в год
+
+        Args:
+            *ordinals: порядковые номера дат
+        """
+        low, high = min(ordinals), max(ordinals)
+
+        if not self._first or low < self._first or high >= self._last:
+            first_year = date.fromordinal(min(low, self._first or low)).year - 1
+            last_year = date.fromordinal(max(high, self._last - 1 if self._last else high)).year + 1
+            self._build(first_year=first_year, last_year=last_year)
+
+    def is_business_day(self, day: date) -> bool:
+        """Проверить, что дата является рабочим днем
+
+        Args:
+            day: дата
+        """
+        self._ensure(day.toordinal())
+
+        return bool(self._bitmap[day.toordinal() - self._first])
+
+    def add_business_days(self, day: DateType, count: int) -> DateType:
+        """Сдвинуть дату на количество рабочих дней. При нулевом сдвиге нерабочий день переносится на следующий рабочий
+
+        Args:
+            day: дата или дата и время, время сохраняется;
+            count: количество рабочих дней, отрицательное для сдвига в прошлое.
+        """
+        ordinal, span = day.toordinal(), 2 * abs(count) + 14
+
+        while True:
+            self._ensure(ordinal - span, ordinal + span)
+            offset = ordinal - self._first
+            index = self._counts[offset + 1] + count - 1 if count > 0 else self._counts[offset] + count
+
+            if 0 <= index < len(self._ordinals):
+                break
+
+            if span > 366 * 100:
+                raise ValueError(f'Не найден рабочий день со сдвигом {count} от {day}')
+
+            span *= 2
+
+        result = date.fromordinal(self._ordinals[index])
+
+        return datetime.combine(result, day.timetz()) if isinstance(day, datetime) else result
+
+    def business_days_between(self, start: date, end: date) -> int:
+        """Получить количество рабочих дней в полуинтервале [start, end). Отрицательное, если end раньше start
+
+        Args:
+            start: начальная дата;
+            end: конечная дата.
+        """
+        start, end = start.toordinal(), end.toordinal()
+        self._ensure(start, end)
+
+        return self._counts[end - self._first] - self._counts[start - self._first]
+
+    def business_days(self, start: date, end: date) -> list[date]:
+        """Получить рабочие дни в полуинтервале [start, end)
+
+        Args:
+            start: начальная дата;
+            end: конечная дата.
+        """
+        start, end = start.toordinal(), end.toordinal()
+        self._ensure(start, end)
+
+        return list(map(date.fromordinal, self._ordinals[self._counts[start - self._first]:self._counts[end - self._first]]))
+
+    def offset_matrix(self, starts: Iterable[date], counts: Iterable[int]) -> list[tuple[date, int, date]]:
+        """Получить матрицу сдвигов для параметризации тестов: начальная дата, сдвиг и ожидаемая дата
+
+        Args:
+            starts: начальные даты;
+            counts: сдвиги в рабочих днях.
+        """
+        counts = tuple(counts)
+
+        return [(start, count, self.add_business_days(start, count)) for start in starts for count in counts]
+
+
+business_calendar = BusinessCalendar()
@@ -0,0 +1,194 @@
+"""Проверка доступности стенда и размыкатель цепи для API-запросов и открытия страниц
+
+Если стенд недоступен, каждый тест ждет свои таймауты запросов и загрузки страниц. После threshold ошибок
+подключения подряд в пределах окна цепь для хоста размыкается, и оставшиеся тесты сразу падают или пропускаются
+с понятной причиной. Раз в probe_interval секунд выполняется проверка хоста, и если стенд снова отвечает, цепь
+замыкается.
+"""
+from enum import StrEnum
+from threading import Lock
+from time import monotonic
+from urllib.parse import urlsplit
+
+from pytest import fail, skip
+from requests import RequestException, get
+
+from other.logging import logger
+
+# ошибки Chromium уровня подключения к стенду. Таймауты загрузки и прерванные переходы (net::ERR_ABORTED)
+# бывают и на доступном стенде, поэтому не учитываются
+CONNECTION_ERRORS = (
+    'net::ERR_CONNECTION_',
+    'net::ERR_NAME_NOT_RESOLVED',
+    'net::ERR_NAME_RESOLUTION_FAILED',
+    'net::ERR_ADDRESS_UNREACHABLE',
+    'net::ERR_INTERNET_DISCONNECTED',
+    'net::ERR_NETWORK_',
+    'net::ERR_TIMED_OUT',
+    'net::ERR_EMPTY_RESPONSE',
+    'net::ERR_PROXY_CONNECTION_FAILED',
+    'net::ERR_TUNNEL_CONNECTION_FAILED'
+)
+
+
+class BreakerAction(StrEnum):
+    """Перечисление действий с тестом при разомкнутой цепи"""
+    FAIL = 'fail'
+    SKIP = 'skip'
+
+
+class CircuitBreaker:
+    """Размыкатель цепи по хостам стенда"""
+
+    def __init__(
+            self,
+            threshold: int = 5,
+            window: float = 60,
+            probe_interval: float = 30,
+            probe_timeout: float = 5,
+            action: BreakerAction = BreakerAction.FAIL
+    ):
+        """
+
+        Args:
+            threshold: количество ошибок подключения подряд, после которого цепь размыкается,
+                0 - цепь размыкается только проверкой доступности при старте сессии;
+            window: окно в секундах, в котором учитываются ошибки;
+            probe_interval: период проверки хоста при разомкнутой цепи в секундах;
+            probe_timeout: таймаут проверки хоста в секундах;
+            action: действие с тестом при разомкнутой цепи: fail или skip.
+        """
+        self.threshold, self.window, self.action = threshold, window, BreakerAction(action)
+        self.probe_interval, self.probe_timeout = probe_interval, probe_timeout
+        self._failures: dict[str, list[float]] = {}
+        self._opened: dict[str, str] = {}
+        self._probed: dict[str, float] = {}
+        self._probe_errors: dict[str, str] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        """Получить хост с портом из адреса
+
+        Args:
+            url: адрес
+        """
+        return urlsplit(url).netloc
+
+    def probe(self, url: str) -> str | None:
+        """Проверить, что хост отвечает. Ответ со статусом меньше 500 считается доступностью.
+        Возвращает причину недоступности, None - хост доступен
+
+        Args:
+            url: адрес хоста или страницы
+        """
+        try:
+            with get(url, timeout=self.probe_timeout, verify=False, allow_redirects=False, stream=True) as response:
+                return f'статус {response.status_code}' if response.status_code >= 500 else None
+
+        except RequestException as e:
+            return f'{type(e).__name__}: {e}'
+
+    def check_health(self, urls: list[str]) -> bool:
+        """Проверить доступность стенда перед тестами и разомкнуть цепь для недоступных хостов
+
+        Args:
+            urls: адреса для проверки
+        """
+        healthy = True
+
+        for url in urls:
+            if reason := self.probe(url=url):
+                healthy = False
+                logger.error(f'Стенд {url} недоступен при старте сессии: {reason}')
+                self.open(host=self.get_host(url), reason=f'недоступен при старте сессии ({reason})')
+            else:
+                logger.info(f'Стенд {url} доступен')
+
+        return healthy
+
+    def open(self, host: str, reason: str):
+        """Разомкнуть цепь для хоста
+
+        Args:
+            host: хост с портом;
+            reason: причина.
+        """
+        with self._lock:
+            self._opened[host], self._probed[host] = reason, monotonic()
+            self._failures.pop(host, None)
+            self._probe_errors.pop(host, None)
+
+        action = 'падать' if self.action == BreakerAction.FAIL else 'пропускаться'
+        logger.error(f'Цепь для {host} разомкнута: {reason}. Оставшиеся тесты будут {action} без ожидания таймаутов')
+
+    def check(self, url: str):
+        """Проверить цепь хоста перед запросом. При разомкнутой цепи тест падает или пропускается,
+        раз в probe_interval хост проверяется заново
+
+        Args:
+            url: адрес запроса
+        """
+        if (host := self.get_host(url)) not in self._opened:
+            return
+
+        with self._lock:
+            # проверку выполняет один поток, остальные до ее окончания сразу получают отказ
+            if is_due := host in self._opened and monotonic() - self._probed[host] >= self.probe_interval:
+                self._probed[host] = monotonic()
+
+        if is_due:
+            error = self.probe(url=urlsplit(url)._replace(path='/', query='', fragment='').geturl())
+
+            with self._lock:
+                if error is None:
+                    self._opened.pop(host, None)
+                    self._probe_errors.pop(host, None)
+                else:
+                    self._probe_errors[host] = error
+
+            if error is None:
+                logger.success(f'Стенд {host} снова доступен, цепь замкнута')
+                return
+
+        with self._lock:
+            if (reason := self._opened.get(host)) is None:
+                return
+
+            if error := self._probe_errors.get(host):
+                reason = f'{reason}, последняя проверка: {error}'
+
+            wait = max(self.probe_interval - (monotonic() - self._probed[host]), 0)
+
+        msg = f'Стенд {host} недоступен: {reason}. Следующая проверка через {wait:.0f} с'
+
+        if self.action == BreakerAction.SKIP:
+            skip(msg)
+
+        fail(msg, pytrace=False)
+
+    def record_success(self, url: str):
+        """Учесть успешное подключение к хосту
+
+        Args:
+            url: адрес запроса
+        """
+        if self._failures:
+            with self._lock:
+                self._failures.pop(self.get_host(url), None)
+
+    def record_failure(self, url: str, error: BaseException):
+        """Учесть ошибку подключения к хосту и разомкнуть цепь после threshold ошибок подряд в пределах окна
+
+        Args:
+            url: адрес запроса;
+            error: ошибка подключения.
+        """
+        host, now = self.get_host(url), monotonic()
+
+        with self._lock:
+            failures = [moment for moment in self._failures.get(host, []) if now - moment <= self.window] + [now]
+            self._failures[host] = failures
+
+        if self.threshold and len(failures) >= self.threshold and host not in self._opened:
+            self.open(host=host, reason=f'{len(failures)} ошибок подключения подряд, последняя: {type(error).__name__}')
@@ -1,13 +1,25 @@
 """Конфигурация с параметрами запуска"""
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from playwright.sync_api import Browser, Page
+if TYPE_CHECKING:
+    from other.circuit_breaker import CircuitBreaker
+    from playwright.sync_api import Browser, Page
+    from web.browser_config import ThrottlingProfile
+    from web.browser_prelaunch import BrowserPrelauncher
+    from web.browser_recycler import BrowserRecycler
+    from web.network_recorder import NetworkRecorder
+    from web.pages.base_page import BasePage
+    from web.profiler import CdpProfiler
+    from web.resource_monitor import ResourceMonitor
 
 
 class Config:
     """Абстрактный класс с параметрами запуска. Заполняется при старте проекта"""
-    browser: Browser
-    page: Page
+    browser: 'Browser | None' = None
+    browser_options: list[str] = []
+    page: 'Page'
+    page_object: 'BasePage | None' = None
     browser_name: str
     is_remote: bool = False
     is_headless: bool = False
@@ -16,3 +28,14 @@ class Config:
     log_level = "INFO"
     test_data_dir = Path('test_data').absolute()
     timeout = 30
+    log_body_limit: int = 64 * 1024
+    log_body_preview: int = 1024
+    log_body_dir = Path('bodies').absolute()
+    network_recorder: 'NetworkRecorder | None' = None
+    is_cdp_profile: bool = False
+    cdp_profiler: 'CdpProfiler | None' = None
+    throttling: 'ThrottlingProfile | None' = None
+    browser_prelauncher: 'BrowserPrelauncher | None' = None
+    resource_monitor: 'ResourceMonitor | None' = None
+    browser_recycler: 'BrowserRecycler | None' = None
+    circuit_breaker: 'CircuitBreaker | None' = None
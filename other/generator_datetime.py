@@ -1,18 +1,27 @@
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
+
+from other.business_calendar import BusinessCalendar, business_calendar
 
 
 class GeneratorDateTime:
     """ Класс с кастомным генератором даты и времени """
 
-    def __init__(self, dt: datetime = datetime.now(), fmt: str = '%d.%m.%YT%H:%M:%S'):
+    def __init__(
+            self,
+            dt: datetime | None = None,
+            fmt: str = '%d.%m.%YT%H:%M:%S',
+            calendar: BusinessCalendar = business_calendar
+    ):
         """
 
         Args:
             dt: пользовательская дата и время. По умолчанию текущая дата и время
             fmt: формат для преобразования в строку
+            calendar: производственный календарь для сдвига на рабочие дни
         """
-        self._dt = dt
+        self._dt = dt or datetime.now()
         self._fmt = fmt
+        self._calendar = calendar
 
     @property
     def dt(self) -> datetime:
@@ -37,7 +46,8 @@ class GeneratorDateTime:
             minutes: int = 0,
             hours: int = 0,
             days: int = 0,
-            weeks: int = 0
+            weeks: int = 0,
+            business_days: int = 0
     ):
         """ Изменить текущую дату и время на определенный сдвиг
 
@@ -50,19 +60,22 @@ class GeneratorDateTime:
             hours: количество часов сдвига;
             days: количество дней сдвига;
             weeks: количество недель сдвига;
+            business_days: количество рабочих дней сдвига по производственному календарю;
             utc: флаг необходимости использования часового пояса UTC;
         """
         date_with_offset = datetime.utcnow() if utc else self._dt
         delta = timedelta(seconds=seconds, minutes=minutes, hours=hours, days=days, weeks=weeks)
         date_with_offset = date_with_offset + delta if to_the_future else date_with_offset - delta
 
-        if working_day:
-            number_of_day = date.isoweekday(date_with_offset)
+        if business_days:
+            date_with_offset = self._calendar.add_business_days(
+                date_with_offset, business_days if to_the_future else -business_days
+            )
 
-            if number_of_day in (6, 7):
-                date_with_offset += timedelta(days=(8 - number_of_day))
+        if working_day:
+            date_with_offset = self._calendar.add_business_days(date_with_offset, 0)
 
         if holiday:
-            date_with_offset += timedelta(days=(6 - date.isoweekday(date_with_offset)))
+            date_with_offset += timedelta(days=(6 - date_with_offset.isoweekday()))
 
         self._dt = date_with_offset
@@ -1,7 +1,20 @@
 """ Модуль с функциями логгера """
 import sys
 from argparse import Namespace
+from bz2 import open as bz2_open
+from contextlib import contextmanager
+from functools import partial, wraps
+from gzip import open as gzip_open
+from hashlib import sha256
+from heapq import merge
+from io import TextIOWrapper
 from json import dumps, loads
+from lzma import open as lzma_open
+from os import getpid
+from pathlib import Path
+from threading import local
+from typing import IO, Callable, Iterator
+from zipfile import ZipFile
 
 from allure import attach, attachment_type, step
 from loguru import logger
@@ -11,6 +24,12 @@ from other.config import Config
 from other.utils import get_curl
 
 
+MAIN_WORKER = 'main'
+json_sinks: list[int] = []
+spilled_bodies: set[str] = set()
+deferred = local()
+
+
 class InvalidLogLevel(Exception):
     """Исключение при попытке задать неподдерживаемый уровень логирования"""
 
@@ -22,21 +41,26 @@ class InvalidLogLevel(Exception):
                f'Пожалуйста, укажите один из следующих уровней: {self.available_log_levels}'
 
 
-def create_logger(log_level: str, params: Namespace) -> None:
+def create_logger(log_level: str, params: Namespace, worker: str | None = None) -> None:
     """ Создать логер и установить уровень логирования
 
     Args:
         log_level: уровень логирования
         params: параметры запуска проекта
+        worker: идентификатор воркера xdist
     """
+    enqueue = getattr(params, 'log_enqueue', False)
+
     try:
         logger.remove()
+        logger.configure(extra={'worker': worker or MAIN_WORKER})
 
         if getattr(params, 'xmlpath', None):  # если формируется xml, то выводить лог без цветового выделения
             logger.add(
                 sink=sys.stdout,
                 level=log_level,
-                format='\n{time:HH:mm:ss.SSS} | {level} | {message}'
+                format='\n{time:HH:mm:ss.SSS} | {level} | {message}',
+                enqueue=enqueue
             )
         else:
             logger.add(
@@ -48,9 +72,21 @@ def create_logger(log_level: str, params: Namespace) -> None:
                     '<level>{message}</level>'
                 ),
                 level=log_level,
-                colorize=True
+                colorize=True,
+                enqueue=enqueue
             )
 
+        if log_json := getattr(params, 'log_json', None):
+            json_sinks.append(logger.add(
+                sink=get_worker_log_path(path=Path(log_json), worker=worker),
+                level=log_level,
+                serialize=True,
+                enqueue=enqueue,
+                buffering=1,
+                rotation=getattr(params, 'log_json_rotation', None),
+                compression=getattr(params, 'log_json_compression', None)
+            ))
+
     except ValueError:
         logger.error(f'Ошибка при установке уровня логирования {log_level=}')
         raise InvalidLogLevel(
@@ -59,6 +95,81 @@ def create_logger(log_level: str, params: Namespace) -> None:
         )
 
 
+def get_worker_log_path(path: Path, worker: str | None = None) -> Path:
+    """Получить путь до JSON-lines лога процесса. Каждый воркер xdist и мастер пишут в свой файл
+
+    Args:
+        path: путь до итогового лога;
+        worker: идентификатор воркера xdist.
+    """
+    return path.with_name(f'{path.stem}.{worker or MAIN_WORKER}{path.suffix}')
+
+
+def get_worker_log_paths(path: Path) -> list[Path]:
+    """Получить JSON-lines логи процессов, включая ротированные и сжатые файлы
+
+    Args:
+        path: путь до итогового лога
+    """
+    return sorted(file for file in path.parent.glob(f'{path.stem}.*{path.suffix}*') if file != path and file.is_file())
+
+
+@contextmanager
+def open_log(path: Path) -> Iterator[IO[str]]:
+    """Открыть лог на чтение, сжатые при ротации файлы (.gz, .bz2, .xz, .zip) читаются без распаковки на диск
+
+    Args:
+        path: путь до лога
+    """
+    if path.suffix == '.zip':
+        with ZipFile(path) as archive, archive.open(archive.namelist()[0]) as member:
+            yield TextIOWrapper(member, encoding='utf-8')
+
+    elif opener := {'.gz': gzip_open, '.bz2': bz2_open, '.xz': lzma_open}.get(path.suffix):
+        with opener(path, 'rt', encoding='utf-8') as file:
+            yield file
+
+    else:
+        with path.open(encoding='utf-8') as file:
+            yield file
+
+
+def read_log_records(path: Path) -> Iterator[tuple[float, str]]:
+    """Прочитать записи JSON-lines лога: время записи и строка
+
+    Args:
+        path: путь до лога, в том числе сжатого при ротации
+    """
+    with open_log(path=path) as file:
+        for line in file:
+            if line.strip():
+                yield loads(line)['record']['time']['timestamp'], line
+
+
+def merge_worker_logs(path: Path) -> int:
+    """Объединить логи воркеров в один файл в порядке времени записи и удалить логи воркеров.
+    JSON-lines лог текущего процесса закрывается перед объединением
+
+    Args:
+        path: путь до итогового лога
+    """
+    while json_sinks:
+        logger.remove(json_sinks.pop())
+
+    paths = get_worker_log_paths(path=path)
+    count = 0
+
+    with path.open('w', encoding='utf-8') as file:
+        for _, line in merge(*map(read_log_records, paths), key=lambda x: x[0]):
+            file.write(line)
+            count += 1
+
+    for worker_log in paths:
+        worker_log.unlink()
+
+    return count
+
+
 def set_log_level(log_level: str):
     """ Установить уровень логирования
 
@@ -78,12 +189,85 @@ def set_log_level(log_level: str):
         logger.info(f'Установлен уровень логирования: {Config.log_level}')
 
 
-def attach_body(body: str | bytes):
-    """Прикрепить в allure тело запроса
+def get_body_bytes(body: str | bytes | None) -> bytes:
+    """Получить тело запроса или ответа в байтах
+
+    Args:
+        body: тело
+    """
+    return body.encode() if isinstance(body, str) else body or b''
+
+
+def is_large_body(body: str | bytes | None) -> bool:
+    """Проверить, что тело превышает порог Config.log_body_limit и не выводится в лог целиком
+
+    Args:
+        body: тело
+    """
+    return bool(Config.log_body_limit) and body is not None and len(body) > Config.log_body_limit
+
+
+def spill_body(body: bytes) -> tuple[str, Path]:
+    """Сохранить тело в файл Config.log_body_dir один раз. Одинаковые тела сохраняются в один файл по sha256
 
     Args:
-        body: Тело запроса
+        body: тело
     """
+    digest, suffix = sha256(body).hexdigest(), '.bin' if b'\0' in body[:1024] else '.txt'
+    path = Config.log_body_dir / f'{digest}{suffix}'
+
+    if digest not in spilled_bodies and not path.exists():
+        Config.log_body_dir.mkdir(parents=True, exist_ok=True)
+        (tmp := path.with_name(f'{path.name}.{getpid()}.tmp')).write_bytes(body)
+        tmp.replace(path)
+
+    spilled_bodies.add(digest)
+
+    return digest, path
+
+
+def format_body(body: str | bytes | None, spilled: tuple[str, Path] | None = None) -> str:
+    """Получить тело для вывода в лог: целиком или, если тело больше порога, начало тела, размер, хэш и путь до файла
+
+    Args:
+        body: тело;
+        spilled: хэш и файл уже сохраненного тела, чтобы не считать хэш повторно.
+    """
+    if not is_large_body(body=body):
+        return body.decode(errors='replace') if isinstance(body, bytes) else f'{body}'
+
+    body = get_body_bytes(body=body)
+    digest, path = spilled or spill_body(body=body)
+    preview = body[:Config.log_body_preview].decode(errors='replace')
+
+    return f'{preview}... [размер: {len(body)} байт, sha256: {digest}, файл: {path}]'
+
+
+def get_multipart_summary(body) -> str:
+    """Получить описание multipart тела для лога вместо содержимого
+
+    Args:
+        body: тело запроса: байты или потоковое тело с методом summary
+    """
+    if summary := getattr(body, 'summary', None):
+        return summary()
+
+    return f'multipart/form-data: {len(body or b"")} байт'
+
+
+def attach_body(body: str | bytes, spilled: tuple[str, Path] | None = None):
+    """Прикрепить в allure тело запроса. Тело больше порога прикрепляется в виде начала тела, размера, хэша и пути
+    до файла, само тело в отчет не копируется
+
+    Args:
+        body: Тело запроса;
+        spilled: хэш и файл уже сохраненного тела, чтобы не считать хэш повторно.
+    """
+    if is_large_body(body=body):
+        spilled = spilled or spill_body(body=get_body_bytes(body=body))
+        attach(body=format_body(body=body, spilled=spilled), name='BODY', attachment_type=attachment_type.TEXT)
+        return
+
     try:
         body = body if type(body) == str else body.decode()
         attach(
@@ -96,6 +280,39 @@ def attach_body(body: str | bytes):
         attach(body=body, name='BODY', attachment_type=attachment_type.TEXT)
 
 
+def deferrable(func: Callable) -> Callable:
+    """Декоратор записи в лог и отчет, которую можно отложить: внутри defer_report вызов сохраняется и выполняется
+    позже в потоке теста, так как шаги и вложения allure из фоновых потоков не попадают в тест
+
+    Args:
+        func: функция записи в лог и отчет
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if (calls := getattr(deferred, 'calls', None)) is not None:
+            calls.append(partial(func, *args, **kwargs))
+            return None
+
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def defer_report() -> Iterator[list[Callable]]:
+    """Отложить записи в лог и отчет в текущем потоке. Возвращает список отложенных вызовов для выполнения
+    в потоке теста
+    """
+    deferred.calls = calls = []
+
+    try:
+        yield calls
+
+    finally:
+        deferred.calls = None
+
+
+@deferrable
 def log_request(request: PreparedRequest, is_compressed: bool = False, is_insecure: bool = False):
     """Залогировать запрос
 
@@ -109,11 +326,22 @@ def log_request(request: PreparedRequest, is_compressed: bool = False, is_insecu
           f'\t URL:     <blue><normal>{request.url}</normal></blue>\n' \
           f'\t Headers: <blue><normal>{request.headers}</normal></blue>\n'
 
-    if 'boundary' not in request.headers and request.method != 'GET':
-        msg += f'\t Body:    <blue><normal>{request.body}</normal></blue>\n'
+    is_multipart = 'boundary' in request.headers.get('Content-Type', '')
+    # большое тело хэшируется и сохраняется один раз для лога, curl и отчета
+    spilled = None
+
+    if not is_multipart and is_large_body(body=request.body):
+        spilled = spill_body(body=get_body_bytes(body=request.body))
 
-    if 'boundary' not in request.headers:
-        curl = get_curl(request=request, is_compressed=is_compressed, is_insecure=is_insecure)
+    if is_multipart:
+        msg += f'\t Body:    <blue><normal>{get_multipart_summary(body=request.body)}</normal></blue>\n'
+
+    elif request.method != 'GET':
+        msg += f'\t Body:    <blue><normal>{format_body(body=request.body, spilled=spilled)}</normal></blue>\n'
+
+    if not is_multipart:
+        body_path = spilled[1] if spilled else None
+        curl = get_curl(request=request, is_compressed=is_compressed, is_insecure=is_insecure, body_path=body_path)
         msg += f'\t CURL:    <blue><normal>{curl}</normal></blue>'
 
     try:
@@ -128,18 +356,23 @@ def log_request(request: PreparedRequest, is_compressed: bool = False, is_insecu
             name='HEADERS',
             attachment_type=attachment_type.JSON
         )
-        attach_body(body=request.body)
+        if is_multipart:
+            attach(body=get_multipart_summary(body=request.body), name='BODY', attachment_type=attachment_type.TEXT)
+        else:
+            attach_body(body=request.body, spilled=spilled)
 
         if curl:
             attach(body=curl, name='CURL', attachment_type=attachment_type.TEXT)
 
 
+@deferrable
 @logger.catch()
-def log_response(response: Response):
+def log_response(response: Response, summary: str | None = None):
     """Залогировать ответ
 
     Args:
         response: ответ
+        summary: описание тела вместо тела, если тело ответа не должно читаться (например, скачано в файл)
     """
     color = {
         1: 'light-blue',
@@ -148,12 +381,21 @@ def log_response(response: Response):
         4: 'red',
         5: 'red'
     }.get(response.status_code // 100, "y")
+    spilled = None
+
+    if summary is not None:
+        body = summary
+    elif is_large_body(body=response.content):
+        spilled = spill_body(body=response.content)
+        body = format_body(body=response.content, spilled=spilled)
+    else:
+        body = response.text
 
     try:
         logger.opt(colors=True).info(
             f'Code: <{color}><n>{response.status_code}</n></{color}>\n'
             f'\t Headers: <{color}><n>{response.headers}</n></{color}>\n'
-            f'\t Body:    <{color}><n>{response.text}</n></{color}>'
+            f'\t Body:    <{color}><n>{body}</n></{color}>'
         )
 
         with step(f'Ответ: [{response.status_code}] {response.url}'):
@@ -162,11 +404,28 @@ def log_response(response: Response):
                 name='HEADERS',
                 attachment_type=attachment_type.JSON
             )
-            attach_body(body=response.content)
+            if summary is not None:
+                attach(body=summary, name='BODY', attachment_type=attachment_type.TEXT)
+            else:
+                attach_body(body=response.content, spilled=spilled)
 
     except ValueError:
         logger.opt(colors=True).info(
             f'Code: <{color}><normal>{response.status_code}</normal></{color}>\n'
             f'\t Headers: <{color}><normal>{response.headers}</normal></{color}>\n'
         )
-        logger.info(f'Body: {response.text}')
+        logger.info(f'Body: {body}')
+
+
+@deferrable
+def log_cached_response(response: Response, url: str):
+    """Залогировать ответ, взятый из кэша
+
+    Args:
+        response: ответ из кэша;
+        url: адрес запроса.
+    """
+    logger.info(f'Ответ взят из кэша: [{response.status_code}] {url}')
+
+    with step(f'Ответ из кэша: [{response.status_code}] {url}'):
+        pass
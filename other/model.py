@@ -1,9 +1,10 @@
 """Методы валидации тел ответа по схеме Pydantic"""
+from functools import cache
 from json import dumps
 from typing import Type
 
 from allure import attach, step
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, RootModel, TypeAdapter, ValidationError
 from pytest import fail
 
 from other.logging import logger
@@ -60,3 +61,31 @@ def convert_model(model: BaseModel, is_json: bool = False, **kwargs) -> list | d
     )
 
     return result
+
+
+@cache
+def get_root_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Получить адаптер для сериализации поля root модели. Адаптер создается один раз на модель
+
+    Args:
+        model: класс модели
+    """
+    return TypeAdapter(model.model_fields['root'].annotation)
+
+
+def serialize_model(model: BaseModel, **kwargs) -> bytes:
+    """Сериализовать модель в JSON байты для тела запроса за один проход, без промежуточного dict
+
+    Args:
+        model: объект модели;
+        **kwargs: кварги для метода преобразования.
+    """
+    if 'root' in type(model).model_fields and not isinstance(model, RootModel):
+        # как в convert_model: поле root отправляется без обертки
+        result = get_root_adapter(model=type(model)).dump_json(model.root, **kwargs)
+    else:
+        result = model.model_dump_json(**kwargs).encode()
+
+    logger.debug(f'Сериализация модели {type(model).__name__}: {len(result)} байт')
+
+    return result
@@ -0,0 +1,642 @@
+"""Фабрика валидных экземпляров pydantic моделей для тестовых данных"""
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from enum import Enum
+from re import compile as compile_regex, error as RegexError, match
+from string import ascii_letters, ascii_lowercase, digits, punctuation
+from threading import local
+from types import NoneType, UnionType
+from typing import Annotated, Any, Callable, Literal, Union, get_args, get_origin
+from uuid import UUID
+
+from allure import step
+from pydantic import AnyUrl, BaseModel, EmailStr, RootModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+from other.logging import logger
+from other.random_values import NameEnum, RandomGenerator, generator as default_generator
+
+Generator = Callable[[], Any]
+CONSTRAINTS = ('gt', 'ge', 'lt', 'le', 'multiple_of', 'min_length', 'max_length', 'pattern', 'max_digits', 'decimal_places')
+MAX_INT = 999999
+MAX_PLACES = 12
+COLLECTION_LENGTH = 3
+MAX_DEPTH = 3
+PATTERN_REPEAT = 5
+PATTERN_ATTEMPTS = 100
+PATTERN_ALPHABET = ascii_letters + digits + punctuation + ' '
+PATTERN_CATEGORIES = {
+    'd': digits,
+    'w': ascii_letters + digits + '_',
+    's': ' ',
+    'D': ''.join(char for char in PATTERN_ALPHABET if char not in digits),
+    'W': ''.join(char for char in PATTERN_ALPHABET if not (char.isalnum() or char == '_')),
+    'S': PATTERN_ALPHABET.replace(' ', '')
+}
+PATTERN_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v'}
+PATTERN_ANCHORS = 'bBAZ'
+
+
+class DepthExceeded(Exception):
+    """Исключение при превышении глубины генерации рекурсивной модели"""
+
+
+class PatternParser:
+    """Разбор регулярного выражения в генератор подходящих строк. Поддерживаются символы, экранирование, классы,
+    группы, альтернативы, повторы и якоря. Обратные ссылки, lookahead/lookbehind и флаги не поддерживаются
+    """
+
+    def __init__(self, pattern: str, random: Any):
+        """
+
+        Args:
+            pattern: регулярное выражение;
+            random: генератор случайных чисел.
+        """
+        self.pattern, self.random, self.pos = pattern, random, 0
+
+    def parse(self) -> Generator:
+        """Разобрать выражение целиком и получить генератор строк"""
+        value = self._alternation()
+
+        if self.pos < len(self.pattern):
+            raise ValueError(f'лишний символ "{self.pattern[self.pos]}" в позиции {self.pos}')
+
+        return value
+
+    def _peek(self) -> str | None:
+        """Получить текущий символ выражения, None - выражение закончилось"""
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _take(self) -> str:
+        """Получить текущий символ выражения и перейти к следующему"""
+        if (char := self._peek()) is None:
+            raise ValueError('выражение неожиданно закончилось')
+
+        self.pos += 1
+
+        return char
+
+    def _alternation(self) -> Generator:
+        """Разобрать альтернативы, разделенные |"""
+        branches, random = [self._sequence()], self.random
+
+        while self._peek() == '|':
+            self.pos += 1
+            branches.append(self._sequence())
+
+        return branches[0] if len(branches) == 1 else lambda: random.choice(branches)()
+
+    def _sequence(self) -> Generator:
+        """Разобрать последовательность элементов с повторами до | или )"""
+        parts = []
+
+        while (char := self._peek()) is not None and char not in '|)':
+            if (atom := self._atom()) is not None:
+                parts.append(self._repeat(atom=atom))
+
+        return lambda: ''.join(part() for part in parts)
+
+    def _atom(self) -> Generator | None:
+        """Разобрать один элемент: символ, класс, группу или якорь. Для якорей возвращается None"""
+        random, char = self.random, self._take()
+
+        if char == '(':
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2
+            elif self.pattern.startswith('?P<', self.pos):
+                self.pos = self.pattern.index('>', self.pos) + 1
+            elif self._peek() == '?':
+                raise ValueError(f'группа (?{self.pattern[self.pos + 1:self.pos + 2]}...) не поддерживается')
+
+            value = self._alternation()
+
+            if self._take() != ')':
+                raise ValueError('не закрыта группа')
+
+            return value
+
+        if char == '[':
+            chars = self._charset()
+            return lambda: random.choice(chars)
+
+        if char == '.':
+            return lambda: random.choice(PATTERN_ALPHABET)
+
+        if char in '^$':
+            return None
+
+        if char in '*+?':
+            raise ValueError(f'повтор "{char}" без элемента в позиции {self.pos - 1}')
+
+        if char == '\\':
+            if (escaped := self._take()) in PATTERN_CATEGORIES:
+                return lambda chars=PATTERN_CATEGORIES[escaped]: random.choice(chars)
+
+            if escaped in PATTERN_ANCHORS:
+                return None
+
+            if escaped.isdigit():
+                raise ValueError('обратные ссылки не поддерживаются')
+
+            char = PATTERN_ESCAPES.get(escaped, escaped)
+
+        return lambda: char
+
+    def _repeat(self, atom: Generator) -> Generator:
+        """Применить к элементу повтор *, +, ?, {n}, {n,}, {n,m}, повторы без верхней границы ограничены PATTERN_REPEAT
+
+        Args:
+            atom: генератор элемента
+        """
+        char, random = self._peek(), self.random
+
+        if char in ('*', '+', '?'):
+            self.pos += 1
+            low, high = {'*': (0, None), '+': (1, None), '?': (0, 1)}[char]
+
+        elif char == '{' and (found := match(r'\{(\d*)(,?)(\d*)}', self.pattern[self.pos:])):
+            self.pos += found.end()
+            low = int(found.group(1) or 0)
+            high = int(found.group(3)) if found.group(3) else None if found.group(2) else low
+
+        else:
+            return atom
+
+        if self._peek() in ('?', '+'):  # ленивые и притяжательные повторы генерируются так же
+            self.pos += 1
+
+        high = low + PATTERN_REPEAT if high is None else high
+
+        return lambda: ''.join(atom() for _ in range(random.randint(low, high)))
+
+    def _charset(self) -> list[str]:
+        """Разобрать класс символов после [, например [a-z\\d_] или [^0-9]"""
+        chars, negate = set(), self._peek() == '^'
+        self.pos += negate
+        is_first = True
+
+        while (char := self._take()) != ']' or is_first:
+            is_first = False
+
+            if char == '\\':
+                if (escaped := self._take()) in PATTERN_CATEGORIES:
+                    chars.update(PATTERN_CATEGORIES[escaped])
+                    continue
+
+                char = PATTERN_ESCAPES.get(escaped, escaped)
+
+            if self._peek() == '-' and self.pattern[self.pos + 1:self.pos + 2] not in ('', ']'):
+                self.pos += 1
+
+                if (end := self._take()) == '\\':
+                    end = PATTERN_ESCAPES.get(escaped := self._take(), escaped)
+
+                chars.update(map(chr, range(ord(char), ord(end) + 1)))
+            else:
+                chars.add(char)
+
+        if not (result := sorted(set(PATTERN_ALPHABET) - chars if negate else chars)):
+            raise ValueError('класс символов пуст')
+
+        return result
+
+
+class ModelFactory:
+    """Фабрика экземпляров pydantic моделей. План генерации компилируется один раз на модель"""
+
+    def __init__(self, generator: RandomGenerator = default_generator, none_rate: float = 0.0):
+        """
+
+        Args:
+            generator: генератор случайных данных;
+            none_rate: вероятность None для необязательных (Optional) полей.
+        """
+        self.generator, self.none_rate = generator, none_rate
+        self.random = generator.random
+        self._fields: dict[type[BaseModel], list[tuple[str, str, Generator]]] = {}
+        self._plans: dict[type[BaseModel], Generator] = {}
+        self._adapters: dict[type[BaseModel], TypeAdapter] = {}
+        self._compiling: set[type[BaseModel]] = set()
+        self._recursive = 0
+        self._local = local()
+
+    def get_fields(self, model: type[BaseModel]) -> list[tuple[str, str, Generator]]:
+        """Получить скомпилированные генераторы полей модели: имя поля, ключ в данных и генератор
+
+        Args:
+            model: класс модели
+        """
+        if (fields := self._fields.get(model)) is None:
+            logger.debug(f'Компиляция плана генерации модели {model.__name__}')
+            self._compiling.add(model)
+
+            try:
+                fields = self._fields[model] = [
+                    (name, field.alias or name, self._compile_field(name=name, field=field))
+                    for name, field in model.model_fields.items()
+                ]
+
+            finally:
+                self._compiling.discard(model)
+
+        return fields
+
+    def get_plan(self, model: type[BaseModel]) -> Generator:
+        """Получить скомпилированный план генерации данных модели
+
+        Args:
+            model: класс модели
+        """
+        if (plan := self._plans.get(model)) is None:
+            fields = self.get_fields(model=model)
+
+            if issubclass(model, RootModel):
+                plan = fields[0][2]
+            else:
+                plan = lambda: {key: func() for _, key, func in fields}  # noqa: E731
+
+            self._plans[model] = plan
+
+        return plan
+
+    def _compile_field(self, name: str, field: FieldInfo) -> Generator:
+        """Скомпилировать генератор значения поля модели
+
+        Args:
+            name: имя поля;
+            field: описание поля.
+        """
+        return self._compile_type(annotation=field.annotation, constraints=self._get_constraints(field.metadata), name=name)
+
+    @staticmethod
+    def _get_constraints(metadata: list | tuple) -> dict[str, Any]:
+        """Получить ограничения поля из метаданных pydantic и annotated_types
+
+        Args:
+            metadata: метаданные поля
+        """
+        constraints = {}
+
+        for item in metadata:
+            if isinstance(item, FieldInfo):
+                constraints.update(ModelFactory._get_constraints(item.metadata))
+                continue
+
+            for constraint in CONSTRAINTS:
+                if (value := getattr(item, constraint, None)) is not None:
+                    constraints[constraint] = value
+
+        return constraints
+
+    def _compile_type(self, annotation: Any, constraints: dict[str, Any], name: str = '') -> Generator:
+        """Скомпилировать генератор значения по аннотации типа
+
+        Args:
+            annotation: аннотация типа;
+            constraints: ограничения значения;
+            name: имя поля для подбора осмысленных значений строк.
+        """
+        origin, args = get_origin(annotation), get_args(annotation)
+        random = self.random
+
+        if origin is Annotated:
+            return self._compile_type(args[0], {**constraints, **self._get_constraints(args[1:])}, name=name)
+
+        if origin in (Union, UnionType):
+            recursive = self._recursive
+            value = self._compile_type(next(arg for arg in args if arg is not NoneType), constraints, name=name)
+
+            if NoneType not in args:
+                return value
+
+            if recursive != self._recursive:  # значение ссылается на модель, которая еще компилируется
+                return self._compile_fallback(value=value, fallback=lambda: None)
+
+            return lambda: None if random.random() < self.none_rate else value()
+
+        if origin is Literal:
+            return lambda: random.choice(args)
+
+        if origin in (list, set, frozenset, tuple):
+            return self._compile_collection(origin=origin, args=args, constraints=constraints)
+
+        if origin is dict:
+            key, value = self._compile_type(args[0], {}), self._compile_type(args[1], {})
+            return lambda: {key(): value() for _ in range(COLLECTION_LENGTH)}
+
+        if isinstance(annotation, type):
+            if issubclass(annotation, BaseModel):
+                if annotation in self._compiling:
+                    return self._compile_recursive(model=annotation)
+
+                return self.get_plan(annotation)
+
+            if issubclass(annotation, Enum):
+                members = list(annotation)
+                return lambda: random.choice(members).value
+
+            if issubclass(annotation, bool):
+                return lambda: random.random() < 0.5
+
+            if issubclass(annotation, int):
+                return self._compile_int(constraints=constraints)
+
+            if issubclass(annotation, (float, Decimal)):
+                return self._compile_number(annotation=annotation, constraints=constraints)
+
+            if issubclass(annotation, EmailStr):
+                return self.generator.email
+
+            if issubclass(annotation, AnyUrl):
+                return lambda: f'https://{"".join(random.choices(ascii_lowercase, k=8))}.ru/{random.randint(1, MAX_INT)}'
+
+            if issubclass(annotation, str):
+                return self._compile_str(constraints=constraints, name=name)
+
+            if issubclass(annotation, bytes):
+                string = self._compile_str(constraints=constraints, name=name)
+                return lambda: string().encode()
+
+            if issubclass(annotation, UUID):
+                return lambda: UUID(int=random.getrandbits(128), version=4)
+
+            if issubclass(annotation, datetime):
+                return lambda: datetime(2000, 1, 1) + timedelta(seconds=random.randint(0, 40 * 365 * 24 * 3600))
+
+            if issubclass(annotation, date):
+                return lambda: date(2000, 1, 1) + timedelta(days=random.randint(0, 40 * 365))
+
+            if issubclass(annotation, time):
+                return lambda: time(random.randint(0, 23), random.randint(0, 59), random.randint(0, 59))
+
+        if annotation is Any:
+            return self.generator.string
+
+        raise TypeError(f'Тип {annotation} поля "{name}" не поддерживается фабрикой моделей, передайте значение явно')
+
+    def _compile_collection(self, origin: type, args: tuple, constraints: dict[str, Any]) -> Generator:
+        """Скомпилировать генератор коллекции
+
+        Args:
+            origin: тип коллекции;
+            args: аргументы типа коллекции;
+            constraints: ограничения длины.
+        """
+        if origin is tuple and args and args[-1] is not Ellipsis:
+            items = [self._compile_type(arg, {}) for arg in args]
+            return lambda: tuple(item() for item in items)
+
+        recursive = self._recursive
+        item = self._compile_type(args[0], {}) if args else self.generator.string
+        low = constraints.get('min_length', 0)
+        high = constraints.get('max_length', max(low, COLLECTION_LENGTH))
+        random = self.random
+        collection = lambda: origin(  # noqa: E731
+            item() for _ in range(random.randint(max(low, min(COLLECTION_LENGTH, high)), high))
+        )
+
+        if recursive != self._recursive and not low:  # элементы ссылаются на модель, которая еще компилируется
+            return self._compile_fallback(value=collection, fallback=origin)
+
+        return collection
+
+    def _compile_recursive(self, model: type[BaseModel]) -> Generator:
+        """Скомпилировать ссылку на модель, план которой еще компилируется. План берется при генерации,
+        глубина вложенности ограничена MAX_DEPTH
+
+        Args:
+            model: класс модели
+        """
+        self._recursive += 1
+        state = self._local
+
+        def recursive():
+            if (depth := getattr(state, 'depth', 0)) >= MAX_DEPTH:
+                raise DepthExceeded(model.__name__)
+
+            state.depth = depth + 1
+
+            try:
+                return self.get_plan(model)()
+
+            finally:
+                state.depth = depth
+
+        return recursive
+
+    @staticmethod
+    def _compile_fallback(value: Generator, fallback: Generator) -> Generator:
+        """Скомпилировать генератор, который возвращает пустое значение при превышении глубины рекурсивной модели
+
+        Args:
+            value: генератор значения;
+            fallback: генератор пустого значения: None или пустая коллекция.
+        """
+        def guarded():
+            try:
+                return value()
+
+            except DepthExceeded:
+                return fallback()
+
+        return guarded
+
+    def _compile_int(self, constraints: dict[str, Any]) -> Generator:
+        """Скомпилировать генератор целого числа с учетом ограничений
+
+        Args:
+            constraints: ограничения значения
+        """
+        low = constraints['ge'] if 'ge' in constraints else constraints['gt'] + 1 if 'gt' in constraints else None
+        high = constraints['le'] if 'le' in constraints else constraints['lt'] - 1 if 'lt' in constraints else None
+
+        if low is None:  # недостающая граница вычисляется от заданной
+            low = 1 if high is None or high >= 1 else high - MAX_INT
+
+        high = max(low, 0) + MAX_INT if high is None else high
+        random = self.random
+
+        if step_ := constraints.get('multiple_of'):
+            low, high = -(-low // step_), high // step_
+
+        if low > high:
+            raise ValueError(f'Ограничения {constraints} не допускают ни одного целого значения')
+
+        if step_:
+            return lambda: random.randint(low, high) * step_
+
+        return lambda: random.randint(low, high)
+
+    def _compile_number(self, annotation: type, constraints: dict[str, Any]) -> Generator:
+        """Скомпилировать генератор дробного числа с учетом ограничений. Значения выбираются из сетки с шагом
+        10 ** -decimal_places внутри границ. Если decimal_places не задан и границы уже шага 0.01, шаг уменьшается
+
+        Args:
+            annotation: float или Decimal;
+            constraints: ограничения значения.
+        """
+        places, digits = constraints.get('decimal_places', 2), constraints.get('max_digits')
+        low, high = constraints.get('ge', constraints.get('gt')), constraints.get('le', constraints.get('lt'))
+
+        if low is None:  # недостающая граница вычисляется от заданной
+            low = 0 if high is None or high > 0 else Decimal(str(high)) - MAX_INT
+
+        low = Decimal(str(low))
+        high = low + MAX_INT if high is None else Decimal(str(high))
+
+        while True:
+            scale, bottom, top = Decimal(10) ** places, low, high
+
+            if digits is not None:
+                limit = Decimal(10) ** (digits - places) - Decimal(10) ** -places
+                bottom, top = max(bottom, -limit), min(top, limit)
+
+            first = int((bottom * scale).to_integral_value(ROUND_CEILING))
+            last = int((top * scale).to_integral_value(ROUND_FLOOR))
+            first += 'gt' in constraints and first == bottom * scale
+            last -= 'lt' in constraints and last == top * scale
+
+            if first <= last or 'decimal_places' in constraints or places >= MAX_PLACES:
+                break
+
+            places += 1
+
+        if first > last:
+            raise ValueError(
+                f'Ограничения {constraints} не допускают ни одного значения с {places} знаками после запятой'
+            )
+
+        random = self.random
+
+        if annotation is Decimal:
+            return lambda: Decimal(random.randint(first, last)).scaleb(-places)
+
+        return lambda: random.randint(first, last) / 10 ** places
+
+    def _compile_str(self, constraints: dict[str, Any], name: str) -> Generator:
+        """Скомпилировать генератор строки с учетом ограничений длины и имени поля
+
+        Args:
+            constraints: ограничения значения;
+            name: имя поля.
+        """
+        low, high = constraints.get('min_length', 1), constraints.get('max_length')
+
+        if pattern := constraints.get('pattern'):
+            return self._compile_pattern(pattern=pattern, name=name, low=low, high=high)
+        semantic = {
+            'email': self.generator.email,
+            'first_name': lambda: self.generator.name(name=NameEnum.FIRST_NAME),
+            'last_name': lambda: self.generator.name(name=NameEnum.LAST_NAME),
+            'name': self.generator.name,
+            'full_name': self.generator.name,
+            'job': self.generator.job,
+            'occupation': self.generator.job
+        }.get(name.lower())
+
+        random, length = self.random, high or max(low, 10)
+        string = lambda: self.generator.string(length=random.randint(low, length) if low < length else length)  # noqa
+
+        if semantic and 'min_length' not in constraints and high is None:
+            return semantic
+
+        if semantic:  # значение по имени поля, если оно укладывается в ограничения длины, иначе случайная строка
+            return lambda: value if low <= len(value := semantic()) <= (high or len(value)) else string()
+
+        return string
+
+    def _compile_pattern(self, pattern: str, name: str, low: int, high: int | None) -> Generator:
+        """Скомпилировать генератор строки по регулярному выражению. Поддерживаются символы, классы, группы,
+        альтернативы и повторы, повторы без верхней границы ограничены PATTERN_REPEAT
+
+        Args:
+            pattern: регулярное выражение;
+            name: имя поля;
+            low: минимальная длина строки;
+            high: максимальная длина строки.
+        """
+        try:
+            compile_regex(pattern)
+            value = PatternParser(pattern=pattern, random=self.random).parse()
+
+        except (RegexError, ValueError) as e:
+            raise TypeError(f'Поле "{name}": pattern {pattern} не поддерживается ({e}), передайте значение явно') from e
+
+        if low <= 1 and high is None:
+            return value
+
+        def sized():
+            for _ in range(PATTERN_ATTEMPTS):
+                if low <= len(result := value()) <= (high or len(result)):
+                    return result
+
+            raise ValueError(f'Поле "{name}": не удалось сгенерировать строку по {pattern} длиной {low}..{high}')
+
+        return sized
+
+    def _adapter(self, model: type[BaseModel]) -> TypeAdapter:
+        """Получить адаптер валидации списка экземпляров модели
+
+        Args:
+            model: класс модели
+        """
+        if (adapter := self._adapters.get(model)) is None:
+            adapter = self._adapters[model] = TypeAdapter(list[model])
+
+        return adapter
+
+    def build_dict(self, model: type[BaseModel], **overrides) -> Any:
+        """Сгенерировать данные модели без валидации
+
+        Args:
+            model: класс модели;
+            **overrides: значения полей, которые нужно задать явно.
+        """
+        return self._build_data(model=model, overrides=overrides)
+
+    def build(self, model: type[BaseModel], **overrides) -> BaseModel:
+        """Сгенерировать валидный экземпляр модели
+
+        Args:
+            model: класс модели;
+            **overrides: значения полей, которые нужно задать явно.
+        """
+        result = model.model_validate(self._build_data(model=model, overrides=overrides))
+        logger.debug(f'Сгенерирован экземпляр модели {model.__name__}: {result}')
+
+        return result
+
+    @step('Фабрика моделей. Сгенерировать набор экземпляров модели')
+    def build_batch(self, model: type[BaseModel], count: int, **overrides) -> list[BaseModel]:
+        """Сгенерировать набор валидных экземпляров модели одной валидацией
+
+        Args:
+            model: класс модели;
+            count: количество экземпляров;
+            **overrides: значения полей, одинаковые для всех экземпляров.
+        """
+        result = self._adapter(model).validate_python(
+            [self._build_data(model=model, overrides=overrides) for _ in range(count)]
+        )
+        logger.info(f'Сгенерировано {count} экземпляров модели {model.__name__}. Пример: {result[:1]}')
+
+        return result
+
+    def _build_data(self, model: type[BaseModel], overrides: dict[str, Any]) -> Any:
+        """Сгенерировать данные модели, не вызывая генераторы полей из overrides
+
+        Args:
+            model: класс модели;
+            overrides: значения полей.
+        """
+        if not overrides or issubclass(model, RootModel):
+            return overrides.get('root') if 'root' in overrides else self.get_plan(model)()
+
+        return {
+            key: overrides[name] if name in overrides else overrides[key] if key in overrides else func()
+            for name, key, func in self.get_fields(model=model)
+        }
+
+
+model_factory = ModelFactory()
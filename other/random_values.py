@@ -1,14 +1,19 @@
 from enum import Enum
-from random import randint
+from random import Random
 from string import ascii_lowercase, digits
+from typing import Any, Callable, TYPE_CHECKING
 
 from allure import step
-from mimesis import Person, Locale
-from mimesis.random import Random
 
 from other.logging import logger
 
+if TYPE_CHECKING:
+    from mimesis import Locale, Person
+
 msg = 'ГЕНЕРАТОР {gen}.\nРЕЗУЛЬТАТ: {result}'
+batch_msg = 'ГЕНЕРАТОР {gen}. КОЛИЧЕСТВО: {count}.\nПРИМЕР: {result}'
+STRING_SEQ = f'абвгдеёжзийклмнопрстуфхцчшщьыъэюя{ascii_lowercase}{digits}'
+EMAIL_DOMAINS = ('mail.ru', 'gmail.com', 'yandex.ru')
 
 
 class NameEnum(Enum):
@@ -18,6 +23,184 @@ class NameEnum(Enum):
     FIRST_NAME = 'first_name'
 
 
+class RandomGenerator:
+    """ Генератор случайных данных с кэшем провайдеров mimesis по локали и воспроизводимым seed """
+
+    def __init__(self, seed: Any = None):
+        """
+
+        Args:
+            seed: начальное значение генератора, None - случайное
+        """
+        self._seed = seed
+        self._random = Random(seed)
+        self._persons: dict['Locale', 'Person'] = {}
+
+    @property
+    def random(self) -> Random:
+        """ Получить экземпляр Random генератора """
+        return self._random
+
+    def seed(self, value: Any):
+        """ Задать seed генератора и всех созданных провайдеров
+
+        Args:
+            value: начальное значение генератора
+        """
+        self._seed = value
+        self._random.seed(value)
+
+        for locale, person in self._persons.items():
+            person.reseed(None if value is None else f'{value}:{locale}')
+
+        logger.debug(f'Установлен seed генератора случайных данных: {value}')
+
+    def person(self, locale: 'Locale | None' = None) -> 'Person':
+        """ Получить провайдер Person для локали. Провайдер создается один раз на локаль
+
+        Args:
+            locale: локаль, по умолчанию EN
+        """
+        from mimesis import Locale, Person
+
+        locale = locale or Locale.EN
+
+        if (person := self._persons.get(locale)) is None:
+            person = self._persons[locale] = Person(
+                locale=locale, seed=None if self._seed is None else f'{self._seed}:{locale}'
+            )
+
+        return person
+
+    def number(self, start: int = 1, end: int = 999999, length: int | None = None) -> int:
+        """ Получить случайное число в заданном диапазоне или заданной длины
+
+        Args:
+            start: начало диапазона;
+            end: конец диапазона;
+            length: длина числа.
+        """
+        return self._random.randint(10 ** (length - 1), (10 ** length) - 1) if length else self._random.randint(start, end)
+
+    def string(self, length: int = 10) -> str:
+        """ Получить случайную строку
+
+        Args:
+            length: длина строки
+        """
+        return ''.join(self._random.choices(STRING_SEQ, k=length))
+
+    def name(self, name: NameEnum = NameEnum.FULL_NAME) -> str:
+        """ Получить случайное имя
+
+        Args:
+            name: тип имени(полное имя, имя или фамилия)
+        """
+        return getattr(self.person(), name.value)()
+
+    def job(self) -> str:
+        """ Получить случайную работу """
+        return self.person().occupation()
+
+    def email(self, domains: tuple[str, ...] = EMAIL_DOMAINS) -> str:
+        """ Получить случайный e-mail
+
+        Args:
+            domains: набор доменов
+        """
+        from mimesis import Locale
+
+        return self.person(Locale.RU).email(domains=domains)
+
+    @step('Генератор. Получить набор случайных чисел')
+    def numbers(self, count: int, start: int = 1, end: int = 999999, length: int | None = None) -> list[int]:
+        """ Получить набор случайных чисел
+
+        Args:
+            count: количество значений;
+            start: начало диапазона;
+            end: конец диапазона;
+            length: длина числа.
+        """
+        result = [self.number(start=start, end=end, length=length) for _ in range(count)]
+        logger.info(batch_msg.format(gen='случайных чисел', count=count, result=result[:3]))
+
+        return result
+
+    @step('Генератор. Получить набор случайных строк')
+    def strings(self, count: int, length: int = 10) -> list[str]:
+        """ Получить набор случайных строк
+
+        Args:
+            count: количество значений;
+            length: длина строки.
+        """
+        result = [self.string(length=length) for _ in range(count)]
+        logger.info(batch_msg.format(gen='случайных строк', count=count, result=result[:3]))
+
+        return result
+
+    @step('Генератор. Получить набор случайных имен')
+    def names(self, count: int, name: NameEnum = NameEnum.FULL_NAME) -> list[str]:
+        """ Получить набор случайных имен
+
+        Args:
+            count: количество значений;
+            name: тип имени(полное имя, имя или фамилия).
+        """
+        method = getattr(self.person(), name.value)
+        result = [method() for _ in range(count)]
+        logger.info(batch_msg.format(gen='случайных имен', count=count, result=result[:3]))
+
+        return result
+
+    @step('Генератор. Получить набор случайных работ')
+    def jobs(self, count: int) -> list[str]:
+        """ Получить набор случайных работ
+
+        Args:
+            count: количество значений
+        """
+        result = [self.job() for _ in range(count)]
+        logger.info(batch_msg.format(gen='случайных работ', count=count, result=result[:3]))
+
+        return result
+
+    @step('Генератор. Получить набор случайных e-mail')
+    def emails(self, count: int, domains: tuple[str, ...] = EMAIL_DOMAINS) -> list[str]:
+        """ Получить набор случайных e-mail
+
+        Args:
+            count: количество значений;
+            domains: набор доменов.
+        """
+        result = [self.email(domains=domains) for _ in range(count)]
+        logger.info(batch_msg.format(gen='случайных почт', count=count, result=result[:3]))
+
+        return result
+
+    @step('Генератор. Получить набор случайных записей')
+    def records(
+            self,
+            count: int,
+            fields: dict[str, Callable[['RandomGenerator'], Any]] | None = None
+    ) -> list[dict[str, Any]]:
+        """ Получить набор случайных записей
+
+        Args:
+            count: количество записей;
+            fields: поля записи и функции генерации значения, по умолчанию имя, работа и e-mail.
+        """
+        fields = fields or {'name': RandomGenerator.name, 'job': RandomGenerator.job, 'email': RandomGenerator.email}
+        result = [{field: func(self) for field, func in fields.items()} for _ in range(count)]
+        logger.info(batch_msg.format(gen='случайных записей', count=count, result=result[:1]))
+
+        return result
+
+
+generator = RandomGenerator()
+
+
 @step('Генератор. Получить случайное число')
 def get_random_number(start: int = 1, end: int = 999999, length: int | None = None) -> int:
     """ Получить случайное число в заданном диапазоне или заданной длины
@@ -27,7 +210,7 @@ def get_random_number(start: int = 1, end: int = 999999, length: int | None = No
         end: конец диапазона;
         length: длина числа.
     """
-    result = randint(10 ** (length - 1), (10 ** length) - 1) if length else randint(start, end)
+    result = generator.number(start=start, end=end, length=length)
     logger.info(msg.format(gen='случайного числа', result=result))
 
     return result
@@ -40,10 +223,7 @@ def get_random_string(length: int = 10):
     Args:
         length: длина строки
     """
-    result = Random()._generate_string(
-        str_seq=f'абвгдеёжзийклмнопрстуфхцчшщьыъэюя{ascii_lowercase}{digits}',
-        length=length
-    )
+    result = generator.string(length=length)
     logger.info(msg.format(gen='cлучайной строки', result=result))
 
     return result
@@ -55,7 +235,7 @@ def get_random_name(name: NameEnum = NameEnum.FULL_NAME) -> str:
     Args:
         name: тип имени(полное имя, имя или фамилия)
     """
-    result = getattr(Person(Locale.EN), name.value)()
+    result = generator.name(name=name)
 
     logger.info(msg.format(gen='случайного имени', result=result))
 
@@ -64,20 +244,20 @@ def get_random_name(name: NameEnum = NameEnum.FULL_NAME) -> str:
 
 def get_random_job() -> str:
     """ Получить случайную работу"""
-    result = Person(Locale.EN).occupation()
+    result = generator.job()
 
     logger.info(msg.format(gen='случайной работы', result=result))
 
     return result
 
 
-def get_random_email(domains: tuple[str] = ('mail.ru', 'gmail.com', 'yandex.ru')) -> str:
+def get_random_email(domains: tuple[str] = EMAIL_DOMAINS) -> str:
     """ Получить случайный e-mail
 
     Args:
         domains: набор доменов
     """
-    result = Person(locale=Locale.RU).email(domains=domains)
+    result = generator.email(domains=domains)
 
     logger.info(msg.format(gen='случайной почты', result=result))
 
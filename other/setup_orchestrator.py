@@ -0,0 +1,208 @@
+"""Параллельное выполнение независимых шагов подготовки теста
+
+Шаги подготовки (создание данных через API, получение токенов, открытие страниц) объявляются с зависимостями и
+выполняются параллельно. Шаги без флага main_thread выполняются в фоновых потоках. Объекты Sync API Playwright
+привязаны к потоку, в котором запущен драйвер, поэтому шаги с браузером помечаются main_thread=True и
+выполняются в вызывающем потоке, пока фоновые шаги работают параллельно с ними.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from json import dumps
+from threading import current_thread
+from time import perf_counter
+from typing import Any, Callable
+
+from allure import attach, attachment_type, step
+
+from other.logging import logger
+
+
+class SetupError(Exception):
+    """Исключение при падении шагов подготовки теста с указанием упавших шагов"""
+
+    def __init__(self, errors: dict[str, BaseException], skipped: list[str] | None = None):
+        self.errors, self.skipped = errors, skipped or []
+
+    def __str__(self):
+        errors = '\n'.join(f'  {name}: {type(e).__name__}: {e}' for name, e in self.errors.items())
+        skipped = f'\nНе выполнены из-за зависимостей: {", ".join(self.skipped)}' if self.skipped else ''
+
+        return f'Упали шаги подготовки теста:\n{errors}{skipped}'
+
+
+@dataclass(slots=True)
+class SetupStep:
+    """Шаг подготовки теста"""
+    name: str
+    func: Callable[..., Any]
+    args: tuple = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    depends: tuple[str, ...] = ()
+    main_thread: bool = False
+
+
+class SetupOrchestrator:
+    """Планировщик шагов подготовки: запускает шаг, как только выполнены его зависимости"""
+
+    def __init__(self, max_workers: int = 8):
+        """
+
+        Args:
+            max_workers: максимальное количество фоновых потоков
+        """
+        self.max_workers = max_workers
+        self.steps: dict[str, SetupStep] = {}
+        self.results: dict[str, Any] = {}
+        self.timings: list[dict[str, Any]] = []
+
+    def add(
+            self,
+            name: str,
+            func: Callable[..., Any],
+            *args,
+            depends: list[str] | tuple[str, ...] = (),
+            main_thread: bool = False,
+            **kwargs
+    ) -> 'SetupOrchestrator':
+        """Добавить шаг подготовки. Результаты зависимостей передаются в шаг именованными аргументами
+        с именами шагов
+
+        Args:
+            name: имя шага;
+            func: функция шага;
+            *args: позиционные аргументы функции;
+            depends: имена шагов, результаты которых нужны шагу;
+            main_thread: выполнить шаг в вызывающем потоке, обязательно для шагов с Playwright;
+            **kwargs: именованные аргументы функции.
+        """
+        if name in self.steps:
+            raise ValueError(f'Шаг подготовки "{name}" уже добавлен')
+
+        if unknown := [dependency for dependency in depends if dependency not in self.steps]:
+            raise ValueError(f'Шаг подготовки "{name}" зависит от неизвестных шагов: {", ".join(unknown)}')
+
+        self.steps[name] = SetupStep(
+            name=name, func=func, args=args, kwargs=kwargs, depends=tuple(depends), main_thread=main_thread
+        )
+
+        return self
+
+    def _call(self, setup_step: SetupStep, start: float) -> Any:
+        """Выполнить шаг и сохранить его тайминг
+
+        Args:
+            setup_step: шаг подготовки;
+            start: время начала подготовки.
+        """
+        kwargs = setup_step.kwargs | {dependency: self.results[dependency] for dependency in setup_step.depends}
+        begin, status = perf_counter(), 'passed'
+
+        try:
+            return setup_step.func(*setup_step.args, **kwargs)
+
+        except BaseException:
+            status = 'failed'
+            raise
+
+        finally:
+            self.timings.append({
+                'step': setup_step.name,
+                'thread': current_thread().name,
+                'start': round(begin - start, 3),
+                'duration': round(perf_counter() - begin, 3),
+                'status': status
+            })
+
+    def run(self, timeout: float | None = None) -> dict[str, Any]:
+        """Выполнить шаги подготовки и дождаться всех результатов. Возвращает результаты шагов по именам.
+        Таймаут проверяется перед запуском каждого шага основного потока и при ожидании фоновых шагов, но запущенные
+        шаги не прерываются: шаг основного потока выполняется до конца, а фоновые шаги после таймаута продолжают
+        работать в своих потоках, их результаты не используются
+
+        Args:
+            timeout: максимальное время подготовки в секундах
+        """
+        pending, start = dict(self.steps), perf_counter()
+        futures: dict[Future, str] = {}
+        errors: dict[str, BaseException] = {}
+        skipped: list[str] = []
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='setup')
+
+        try:
+            with step(f'Подготовка теста: {", ".join(self.steps)}'):
+                while pending or futures:
+                    main_steps = []
+
+                    for name, setup_step in list(pending.items()):
+                        if any(dependency in errors or dependency in skipped for dependency in setup_step.depends):
+                            skipped.append(pending.pop(name).name)
+
+                        elif all(dependency in self.results for dependency in setup_step.depends):
+                            del pending[name]
+
+                            if setup_step.main_thread:
+                                main_steps.append(setup_step)
+                            else:
+                                futures[executor.submit(self._call, setup_step, start)] = name
+
+                    if main_steps:
+                        # фоновые шаги уже запущены, шаги основного потока выполняются параллельно с ними
+                        setup_step, pending = main_steps[0], {other.name: other for other in main_steps[1:]} | pending
+
+                        if timeout is not None and perf_counter() - start >= timeout:
+                            errors[setup_step.name] = TimeoutError(f'Шаг не запущен, подготовка дольше {timeout} с')
+                            errors |= {
+                                name: TimeoutError(f'Шаг не выполнен за {timeout} с') for name in futures.values()
+                            }
+                            skipped.extend(pending)
+                            break
+
+                        try:
+                            self.results[setup_step.name] = self._call(setup_step=setup_step, start=start)
+
+                        except Exception as e:
+                            errors[setup_step.name] = e
+
+                        continue
+
+                    remaining = None if timeout is None else timeout - (perf_counter() - start)
+                    done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+
+                    if not done:
+                        errors |= {
+                            futures[future]: TimeoutError(f'Шаг не выполнен за {timeout} с') for future in futures
+                        }
+                        skipped.extend(pending)
+                        break
+
+                    for future in done:
+                        name = futures.pop(future)
+
+                        if (error := future.exception()) is None:
+                            self.results[name] = future.result()
+                        else:
+                            errors[name] = error
+
+        finally:
+            executor.shutdown(wait=not errors, cancel_futures=True)
+            self._attach_timings(elapsed=perf_counter() - start)
+
+        if errors:
+            logger.error(str(error := SetupError(errors=errors, skipped=skipped)))
+            raise error from next(iter(errors.values()))
+
+        return self.results
+
+    def _attach_timings(self, elapsed: float):
+        """Залогировать и прикрепить в отчет тайминги шагов подготовки
+
+        Args:
+            elapsed: время подготовки в секундах
+        """
+        serial = sum(timing['duration'] for timing in self.timings)
+        logger.info(f'Подготовка теста выполнена за {elapsed:.3f} с, последовательно заняла бы {serial:.3f} с')
+        attach(
+            body=dumps(sorted(self.timings, key=lambda timing: timing['start']), indent=2),
+            name='SETUP STEPS',
+            attachment_type=attachment_type.JSON
+        )
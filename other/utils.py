@@ -1,4 +1,5 @@
 from json import dumps
+from pathlib import Path
 from typing import Any
 
 from allure import attach, attachment_type, step
@@ -13,7 +14,8 @@ def get_curl(
         request: PreparedRequest,
         is_compressed: bool = False,
         is_insecure: bool = False,
-        is_breaks: bool = False
+        is_breaks: bool = False,
+        body_path: Path | None = None
 ) -> str:
     """Получить curl запроса
 
@@ -22,6 +24,7 @@ def get_curl(
         is_compressed: параметр позволяющий сформировать curl для запроса сжатого ответа;
         is_insecure: параметр явно позволяет сформировать curl для "небезопасного" SSL соединения и передачи данных;
         is_breaks: вернуть курл с переносами
+        body_path: файл с телом запроса, на который ссылается curl вместо тела
     """
     sep = ' ' if not is_breaks else '\n'
     body = request.body
@@ -29,6 +32,7 @@ def get_curl(
     curl_attrs = [
         f'curl -X {request.method}',
         sep.join([f'-H "{k}: {v}"' for k, v in request.headers.items()]),
+        f'--data-binary "@{body_path}"' if body_path else
         f'-d "{body.decode("latin-1") if isinstance(body, bytes) else body}"' if body else '',
         '--compressed ' if is_compressed else '',
         '--insecure ' if is_insecure else '',
@@ -1,17 +1,20 @@
-from typing import Annotated
+from typing import Annotated, TYPE_CHECKING
 
 from _pytest.fixtures import SubRequest
-from allure import step, title
-from playwright.sync_api import Browser
+from allure import step
 from pytest import fixture
 
+from other.config import Config
 from other.logging import logger
 
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser
 
-@fixture(scope='session')
-@title('Открыть страницу')
-def open_page(request: SubRequest, browser: Annotated[Browser, fixture]):
-    """Открыть браузер и страницу.
+
+@fixture
+def open_page(request: SubRequest, browser: Annotated['Browser', fixture]):
+    """Открыть браузер и страницу. Страница живет всю сессию и открывается заново при смене страницы в параметрах
+    и после перезапуска браузера.
 
     Args:
         request: Подзапрос для получения данных из тестовой функции/фикстуры;
@@ -21,9 +24,12 @@ def open_page(request: SubRequest, browser: Annotated[Browser, fixture]):
         logger.error(msg := f'В фикстуру не переданы обязательные параметры через indirect: page')
         raise RuntimeError(msg)
 
-    with step(msg := f'Открыть страницу {param}'):
-        logger.info(msg)
-        page = param(browser=browser)
-        page.get()
+    if (page := Config.page_object) is None or type(page) is not param or page.browser is not browser:
+        with step(msg := f'Открыть страницу {param}'):
+            logger.info(msg)
+            Config.page_object = page = param(browser=browser)
+            page.get()
+
+    Config.page = page.page
 
-    yield page
+    return page
@@ -1,6 +1,9 @@
 """Модуль содержит конфиги для браузеров"""
+from dataclasses import dataclass
 
-TIMEOUT = 15000
+DEFAULT_TIMEOUT = 15000
+DEFAULT_PAGE_TIMEOUT = 30000
+TIMEOUT = DEFAULT_TIMEOUT
 
 
 class ChromeConfig:
@@ -11,4 +14,93 @@ class ChromeConfig:
         '--disable-gpu',
         '--no-sandbox',
         '--lang=ru-RU',
-    ]
\ No newline at end of file
+    ]
+    # ключи, которые Playwright добавляет при chromium.launch. Нужны при запуске процесса Chromium напрямую,
+    # версионный список --disable-features не переносится
+    playwright_options = [
+        '--disable-field-trial-config',
+        '--disable-background-networking',
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-back-forward-cache',
+        '--disable-breakpad',
+        '--disable-client-side-phishing-detection',
+        '--disable-component-extensions-with-background-pages',
+        '--disable-component-update',
+        '--no-default-browser-check',
+        '--disable-default-apps',
+        '--disable-dev-shm-usage',
+        '--disable-extensions',
+        '--allow-pre-commit-input',
+        '--disable-hang-monitor',
+        '--disable-ipc-flooding-protection',
+        '--disable-popup-blocking',
+        '--disable-prompt-on-repost',
+        '--disable-renderer-backgrounding',
+        '--force-color-profile=srgb',
+        '--metrics-recording-only',
+        '--no-first-run',
+        '--password-store=basic',
+        '--use-mock-keychain',
+        '--no-service-autorun',
+        '--export-tagged-pdf',
+        '--disable-search-engine-choice-screen',
+        '--unsafely-disable-devtools-self-xss-warnings',
+        '--enable-automation',
+        '--enable-unsafe-swiftshader'
+    ]
+    playwright_headless_options = [
+        '--headless',
+        '--hide-scrollbars',
+        '--mute-audio',
+        '--blink-settings=primaryHoverType=2,availableHoverTypes=2,primaryPointerType=4,availablePointerTypes=4'
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class ThrottlingProfile:
+    """Профиль эмуляции медленной сети и CPU
+
+    Args:
+        name: имя профиля;
+        latency: дополнительная задержка запроса в миллисекундах;
+        download: пропускная способность загрузки в байтах в секунду, -1 без ограничений;
+        upload: пропускная способность отправки в байтах в секунду, -1 без ограничений;
+        cpu_rate: коэффициент замедления CPU;
+        timeout_factor: множитель таймаутов ожидания.
+    """
+    name: str
+    latency: float = 0
+    download: float = -1
+    upload: float = -1
+    cpu_rate: float = 1
+    timeout_factor: float = 1
+
+
+THROTTLING_PROFILES = {
+    profile.name: profile for profile in (
+        ThrottlingProfile(name='3G', latency=300, download=750 * 1024 / 8, upload=250 * 1024 / 8, timeout_factor=4),
+        ThrottlingProfile(
+            name='slow-4G', latency=150, download=1.6 * 1024 * 1024 / 8, upload=750 * 1024 / 8, timeout_factor=2.5
+        ),
+        ThrottlingProfile(
+            name='fast-4G', latency=40, download=9 * 1024 * 1024 / 8, upload=9 * 1024 * 1024 / 8, timeout_factor=1.5
+        ),
+        ThrottlingProfile(name='4x CPU', cpu_rate=4, timeout_factor=2),
+        ThrottlingProfile(name='6x CPU', cpu_rate=6, timeout_factor=3),
+        ThrottlingProfile(
+            name='mobile', latency=150, download=1.6 * 1024 * 1024 / 8, upload=750 * 1024 / 8, cpu_rate=4,
+            timeout_factor=5
+        ),
+    )
+}
+
+
+def scale_timeout(factor: float = 1):
+    """Масштабировать таймаут ожидания элементов относительно DEFAULT_TIMEOUT
+
+    Args:
+        factor: множитель таймаута
+    """
+    global TIMEOUT
+    TIMEOUT = DEFAULT_TIMEOUT * factor
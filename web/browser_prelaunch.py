@@ -0,0 +1,136 @@
+"""Модуль для запуска Chromium параллельно со сбором тестов
+
+Объекты Sync API Playwright привязаны к потоку, в котором запущен драйвер, поэтому готовый Browser нельзя
+передать из фонового потока в фикстуру. Вместо этого фоновый поток запускает процесс Chromium с открытым
+портом отладки, а фикстура в основном потоке подключается к нему через connect_over_cdp, что быстрее запуска.
+"""
+from json import loads
+from os import environ
+from pathlib import Path
+from re import search
+from shutil import rmtree
+from subprocess import PIPE, Popen
+from sys import platform
+from tempfile import mkdtemp
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+from other.logging import logger
+from web.browser_config import ChromeConfig
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser
+    from playwright.sync_api._generated import Playwright as SyncPlaywright
+
+
+EXECUTABLE_PATTERNS = ('chrome-linux*/chrome', 'chrome-mac*/*.app/Contents/MacOS/*', 'chrome-win*/chrome.exe')
+
+
+def get_browsers_path() -> Path:
+    """Получить каталог браузеров Playwright с учетом PLAYWRIGHT_BROWSERS_PATH"""
+    import playwright
+
+    if (value := environ.get('PLAYWRIGHT_BROWSERS_PATH')) == '0':
+        return Path(playwright.__file__).parent / 'driver' / 'package' / '.local-browsers'
+
+    if value:
+        return Path(value)
+
+    if platform == 'win32':
+        return Path(environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local')) / 'ms-playwright'
+
+    if platform == 'darwin':
+        return Path.home() / 'Library' / 'Caches' / 'ms-playwright'
+
+    return Path(environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'ms-playwright'
+
+
+def get_executable_path() -> Path:
+    """Получить путь к Chromium установленной версии Playwright без запуска драйвера: ревизия браузера берется
+    из browsers.json пакета playwright
+    """
+    import playwright
+
+    browsers = loads((Path(playwright.__file__).parent / 'driver' / 'package' / 'browsers.json').read_text())
+    revision = next(browser['revision'] for browser in browsers['browsers'] if browser['name'] == 'chromium')
+    browser_dir = get_browsers_path() / f'chromium-{revision}'
+
+    for pattern in EXECUTABLE_PATTERNS:
+        if executable := next(browser_dir.glob(pattern), None):
+            return executable
+
+    raise FileNotFoundError(f'Chromium ревизии {revision} не найден в {browser_dir}, выполните playwright install')
+
+
+class BrowserPrelauncher:
+    """Класс для фонового запуска процесса Chromium и подключения к нему из фикстуры browser"""
+
+    def __init__(self, is_headless: bool, launch_timeout: float = 60):
+        """
+
+        Args:
+            is_headless: запуск в headless режиме;
+            launch_timeout: максимальное время ожидания запуска браузера в секундах.
+        """
+        self.is_headless, self.launch_timeout = is_headless, launch_timeout
+        self.ws_endpoint: str | None = None
+        self._ready = Event()
+        self._error: Exception | None = None
+        self._process: Popen | None = None
+        self._user_data_dir = Path(mkdtemp(prefix='prelaunch_chromium_'))
+        self._thread = Thread(target=self._launch, name='browser-prelaunch', daemon=True)
+
+    def start(self):
+        """Запустить браузер в фоновом потоке"""
+        logger.info('Фоновый запуск Chromium во время сбора тестов')
+        self._thread.start()
+
+    def _launch(self):
+        """Запустить процесс Chromium и дождаться адреса DevTools. Выполняется в фоновом потоке"""
+        try:
+            self._process = Popen(
+                [
+                    get_executable_path(),
+                    '--remote-debugging-port=0',
+                    f'--user-data-dir={self._user_data_dir}',
+                    *ChromeConfig.playwright_options,
+                    *(ChromeConfig.playwright_headless_options if self.is_headless else []),
+                    *ChromeConfig.default_options,
+                    'about:blank'
+                ],
+                stderr=PIPE,
+                text=True
+            )
+
+            for line in self._process.stderr:
+                if not self._ready.is_set() and (found := search(r'DevTools listening on (ws://\S+)', line)):
+                    self.ws_endpoint = found.group(1)
+                    self._ready.set()
+                    logger.info(f'Chromium запущен в фоне: {self.ws_endpoint}')
+
+        except Exception as e:
+            self._error = e
+
+        finally:
+            self._ready.set()
+
+    def connect(self, playwright: 'SyncPlaywright') -> 'Browser':
+        """Подключиться к запущенному в фоне браузеру. Вызывается в потоке, где работает Playwright
+
+        Args:
+            playwright: объект playwright основного потока
+        """
+        if not self._ready.wait(timeout=self.launch_timeout) or not self.ws_endpoint:
+            raise RuntimeError(f'Не удалось запустить Chromium в фоне: {self._error or "таймаут запуска"}')
+
+        logger.info(f'Подключение к запущенному в фоне Chromium: {self.ws_endpoint}')
+
+        return playwright.chromium.connect_over_cdp(self.ws_endpoint)
+
+    def stop(self):
+        """Остановить процесс браузера и удалить временный профиль"""
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+
+        rmtree(self._user_data_dir, ignore_errors=True)
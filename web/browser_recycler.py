@@ -0,0 +1,62 @@
+"""Перезапуск браузера между тестами по количеству тестов, контекстов или памяти процессов браузера
+
+Браузер и страница в фикстурах browser и open_page живут всю сессию и накапливают состояние, из-за чего длинные
+прогоны постепенно замедляются. Перезапуск выполняет фикстура browser перед тестом: браузер закрывается и
+запускается заново с теми же опциями, а фикстура open_page создает страницу заново для нового браузера.
+"""
+import os
+
+from other.logging import logger
+from web.resource_monitor import MB, get_tree_usage, is_supported
+
+
+class BrowserRecycler:
+    """Политика перезапуска браузера между тестами"""
+
+    def __init__(self, max_tests: int | None = None, max_contexts: int | None = None, rss_limit: float | None = None):
+        """
+
+        Args:
+            max_tests: количество тестов с браузером до перезапуска;
+            max_contexts: количество созданных контекстов до перезапуска;
+            rss_limit: порог RSS процессов браузера в мегабайтах.
+        """
+        self.max_tests, self.max_contexts = max_tests, max_contexts
+
+        if rss_limit and not is_supported():
+            logger.warning('Перезапуск браузера по памяти доступен только в Linux')
+            rss_limit = None
+
+        self.rss_limit = rss_limit
+        self.tests = self.contexts = self.restarts = 0
+
+    def on_test(self):
+        """Учесть тест, использующий браузер"""
+        self.tests += 1
+
+    def on_context(self):
+        """Учесть созданный контекст браузера"""
+        self.contexts += 1
+
+    def get_reason(self) -> str | None:
+        """Получить причину перезапуска браузера, None - перезапуск не нужен"""
+        if self.max_tests and self.tests >= self.max_tests:
+            return f'выполнено тестов: {self.tests}'
+
+        if self.max_contexts and self.contexts >= self.max_contexts:
+            return f'создано контекстов: {self.contexts}'
+
+        if self.rss_limit and self.tests and (rss := self.get_rss()) >= self.rss_limit:
+            return f'RSS процессов браузера {rss:.0f} МБ (порог {self.rss_limit:.0f} МБ)'
+
+        return None
+
+    @staticmethod
+    def get_rss() -> float:
+        """Получить RSS деревьев процессов браузеров, запущенных текущим процессом, в мегабайтах"""
+        return get_tree_usage(root=os.getpid(), browsers_only=True)[1] / MB
+
+    def on_restart(self):
+        """Учесть перезапуск браузера и начать отсчет условий заново"""
+        self.tests = self.contexts = 0
+        self.restarts += 1
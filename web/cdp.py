@@ -0,0 +1,32 @@
+"""Модуль для работы с CDP-сессиями Chromium"""
+from playwright.sync_api import CDPSession, Page
+
+from other.logging import logger
+
+_sessions: dict[int, CDPSession] = {}
+
+
+def is_chromium(page: Page) -> bool:
+    """Проверить, что страница открыта в Chromium
+
+    Args:
+        page: страница
+    """
+    return page.context.browser is not None and page.context.browser.browser_type.name == 'chromium'
+
+
+def get_cdp_session(page: Page) -> CDPSession:
+    """Получить CDP-сессию страницы. Сессия создается один раз на страницу
+
+    Args:
+        page: страница
+    """
+    if (session := _sessions.get(id(page))) is None:
+        if not is_chromium(page):
+            raise RuntimeError('CDP-сессия доступна только для Chromium')
+
+        logger.debug(f'Создать CDP-сессию для страницы {page}')
+        session = _sessions[id(page)] = page.context.new_cdp_session(page)
+        page.on('close', lambda _: _sessions.pop(id(page), None))
+
+    return session
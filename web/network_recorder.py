@@ -0,0 +1,182 @@
+"""Модуль для записи сетевых запросов страницы (waterfall) в рамках теста"""
+from dataclasses import dataclass, asdict
+from json import dumps
+
+from allure import attach, attachment_type, step
+from playwright.sync_api import BrowserContext, Request as PlaywrightRequest
+
+from other.logging import logger
+
+ERROR_REQUESTS_MSG = 'Количество запросов страницы {count} превышает допустимое: {exp}'
+ERROR_BYTES_MSG = 'Объем переданных данных {size} байт превышает допустимый: {exp} байт'
+
+
+@dataclass(slots=True)
+class NetworkEntry:
+    """Запись о сетевом запросе страницы"""
+    url: str
+    method: str
+    resource_type: str
+    status: int | None
+    size: int
+    start: float
+    duration: float
+    from_cache: bool
+    failure: str | None = None
+
+
+class NetworkRecorder:
+    """Класс для записи всех запросов, которые выполняют страницы BasePage"""
+
+    def __init__(self, top: int = 10):
+        """
+
+        Args:
+            top: количество самых тяжелых и медленных ресурсов в отчете
+        """
+        self.top = top
+        self.entries: list[NetworkEntry] = []
+        self._contexts: set[int] = set()
+        self._test_name: str | None = None
+
+    def attach(self, context: BrowserContext):
+        """Подписаться на события запросов контекста браузера
+
+        Args:
+            context: контекст браузера
+        """
+        if id(context) in self._contexts:
+            return
+
+        self._contexts.add(id(context))
+        context.on('requestfinished', self._on_finished)
+        context.on('requestfailed', self._on_failed)
+
+        logger.debug(f'Запись сетевых запросов включена для контекста {context}')
+
+    def _on_finished(self, request: PlaywrightRequest):
+        """Обработать успешно завершенный запрос
+
+        Args:
+            request: запрос страницы
+        """
+        response = request.response()
+        sizes = request.sizes()
+        size = max(sizes['responseBodySize'], 0) + max(sizes['responseHeadersSize'], 0)
+        status = response.status if response else None
+
+        self.entries.append(
+            NetworkEntry(
+                url=request.url,
+                method=request.method,
+                resource_type=request.resource_type,
+                status=status,
+                size=size,
+                start=request.timing['startTime'],
+                duration=max(request.timing['responseEnd'], 0),
+                from_cache=(
+                    status == 304
+                    or bool(response and response.from_service_worker)
+                    or (status == 200 and size == 0)
+                )
+            )
+        )
+
+    def _on_failed(self, request: PlaywrightRequest):
+        """Обработать запрос, завершившийся ошибкой
+
+        Args:
+            request: запрос страницы
+        """
+        self.entries.append(
+            NetworkEntry(
+                url=request.url,
+                method=request.method,
+                resource_type=request.resource_type,
+                status=None,
+                size=0,
+                start=request.timing['startTime'],
+                duration=max(request.timing['responseEnd'], 0),
+                from_cache=False,
+                failure=request.failure
+            )
+        )
+
+    def start_test(self, name: str):
+        """Начать запись запросов для теста
+
+        Args:
+            name: имя теста
+        """
+        self._test_name = name
+        self.entries = []
+
+    @property
+    def total_bytes(self) -> int:
+        """Получить суммарный объем переданных данных"""
+        return sum(entry.size for entry in self.entries)
+
+    def summary(self) -> dict:
+        """Получить агрегированную статистику запросов теста"""
+        by_type: dict[str, dict[str, int]] = {}
+
+        for entry in self.entries:
+            stat = by_type.setdefault(entry.resource_type, {'count': 0, 'bytes': 0})
+            stat['count'] += 1
+            stat['bytes'] += entry.size
+
+        return {
+            'test': self._test_name,
+            'requests': len(self.entries),
+            'bytes': self.total_bytes,
+            'from_cache': sum(entry.from_cache for entry in self.entries),
+            'failed': sum(entry.failure is not None for entry in self.entries),
+            'by_type': by_type
+        }
+
+    @step('Прикрепить сетевую статистику страницы')
+    def finish_test(self) -> dict:
+        """Завершить запись запросов теста и прикрепить результат в отчет"""
+        summary = self.summary()
+        heaviest = sorted(self.entries, key=lambda x: x.size, reverse=True)[:self.top]
+        slowest = sorted(self.entries, key=lambda x: x.duration, reverse=True)[:self.top]
+
+        logger.info(
+            f'Сетевая статистика теста {self._test_name}\n'
+            f'\tЗапросов:\t{summary["requests"]}\n'
+            f'\tБайт:\t\t{summary["bytes"]}\n'
+            f'\tИз кэша:\t{summary["from_cache"]}\n'
+            f'\tОшибок:\t\t{summary["failed"]}'
+        )
+
+        attach(body=dumps(summary, indent=2), name='NETWORK SUMMARY', attachment_type=attachment_type.JSON)
+        attach(
+            body=dumps({'heaviest': [asdict(x) for x in heaviest], 'slowest': [asdict(x) for x in slowest]}, indent=2),
+            name='NETWORK TOP',
+            attachment_type=attachment_type.JSON
+        )
+        attach(
+            body=dumps([asdict(entry) for entry in sorted(self.entries, key=lambda x: x.start)], indent=2),
+            name='NETWORK WATERFALL',
+            attachment_type=attachment_type.JSON
+        )
+
+        return summary
+
+    @step('Проверить сетевой бюджет страницы')
+    def assert_budget(self, max_requests: int | None = None, max_bytes: int | None = None):
+        """Проверить количество запросов и объем переданных данных
+
+        Args:
+            max_requests: максимальное количество запросов;
+            max_bytes: максимальный объем переданных данных в байтах.
+        """
+        if max_requests is not None:
+            assert len(self.entries) <= max_requests, ERROR_REQUESTS_MSG.format(
+                count=len(self.entries), exp=max_requests
+            )
+
+        if max_bytes is not None:
+            assert self.total_bytes <= max_bytes, ERROR_BYTES_MSG.format(size=self.total_bytes, exp=max_bytes)
+
+        logger.success('Сетевой бюджет страницы соблюден!')
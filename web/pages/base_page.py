@@ -1,12 +1,14 @@
 from allure import step
 from playwright.sync_api import Browser, BrowserContext, Page, Locator as PlaywrightLocator
 
+from other.circuit_breaker import CONNECTION_ERRORS
 from other.config import Config
 from other.logging import logger
 from other.utils import get_seconds_time
 from web import browser_config
 from web.locator import Locator, format_locator
-from playwright._impl._errors import TimeoutError
+from web.throttling import apply_throttling
+from playwright._impl._errors import Error, TimeoutError
 
 
 class BasePage:
@@ -23,6 +25,15 @@ class BasePage:
         self._context = context if context else self._browser.new_context(no_viewport=True)
         self._page = self._context.new_page()
 
+        if not context and Config.browser_recycler:
+            Config.browser_recycler.on_context()
+
+        if Config.network_recorder:
+            Config.network_recorder.attach(context=self._context)
+
+        if Config.throttling:
+            apply_throttling(page=self._page, profile=Config.throttling)
+
         Config.page = self._page
 
     @property
@@ -45,12 +56,33 @@ class BasePage:
         """ Получить текущий url """
         return self._page.url
 
+    def _goto(self, url: str):
+        """ Перейти по ссылке и дождаться загрузки. Ошибки подключения учитываются размыкателем цепи стенда
+
+        Args:
+            url: ссылка
+        """
+        if breaker := Config.circuit_breaker:
+            breaker.check(url=url)
+
+        try:
+            self._page.goto(url)
+            self._page.wait_for_load_state()
+
+        except Error as e:
+            if breaker and any(error in e.message for error in CONNECTION_ERRORS):
+                breaker.record_failure(url=url, error=e)
+
+            raise
+
+        if breaker:
+            breaker.record_success(url=url)
+
     @step('Открыть url класса')
     def get(self):
         """ Перейти по ссылке класса """
         logger.info(f'Открываем страницу {self.url}')
-        self._page.goto(self.url)
-        self._page.wait_for_load_state()
+        self._goto(self.url)
         logger.success(f'Страница {self.url} открыта')
 
     @step('Открыть страницу по url')
@@ -61,8 +93,7 @@ class BasePage:
             url: ссылка
         """
         logger.info(f'Открываем страницу {url}')
-        self._page.goto(url)
-        self._page.wait_for_load_state()
+        self._goto(url)
         logger.success(f'Страница {url} url')
 
     @format_locator
@@ -70,7 +101,7 @@ class BasePage:
     def find_element_by_locator(
             self,
             locator: Locator,
-            timeout: float = browser_config.TIMEOUT,
+            timeout: float | None = None,
             **kwargs
     ) -> PlaywrightLocator:
         """Ожидать присутствие элемента на странице
@@ -79,6 +110,8 @@ class BasePage:
             locator: локатор
             timeout: таймаут ожидания в миллисекундах
         """
+        timeout = browser_config.TIMEOUT if timeout is None else timeout
+
         seconds = get_seconds_time(milliseconds=timeout)
 
         try:
@@ -114,7 +147,7 @@ class BasePage:
     def find_visible_element_by_locator(
             self,
             locator: Locator,
-            timeout: float = browser_config.TIMEOUT,
+            timeout: float | None = None,
             **kwargs
     ) -> PlaywrightLocator:
         """Ожидать присутствия элемента в DOM страницы и его видимости.
@@ -124,6 +157,8 @@ class BasePage:
             timeout: Количество миллисекунд до тайм-аута ожидания;
             **kwargs: Аргументы для форматирования локатора.
         """
+        timeout = browser_config.TIMEOUT if timeout is None else timeout
+
         seconds = get_seconds_time(milliseconds=timeout)
 
         try:
@@ -147,7 +182,7 @@ class BasePage:
     def scroll_into_view_by_locator(
             self,
             locator: Locator,
-            timeout: float = browser_config.TIMEOUT,
+            timeout: float | None = None,
             **kwargs
     ) -> PlaywrightLocator:
         """Проскролить страницу до элемента
@@ -156,6 +191,8 @@ class BasePage:
             locator: локатор
             timeout: таймаут в миллсекундах
         """
+        timeout = browser_config.TIMEOUT if timeout is None else timeout
+
         logger.info('Скролить страницу до элемента')
 
         pw_locator = self.find_element_by_locator(locator=locator, timeout=timeout)
@@ -170,7 +207,7 @@ class BasePage:
     def click_by_locator(
             self,
             locator: Locator,
-            timeout: float = browser_config.TIMEOUT,
+            timeout: float | None = None,
             **kwargs
     ) -> PlaywrightLocator:
         """Найти элемент и кликнуть по нему
@@ -179,6 +216,8 @@ class BasePage:
             locator: локатор
             timeout: таймаут в миллисекундах
         """
+        timeout = browser_config.TIMEOUT if timeout is None else timeout
+
         try:
             logger.info(f'Клик по элементу {locator}')
             pw_locator = self.find_visible_element_by_locator(locator=locator, timeout=timeout)
@@ -201,7 +240,7 @@ class BasePage:
             self,
             locator: Locator,
             keys: str,
-            timeout: float = browser_config.TIMEOUT,
+            timeout: float | None = None,
             **kwargs
     ) -> PlaywrightLocator:
         """Найти элемент по локатору и ввести в него значение
@@ -211,6 +250,8 @@ class BasePage:
             keys: текст для ввода
             timeout: таймаут в миллисекундах
         """
+        timeout = browser_config.TIMEOUT if timeout is None else timeout
+
         try:
             logger.info(f'Ввод значения в элемент {locator}')
             pw_locator = self.find_element_by_locator(locator=locator, timeout=timeout)
@@ -231,7 +272,7 @@ class BasePage:
     def clear_by_locator(
             self,
             locator: Locator,
-            timeout: float = browser_config.TIMEOUT,
+            timeout: float | None = None,
             **kwargs
     ) -> PlaywrightLocator:
         """Очистить поле для ввода
@@ -240,6 +281,8 @@ class BasePage:
             locator: локатор
             timeout: таймаут в секундах
         """
+        timeout = browser_config.TIMEOUT if timeout is None else timeout
+
         try:
             logger.info(f'Очистка элемента {locator}')
 
@@ -0,0 +1,101 @@
+"""Модуль для профилирования CPU и JS-heap страниц Chromium через CDP"""
+from json import dumps
+
+from allure import attach, attachment_type, step
+from playwright.sync_api import Page
+
+from other.logging import logger
+from web.cdp import get_cdp_session
+
+METRICS = ('JSHeapUsedSize', 'JSHeapTotalSize', 'Nodes', 'LayoutCount', 'RecalcStyleCount', 'ScriptDuration', 'TaskDuration')
+COUNTERS = ('LayoutCount', 'RecalcStyleCount', 'ScriptDuration', 'TaskDuration')
+MB = 1024 * 1024
+
+
+class CdpProfiler:
+    """Класс для сбора метрик Performance.getMetrics и CPU профиля теста"""
+
+    def __init__(self, heap_growth_limit: float = 50):
+        """
+
+        Args:
+            heap_growth_limit: допустимый рост JS-heap страницы за сессию в мегабайтах
+        """
+        self.heap_growth_limit = heap_growth_limit
+        self._baseline: dict[int, float] = {}
+        self._page: Page | None = None
+        self._before: dict[str, float] = {}
+        self._is_cpu = False
+        self._test_name: str | None = None
+
+    def get_metrics(self, page: Page) -> dict[str, float]:
+        """Получить метрики страницы
+
+        Args:
+            page: страница
+        """
+        session = get_cdp_session(page)
+        session.send('HeapProfiler.collectGarbage')
+        metrics = session.send('Performance.getMetrics')['metrics']
+
+        return {metric['name']: metric['value'] for metric in metrics if metric['name'] in METRICS}
+
+    def start_test(self, page: Page, name: str, is_cpu: bool = False):
+        """Начать профилирование теста
+
+        Args:
+            page: страница теста;
+            name: имя теста;
+            is_cpu: записывать CPU профиль теста.
+        """
+        session = get_cdp_session(page)
+        session.send('Performance.enable')
+
+        self._page, self._test_name, self._is_cpu = page, name, is_cpu
+        self._before = self.get_metrics(page)
+        self._baseline.setdefault(id(page), self._before['JSHeapUsedSize'])
+
+        if is_cpu:
+            session.send('Profiler.enable')
+            session.send('Profiler.start')
+
+        logger.debug(f'Профилирование теста {name} запущено. Метрики: {self._before}')
+
+    @step('Прикрепить метрики производительности страницы')
+    def finish_test(self) -> dict:
+        """Завершить профилирование теста и прикрепить результат в отчет"""
+        session = get_cdp_session(self._page)
+
+        if self._is_cpu:
+            profile = session.send('Profiler.stop')['profile']
+            session.send('Profiler.disable')
+            attach(body=dumps(profile), name='CPU PROFILE', extension='cpuprofile')
+
+        after = self.get_metrics(self._page)
+        heap_growth = (after['JSHeapUsedSize'] - self._baseline[id(self._page)]) / MB
+
+        result = {
+            'test': self._test_name,
+            'metrics': after,
+            'delta': {name: after[name] - self._before[name] for name in COUNTERS},
+            'heap_growth_mb': round(heap_growth, 3),
+            'is_heap_leak': heap_growth > self.heap_growth_limit
+        }
+
+        logger.info(
+            f'Метрики производительности теста {self._test_name}\n'
+            f'\tJS-heap:\t{after["JSHeapUsedSize"] / MB:.2f} MB\n'
+            f'\tDOM nodes:\t{after["Nodes"]:.0f}\n'
+            f'\tLayouts:\t{result["delta"]["LayoutCount"]:.0f}\n'
+            f'\tScript:\t\t{result["delta"]["ScriptDuration"]:.3f} s\n'
+            f'\tРост heap:\t{heap_growth:.2f} MB'
+        )
+
+        if result['is_heap_leak']:
+            logger.warning(
+                f'Рост JS-heap страницы за сессию {heap_growth:.2f} MB превышает допустимый: {self.heap_growth_limit} MB'
+            )
+
+        attach(body=dumps(result, indent=2), name='PERFORMANCE METRICS', attachment_type=attachment_type.JSON)
+
+        return result
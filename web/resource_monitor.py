@@ -0,0 +1,239 @@
+"""Мониторинг CPU и памяти процессов драйвера Playwright и браузеров через /proc (Linux)"""
+from dataclasses import asdict, dataclass
+from json import dumps
+import os
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import monotonic, time
+
+from allure import attach, attachment_type
+
+from other.logging import logger
+
+PROC = Path('/proc')
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+MB = 1024 * 1024
+# аргументы, с которыми Playwright и фоновый запуск запускают корневой процесс браузера
+BROWSER_ARGS = ('--remote-debugging-pipe', '--remote-debugging-port', '-juggler-pipe', '--inspector-pipe')
+
+
+def is_supported() -> bool:
+    """Проверить, что в системе доступна файловая система /proc"""
+    return (PROC / 'self' / 'stat').exists()
+
+
+def read_stat(pid: int) -> tuple[int, int, int] | None:
+    """Прочитать родительский процесс, процессорное время в тиках и RSS в байтах процесса
+
+    Args:
+        pid: идентификатор процесса
+    """
+    try:
+        stat = (PROC / str(pid) / 'stat').read_text()
+
+    except OSError:
+        return None
+
+    # имя процесса в скобках может содержать пробелы, поля после него разделены пробелами
+    fields = stat[stat.rindex(')') + 2:].split()
+
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]) * PAGE_SIZE
+
+
+def read_cmdline(pid: int) -> list[str]:
+    """Прочитать аргументы командной строки процесса
+
+    Args:
+        pid: идентификатор процесса
+    """
+    try:
+        return (PROC / str(pid) / 'cmdline').read_bytes().decode(errors='replace').split('\0')
+
+    except OSError:
+        return []
+
+
+def is_browser(pid: int) -> bool:
+    """Проверить, что процесс - корневой процесс браузера, запущенного Playwright или в фоне
+
+    Args:
+        pid: идентификатор процесса
+    """
+    return any(arg.startswith(BROWSER_ARGS) for arg in read_cmdline(pid=pid))
+
+
+def get_tree_usage(root: int, browsers_only: bool = False) -> tuple[int, int, int]:
+    """Получить суммарное процессорное время в тиках, RSS в байтах и количество процессов-потомков
+
+    Args:
+        root: идентификатор корневого процесса, сам процесс не учитывается;
+        browsers_only: учитывать только деревья процессов браузеров, без драйвера Playwright и других потомков.
+    """
+    stats = {
+        int(path.name): stat for path in PROC.iterdir() if path.name.isdigit() and (stat := read_stat(int(path.name)))
+    }
+    children: dict[int, list[int]] = {}
+
+    for pid, (ppid, _, _) in stats.items():
+        children.setdefault(ppid, []).append(pid)
+
+    cpu = rss = count = 0
+    stack = [(pid, not browsers_only) for pid in children.get(root, ())]
+
+    while stack:
+        pid, is_counted = stack.pop()
+
+        # процессы браузера ищутся до первого найденного корня, его дерево учитывается целиком
+        if is_counted := is_counted or is_browser(pid=pid):
+            _, ticks, memory = stats[pid]
+            cpu, rss, count = cpu + ticks, rss + memory, count + 1
+
+        stack.extend((child, is_counted) for child in children.get(pid, ()))
+
+    return cpu, rss, count
+
+
+@dataclass(slots=True)
+class ResourceSample:
+    """Замер ресурсов процессов-потомков"""
+    time: float
+    cpu_percent: float
+    rss_mb: float
+    processes: int
+    test: str | None
+
+
+@dataclass(slots=True)
+class ResourceUsage:
+    """Ресурсы, потраченные за тест"""
+    test: str
+    duration: float
+    cpu_seconds: float
+    rss_start_mb: float
+    rss_end_mb: float
+    rss_peak_mb: float
+
+    @property
+    def rss_growth_mb(self) -> float:
+        """Рост RSS за тест в мегабайтах"""
+        return round(self.rss_end_mb - self.rss_start_mb, 2)
+
+
+class ResourceMonitor:
+    """Фоновый сбор CPU и RSS процессов-потомков pytest (драйвер Playwright, браузеры) с привязкой к тестам"""
+
+    def __init__(self, interval: float = 1.0, growth_limit: float = 50, root: int | None = None):
+        """
+
+        Args:
+            interval: период замеров в секундах;
+            growth_limit: допустимый рост RSS за тест в мегабайтах;
+            root: корневой процесс, по умолчанию текущий процесс pytest.
+        """
+        self.interval, self.growth_limit, self.root = interval, growth_limit, root or os.getpid()
+        self.timeline: list[ResourceSample] = []
+        self.tests: list[ResourceUsage] = []
+        self._test: str | None = None
+        self._test_start: tuple[float, int, int] | None = None
+        self._peak = 0
+        self._last: tuple[float, int] | None = None
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name='resource-monitor', daemon=True)
+
+    def start(self):
+        """Запустить фоновый сбор замеров"""
+        logger.info(f'Мониторинг ресурсов процессов браузера, период {self.interval} с')
+        self._thread.start()
+
+    def stop(self):
+        """Остановить фоновый сбор замеров"""
+        self._stop.set()
+        self._thread.join(timeout=self.interval * 2)
+
+    def _run(self):
+        """Снимать замеры с заданным периодом. Выполняется в фоновом потоке"""
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> tuple[int, int]:
+        """Снять замер и добавить его в таймлайн. Возвращает процессорное время в тиках и RSS в байтах"""
+        cpu, rss, count = get_tree_usage(root=self.root)
+        now = monotonic()
+
+        with self._lock:
+            cpu_percent = 0.0
+
+            if self._last and (elapsed := now - self._last[0]) > 0:
+                cpu_percent = max(cpu - self._last[1], 0) / CLOCK_TICKS / elapsed * 100
+
+            self._last, self._peak = (now, cpu), max(self._peak, rss)
+            self.timeline.append(ResourceSample(
+                time=round(time(), 3),
+                cpu_percent=round(cpu_percent, 1),
+                rss_mb=round(rss / MB, 2),
+                processes=count,
+                test=self._test
+            ))
+
+        return cpu, rss
+
+    @property
+    def rss_mb(self) -> float:
+        """Текущий суммарный RSS процессов-потомков в мегабайтах"""
+        return get_tree_usage(root=self.root)[1] / MB
+
+    def start_test(self, name: str):
+        """Начать учет ресурсов теста
+
+        Args:
+            name: имя теста
+        """
+        cpu, rss = self.sample()
+
+        with self._lock:
+            self._test, self._test_start, self._peak = name, (monotonic(), cpu, rss), rss
+
+    def finish_test(self) -> ResourceUsage | None:
+        """Закончить учет ресурсов теста, прикрепить их в отчет и предупредить о росте памяти"""
+        if self._test_start is None:
+            return None
+
+        cpu, rss = self.sample()
+
+        with self._lock:
+            (start, start_cpu, start_rss), name = self._test_start, self._test
+            result = ResourceUsage(
+                test=name,
+                duration=round(monotonic() - start, 3),
+                cpu_seconds=round((cpu - start_cpu) / CLOCK_TICKS, 2),
+                rss_start_mb=round(start_rss / MB, 2),
+                rss_end_mb=round(rss / MB, 2),
+                rss_peak_mb=round(self._peak / MB, 2)
+            )
+            self.tests.append(result)
+            self._test = self._test_start = None
+
+        attach(
+            body=dumps(asdict(result) | {'rss_growth_mb': result.rss_growth_mb}, indent=2),
+            name='BROWSER RESOURCES',
+            attachment_type=attachment_type.JSON
+        )
+
+        if result.rss_growth_mb > self.growth_limit:
+            logger.warning(
+                f'Тест {name} оставил рост памяти процессов браузера {result.rss_growth_mb} МБ '
+                f'(допустимо {self.growth_limit} МБ)'
+            )
+
+        return result
+
+    def report(self) -> dict:
+        """Получить отчет сессии: таймлайн замеров, ресурсы тестов и тесты с ростом памяти"""
+        with self._lock:
+            return {
+                'timeline': [asdict(sample) for sample in self.timeline],
+                'tests': [asdict(test) | {'rss_growth_mb': test.rss_growth_mb} for test in self.tests],
+                'leaks': [test.test for test in self.tests if test.rss_growth_mb > self.growth_limit]
+            }
@@ -0,0 +1,43 @@
+"""Модуль для эмуляции медленной сети и CPU в Chromium"""
+from allure import step
+from playwright.sync_api import Page
+
+from other.logging import logger
+from web import browser_config
+from web.browser_config import ThrottlingProfile
+from web.cdp import get_cdp_session, is_chromium
+
+NO_THROTTLING = ThrottlingProfile(name='none')
+
+
+@step('Применить профиль эмуляции сети и CPU')
+def apply_throttling(page: Page, profile: ThrottlingProfile | None):
+    """Применить профиль эмуляции к странице и масштабировать таймауты
+
+    Args:
+        page: страница;
+        profile: профиль эмуляции, None - отключить эмуляцию.
+    """
+    profile = profile or NO_THROTTLING
+
+    if not is_chromium(page):
+        logger.warning(f'Эмуляция профиля {profile.name} доступна только для Chromium')
+        return
+
+    session = get_cdp_session(page)
+    session.send('Network.enable')
+    session.send(
+        'Network.emulateNetworkConditions',
+        {
+            'offline': False,
+            'latency': profile.latency,
+            'downloadThroughput': profile.download,
+            'uploadThroughput': profile.upload
+        }
+    )
+    session.send('Emulation.setCPUThrottlingRate', {'rate': profile.cpu_rate})
+
+    browser_config.scale_timeout(factor=profile.timeout_factor)
+    page.set_default_timeout(browser_config.DEFAULT_PAGE_TIMEOUT * profile.timeout_factor)
+
+    logger.info(f'Применен профиль эмуляции {profile.name}. Таймаут ожидания: {browser_config.TIMEOUT} мс')